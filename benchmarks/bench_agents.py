@@ -0,0 +1,303 @@
+"""
+Load test of the HTTP server with agent-style traffic.
+
+The server is started with uvicorn on a synthetic corpus (see `corpus.py`)
+or on a local folder of laws (`--folder`) and serves the index read-only
+with `--workers` processes. Simulated agents then talk to it over
+streamable HTTP like MCP clients: each session sends `initialize` and
+`tools/list`, then follows the flow of the example agent in
+`google-adk-agent/agent/agent.py`:
+
+1. `get_lawlibrary` with a word of a law's title (or its code), taking
+   the first law found
+2. `get_paragraph` of a paragraph of that law
+3. `get_paragraph` for up to `--max-refs` references in its text ("§ 12",
+   "§ 5 FooG"), or one `get_paragraphs` call for all of them
+4. sometimes `get_references` of the paragraph, and a `search_laws` for
+   the paragraph title, restricted to the law half of the time
+
+Instead of simulated agents, `--trace` replays recorded sessions from a
+JSONL file (one `{"calls": [{"tool": ..., "arguments": {...}}]}` per
+line), e.g. written by an earlier run with `--record`.
+
+For every level in `--concurrency`, that many agents run sessions back to
+back (with `--think-ms` between calls) for `--duration` seconds, spread
+over `--client-processes` processes. Everything runs locally.
+
+Usage:
+    PYTHONPATH=mcp python benchmarks/bench_agents.py [--concurrency 1,8,32] [--laws 1000] [--workers 1]
+
+Prints a JSON object with, per concurrency level, sessions, calls per
+second, error rate and, per tool, calls, errors and p50 / p95 / p99 latency.
+Errors are failed requests and tool errors, e.g. references to paragraphs
+that do not exist (the synthetic corpus cites random paragraph numbers);
+calls rejected by a busy server are also counted as `rejected`.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from bench_suite import environment  # noqa: E402
+from bench_workers import HEADERS, build_index, free_port, start_server  # noqa: E402
+from corpus import generate_corpus  # noqa: E402
+
+REFERENCE_RE = re.compile(r'§\s*(\d+[a-z]?)(?:\s+Abs\.\s*\d+)?(?:\s+(?!Abs\b|Satz\b|Nr\b)([A-ZÄÖÜ][\w-]*))?')
+BUSY = "The server is busy"
+
+
+def load_catalog(index_path, paragraphs_per_law=50):
+    """(code, title, paragraph ids) of the indexed laws."""
+    with sqlite3.connect(index_path) as conn:
+        laws = conn.execute(
+            "SELECT law_code, full_title, first_id, last_id FROM sources WHERE first_id IS NOT NULL ORDER BY rowid"
+        ).fetchall()
+        return [
+            (code, title or code, [pid for pid, in conn.execute(
+                "SELECT paragraph_id FROM paragraphs WHERE id BETWEEN ? AND ? LIMIT ?",
+                (first_id, last_id, paragraphs_per_law)
+            )])
+            for code, title, first_id, last_id in laws
+        ]
+
+
+def percentiles(timings):
+    timings = sorted(timings)
+    at = lambda q: round(timings[min(len(timings) - 1, int(len(timings) * q))] * 1000, 3)
+    return {"p50_ms": at(0.5), "p95_ms": at(0.95), "p99_ms": at(0.99)}
+
+
+class Session:
+    """One MCP client session over streamable HTTP, recording every call."""
+
+    def __init__(self, client, url, records):
+        self.client = client
+        self.url = url
+        self.records = records
+        self.calls = []
+        self.request_id = 0
+
+    async def request(self, method, params=None, name=None):
+        """Send a JSON-RPC request; returns the result, or None if it failed."""
+        self.request_id += 1
+        start = time.perf_counter()
+        ok = rejected = False
+        result = None
+        try:
+            response = await self.client.post(self.url, headers=HEADERS, json={
+                "jsonrpc": "2.0", "id": self.request_id, "method": method, "params": params or {},
+            })
+            response.raise_for_status()
+            data = next(line[5:] for line in response.text.splitlines() if line.startswith("data:"))
+            message = json.loads(data)
+            result = message.get("result")
+            ok = result is not None and not result.get("isError")
+            if ok and name:
+                text = result["content"][0]["text"]
+                rejected = text.startswith(BUSY)
+                ok = not rejected
+                result = text
+        except (httpx.HTTPError, StopIteration, ValueError, KeyError, IndexError):
+            pass
+        self.records.append((name or method, time.perf_counter() - start, ok, rejected))
+        return result if ok else None
+
+    async def connect(self):
+        await self.request("initialize", {
+            "protocolVersion": "2025-03-26", "capabilities": {},
+            "clientInfo": {"name": "bench-agents", "version": "1"},
+        })
+        await self.client.post(self.url, headers=HEADERS, json={"jsonrpc": "2.0", "method": "notifications/initialized"})
+        await self.request("tools/list")
+
+    async def call(self, tool, **arguments):
+        """Call a tool; returns its text, or None if the call failed."""
+        self.calls.append({"tool": tool, "arguments": arguments})
+        return await self.request("tools/call", {"name": tool, "arguments": arguments}, name=tool)
+
+
+def parse_json(text):
+    try:
+        return json.loads(text) if text else None
+    except ValueError:
+        return None
+
+
+async def agent_session(session, rng, catalog, max_refs, think):
+    """The lookup / paragraph / references / search flow of the example agent."""
+    code, title, paragraphs = rng.choice(catalog)
+    found = parse_json(await session.call("get_lawlibrary", law=title.split()[0] if rng.random() < 0.7 else code))
+    await think()
+    if isinstance(found, list) and found:
+        code = found[0]["code"]
+
+    paragraph = rng.choice(paragraphs)
+    text = parse_json(await session.call("get_paragraph", law=code, paragraph=paragraph))
+    await think()
+    if not isinstance(text, dict):
+        return
+
+    references = [(number, law or code) for number, law in REFERENCE_RE.findall(text.get("text", ""))][:max_refs]
+    if len(references) > 1 and rng.random() < 0.5:
+        await session.call("get_paragraphs", references=[f"§ {number} {law}" for number, law in references])
+        await think()
+    else:
+        for number, law in references:
+            await session.call("get_paragraph", law=law, paragraph=number)
+            await think()
+
+    if rng.random() < 0.3:
+        await session.call("get_references", law=code, paragraph=paragraph, depth=2, include_text=False)
+        await think()
+    if rng.random() < 0.5:
+        query = text.get("name") or title.split()[0]
+        await session.call("search_laws", query=query, **({"laws": [code]} if rng.random() < 0.5 else {}))
+        await think()
+
+
+async def replay_session(session, calls, think):
+    for call in calls:
+        await session.call(call["tool"], **call["arguments"])
+        await think()
+
+
+async def run_agents(url, agents, seed, deadline, catalog, trace, max_refs, think_ms):
+    records = []
+    recorded = []
+
+    async def think():
+        if think_ms:
+            await asyncio.sleep(think_ms / 1000)
+
+    async def agent(number):
+        rng = random.Random(seed * 100003 + number)
+        while time.time() < deadline:
+            session = Session(client, url, records)
+            await session.connect()
+            if trace:
+                await replay_session(session, rng.choice(trace), think)
+            else:
+                await agent_session(session, rng, catalog, max_refs, think)
+            recorded.append(session.calls)
+
+    limits = httpx.Limits(max_connections=agents, max_keepalive_connections=agents)
+    async with httpx.AsyncClient(timeout=120, limits=limits) as client:
+        await asyncio.gather(*(agent(number) for number in range(agents)))
+    return records, recorded
+
+
+def client_process(args):
+    return asyncio.run(run_agents(*args))
+
+
+def run_level(url, concurrency, args, catalog, trace):
+    processes = max(1, min(args.client_processes, concurrency))
+    deadline = time.time() + args.duration
+    jobs = [
+        (url, concurrency // processes + (i < concurrency % processes), args.seed + i, deadline,
+         catalog, trace, args.max_refs, args.think_ms)
+        for i in range(processes)
+    ]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        results = list(pool.map(client_process, jobs))
+    elapsed = time.perf_counter() - start
+
+    records = [record for process_records, _ in results for record in process_records]
+    sessions = [calls for _, process_sessions in results for calls in process_sessions]
+    tools = {}
+    for name in sorted({record[0] for record in records}):
+        timings = [seconds for tool, seconds, _, _ in records if tool == name]
+        errors = sum(not ok for tool, _, ok, _ in records if tool == name)
+        tools[name] = {
+            "calls": len(timings),
+            "errors": errors,
+            "rejected": sum(rejected for tool, _, _, rejected in records if tool == name),
+            "error_rate": round(errors / len(timings), 4),
+            **percentiles(timings),
+        }
+    calls = [record for record in records if record[0] not in ("initialize", "tools/list")]
+    return {
+        "concurrency": concurrency,
+        "sessions": len(sessions),
+        "calls": len(calls),
+        "calls_per_second": round(len(calls) / elapsed, 1),
+        "error_rate": round(sum(not ok for _, _, ok, _ in calls) / len(calls), 4) if calls else None,
+        "tools": tools,
+    }, sessions
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--concurrency', default='1,8,32', help='comma separated numbers of concurrent agents')
+    arg_parser.add_argument('--laws', type=int, default=1000, help='size of the synthetic corpus')
+    arg_parser.add_argument('--folder', help='use the laws in this folder instead of a synthetic corpus')
+    arg_parser.add_argument('--workers', type=int, default=1, help='server processes')
+    arg_parser.add_argument('--readers', type=int, default=4, help='reader connections per server process')
+    arg_parser.add_argument('--response-cache', type=int, default=1024, help='RESPONSE_CACHE_SIZE of the server')
+    arg_parser.add_argument('--client-processes', type=int, default=2)
+    arg_parser.add_argument('--duration', type=float, default=10, help='seconds per concurrency level')
+    arg_parser.add_argument('--think-ms', type=float, default=0, help='pause of an agent between two calls')
+    arg_parser.add_argument('--max-refs', type=int, default=3, help='references followed per paragraph')
+    arg_parser.add_argument('--trace', help='replay the sessions in this JSONL file')
+    arg_parser.add_argument('--record', help='write the sessions of the run to this JSONL file')
+    arg_parser.add_argument('--seed', type=int, default=1)
+    args = arg_parser.parse_args()
+
+    trace = None
+    if args.trace:
+        with open(args.trace, encoding='utf-8') as f:
+            trace = [json.loads(line)["calls"] for line in f if line.strip()]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        folder = Path(args.folder) if args.folder else Path(workdir) / "gesetze"
+        if not args.folder:
+            generate_corpus(folder, args.laws, seed=args.seed)
+        index_path = Path(workdir) / "index.sqlite"
+        laws = build_index(folder, index_path)
+        catalog = load_catalog(index_path)
+
+        port = free_port()
+        server = start_server(index_path, args.workers, args.readers, port,
+                              {"RESPONSE_CACHE_SIZE": str(args.response_cache)})
+        url = f"http://127.0.0.1:{port}/mcp/"
+        levels = []
+        sessions = []
+        try:
+            for concurrency in (int(n) for n in args.concurrency.split(',')):
+                level, level_sessions = run_level(url, concurrency, args, catalog, trace)
+                levels.append(level)
+                sessions += level_sessions
+                print(f"{concurrency} agents: {level['calls_per_second']} calls/s, "
+                      f"error rate {level['error_rate']}", file=sys.stderr)
+        finally:
+            server.terminate()
+            server.wait()
+
+    if args.record:
+        with open(args.record, 'w', encoding='utf-8') as f:
+            f.writelines(json.dumps({"calls": calls}, ensure_ascii=False) + "\n" for calls in sessions if calls)
+
+    print(json.dumps({
+        "environment": {**environment(), "cpus": os.cpu_count()},
+        "laws": laws,
+        "workers": args.workers,
+        "think_ms": args.think_ms,
+        "trace": args.trace,
+        "levels": levels,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
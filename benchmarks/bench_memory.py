@@ -0,0 +1,80 @@
+"""
+Memory benchmark: compact law representation vs. the previous one.
+
+The previous representation kept a plain `LawNode` object (with a
+`__dict__`) and a list of line strings per paragraph. The compact one
+keeps one text buffer per law and `__slots__` nodes with offsets into it.
+
+Usage:
+    PYTHONPATH=mcp python benchmarks/bench_memory.py /path/to/gesetze [--limit N]
+
+Prints a JSON object with the retained memory of both representations.
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from pathlib import Path
+
+from parser import LawParser
+
+
+class LegacyNode:
+    """Paragraph representation before the compact text buffer."""
+
+    def __init__(self, node_type, id, name, content_lines):
+        self.node_type = node_type
+        self.id = id
+        self.name = name
+        self.content_lines = content_lines
+
+
+def measure(build):
+    """Run `build` and return (result, retained bytes, seconds)."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, elapsed
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('folder', type=Path)
+    arg_parser.add_argument('--limit', type=int, default=None)
+    args = arg_parser.parse_args()
+
+    texts = [path.read_text() for path in sorted(args.folder.glob('**/index.md'))[:args.limit]]
+
+    compact, compact_bytes, compact_seconds = measure(lambda: [LawParser(text) for text in texts])
+
+    def build_legacy():
+        return [
+            {
+                p_id: LegacyNode('paragraph', p_id, node.name, node.content_lines)
+                for p_id, node in law.paragraphs.items()
+            }
+            for law in compact
+        ]
+    legacy, legacy_bytes, _ = measure(build_legacy)
+
+    paragraphs = sum(len(law.paragraphs) for law in compact)
+    print(json.dumps({
+        "laws": len(compact),
+        "paragraphs": paragraphs,
+        "compact_bytes": compact_bytes,
+        "legacy_bytes": legacy_bytes,
+        "compact_bytes_per_paragraph": round(compact_bytes / paragraphs) if paragraphs else None,
+        "legacy_bytes_per_paragraph": round(legacy_bytes / paragraphs) if paragraphs else None,
+        "ratio": round(compact_bytes / legacy_bytes, 3) if legacy_bytes else None,
+        "parse_seconds": round(compact_seconds, 3),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Mixed load benchmark: latency of cheap tool calls while other clients send
+pathological searches (a long OR chain of one-letter prefixes, which makes
+FTS5 merge the posting lists of almost every word).
+
+A synthetic corpus (see `corpus.py`) is indexed once. For every query time
+budget in `--timeouts` (`QUERY_TIMEOUT`, 0 = unlimited) the server is
+started with uvicorn and `--clients` client processes call `get_paragraph`
+and simple `search_laws` queries while `--heavy` client processes send the
+pathological search, all for `--duration` seconds. By default the server
+loads the laws from the folder like a single process deployment (the index
+is writable and shared by all requests); `--read-only` serves the index
+with a pool of reader connections instead.
+
+Usage:
+    PYTHONPATH=mcp python benchmarks/bench_mixed.py [--timeouts 0,0.25] [--laws 1000] [--read-only]
+
+Prints a JSON object with, per time budget, p50 / p99 latency of the cheap
+calls and of the pathological searches and how many of those timed out.
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from bench_suite import environment, percentiles  # noqa: E402
+from bench_workers import build_index, call_tool, free_port, start_server  # noqa: E402
+from corpus import NOUNS, generate_corpus  # noqa: E402
+
+HEAVY_QUERY = " OR ".join(f"{letter}*" for letter in "abcdefghijklmnopqrstuvwxyz")
+
+
+def client_run(args):
+    """One client: sequential calls until the deadline, returning (latencies, timed out searches, failures)."""
+    url, kind, seed, deadline, codes = args
+    rng = random.Random(seed)
+    timings = []
+    timeouts = failures = 0
+    with httpx.Client(timeout=120) as client:
+        request_id = 0
+        while time.time() < deadline:
+            request_id += 1
+            if kind == "heavy":
+                name, arguments = "search_laws", {"query": HEAVY_QUERY}
+            elif rng.random() < 0.5:
+                name, arguments = "get_paragraph", {"law": rng.choice(codes), "paragraph": "1"}
+            else:
+                name, arguments = "search_laws", {"query": rng.choice(NOUNS), "laws": rng.sample(codes, 2)}
+            start = time.perf_counter()
+            try:
+                message = call_tool(client, url, request_id, name, arguments)
+                failures += "error" in message or message["result"].get("isError", False)
+                timeouts += "error" not in message and '"error"' in message["result"]["content"][0]["text"]
+            except (httpx.HTTPError, StopIteration, ValueError, KeyError):
+                failures += 1
+            timings.append(time.perf_counter() - start)
+    return kind, timings, timeouts, failures
+
+
+def run_budget(index_path, folder, timeout, args, codes):
+    env = {"QUERY_TIMEOUT": str(timeout), "TOOL_WORKERS": str(args.tool_workers)}
+    if not args.read_only:
+        env.update(READ_ONLY_INDEX="false", LOAD_FROM_FOLDER=str(folder))
+    port = free_port()
+    server = start_server(index_path, 1, args.readers, port, env)
+    url = f"http://127.0.0.1:{port}/mcp/"
+    try:
+        deadline = time.time() + args.duration
+        jobs = [(url, "light", seed, deadline, codes) for seed in range(args.clients)]
+        jobs += [(url, "heavy", seed, deadline, codes) for seed in range(args.heavy)]
+        with ProcessPoolExecutor(max_workers=len(jobs)) as pool:
+            results = list(pool.map(client_run, jobs))
+    finally:
+        server.terminate()
+        server.wait()
+
+    run = {"query_timeout": timeout}
+    for kind in ("light", "heavy"):
+        timings = [t for k, client_timings, _, _ in results if k == kind for t in client_timings]
+        run[kind] = {
+            "requests": len(timings),
+            "failures": sum(failures for k, _, _, failures in results if k == kind),
+            **({"latency": percentiles(timings)} if timings else {}),
+        }
+    run["heavy"]["timeouts"] = sum(timeouts for k, _, timeouts, _ in results if k == "heavy")
+    return run
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--timeouts', default='0,0.25', help='comma separated query time budgets in seconds')
+    arg_parser.add_argument('--laws', type=int, default=1000)
+    arg_parser.add_argument('--clients', type=int, default=8, help='client processes sending cheap calls')
+    arg_parser.add_argument('--heavy', type=int, default=2, help='client processes sending pathological searches')
+    arg_parser.add_argument('--tool-workers', type=int, default=8, help='worker threads of the server')
+    arg_parser.add_argument('--readers', type=int, default=4, help='reader connections (with --read-only)')
+    arg_parser.add_argument('--read-only', action='store_true', help='serve the index read-only')
+    arg_parser.add_argument('--duration', type=float, default=15, help='seconds per measurement')
+    arg_parser.add_argument('--seed', type=int, default=1)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        folder = Path(workdir) / "gesetze"
+        generate_corpus(folder, args.laws, seed=args.seed)
+        index_path = Path(workdir) / "index.sqlite"
+        laws = build_index(folder, index_path)
+        with sqlite3.connect(index_path) as conn:
+            # Laws with too few paragraphs are skipped when indexing
+            codes = [code for code, in conn.execute(
+                "SELECT law_code FROM sources WHERE first_id IS NOT NULL ORDER BY rowid LIMIT 50"
+            )]
+
+        runs = []
+        for timeout in (float(t) for t in args.timeouts.split(',')):
+            runs.append(run_budget(index_path, folder, timeout, args, codes))
+            print(f"budget {timeout:g} s: light p99 {runs[-1]['light'].get('latency', {}).get('p99_ms')} ms",
+                  file=sys.stderr)
+
+    print(json.dumps({
+        "environment": {**environment(), "cpus": os.cpu_count()},
+        "laws": laws,
+        "clients": args.clients,
+        "heavy_clients": args.heavy,
+        "read_only": args.read_only,
+        "runs": runs,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Search benchmark: index size and query latency per search mode.
+
+Builds one index file per search mode (see `index.SEARCH_MODES`) from the
+same laws, then runs every query repeatedly against each of them.
+
+Usage:
+    PYTHONPATH=mcp python benchmarks/bench_search.py /path/to/gesetze [--repeat N] [--query Q ...]
+
+Prints a JSON object with, per mode, the index size, the build time and
+the median / 95th percentile latency and number of hits of every query.
+"""
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import index
+from parser import LawLibrary
+
+DEFAULT_QUERIES = [
+    "Schadensersatz",
+    "Kündigungen",
+    "Verträge AND Schriftform",
+    "ersatz",
+    '"wichtigen Grund"',
+]
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def bench_mode(mode, folder, queries, repeat, workdir):
+    path = Path(workdir) / f"{mode}.sqlite"
+    start = time.perf_counter()
+    library = LawLibrary(index_path=path, search_mode=mode)
+    library.load_laws_from_folder(folder)
+    build_seconds = time.perf_counter() - start
+
+    fts_bytes = library.conn.execute("SELECT COALESCE(SUM(length(block)), 0) FROM laws_fts_data").fetchone()[0]
+    results = {}
+    for query in queries:
+        hits = len(library.search(query, limit=1000))
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            library.search(query)
+            timings.append((time.perf_counter() - start) * 1000)
+        results[query] = {
+            "hits": hits,
+            "median_ms": round(statistics.median(timings), 3),
+            "p95_ms": round(percentile(timings, 0.95), 3),
+        }
+    library.conn.close()
+    return {
+        "build_seconds": round(build_seconds, 3),
+        "file_bytes": path.stat().st_size,
+        "fts_bytes": fts_bytes,
+        "queries": results,
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('folder', type=Path)
+    arg_parser.add_argument('--repeat', type=int, default=20)
+    arg_parser.add_argument('--query', action='append', dest='queries')
+    arg_parser.add_argument('--mode', action='append', dest='modes', choices=list(index.SEARCH_MODES))
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        report = {
+            mode: bench_mode(mode, args.folder, args.queries or DEFAULT_QUERIES, args.repeat, workdir)
+            for mode in args.modes or index.SEARCH_MODES
+        }
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Benchmark suite: how parsing, startup and queries scale with the corpus.
+
+For every corpus size, a synthetic corpus is generated (see `corpus.py`)
+and measured in a fresh process:
+
+- `LawParser` throughput (paragraphs and MB per second)
+- wall time of `load_laws_from_folder`
+- peak RSS of the process after loading
+- p50 / p99 latency of `get`, `search` and `get_available_laws`
+
+Usage:
+    PYTHONPATH=mcp python benchmarks/bench_suite.py [--sizes 10,1000,6000] [--output result.json]
+    PYTHONPATH=mcp python benchmarks/bench_suite.py --compare base.json result.json
+
+The output is a JSON object with the environment (commit, Python and
+SQLite version) and one entry per size (`corpus_laws`; laws below
+MIN_PARAGRAPHS are generated but not loaded). `--compare` prints the ratio
+new / old of every metric of two such files.
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import resource
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from corpus import NOUNS, SUBJECTS, generate_corpus  # noqa: E402
+
+
+def percentiles(timings):
+    timings = sorted(timings)
+    return {
+        "p50_ms": round(timings[len(timings) // 2] * 1000, 4),
+        "p99_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.99))] * 1000, 4),
+    }
+
+
+def timed(calls):
+    timings = []
+    for call in calls:
+        start = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - start)
+    return percentiles(timings)
+
+
+def run_size(laws, mean_paragraphs, samples, workers, seed):
+    """Measure one corpus size in this process."""
+    from parser import LawLibrary, LawParser
+
+    with tempfile.TemporaryDirectory() as folder:
+        paths = generate_corpus(Path(folder), laws, mean_paragraphs, seed)
+
+        texts = [path.read_text(encoding="utf-8") for path in paths]
+        size = sum(len(text.encode("utf-8")) for text in texts)
+        start = time.perf_counter()
+        paragraphs = sum(len(LawParser(text).paragraphs) for text in texts)
+        parse_seconds = time.perf_counter() - start
+        del texts
+
+        library = LawLibrary()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            library.load_laws_from_folder(Path(folder), workers=workers)
+        load_seconds = time.perf_counter() - start
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform != "darwin":
+            peak_rss *= 1024
+
+    rng = random.Random(seed)
+    codes = list(library.laws)
+    lookups = []
+    for _ in range(samples):
+        code = rng.choice(codes)
+        lookups.append((code, rng.choice(list(library.laws[code].paragraphs))))
+    fuzzy = [rng.choice([code[:-1], code + "x", rng.choice(SUBJECTS)]) for code in rng.choices(codes, k=samples)]
+    words = [rng.choice(NOUNS) for _ in range(samples)]
+
+    return {
+        "corpus_laws": laws,
+        "laws": len(codes),
+        "paragraphs": paragraphs,
+        "corpus_bytes": size,
+        "parse": {
+            "seconds": round(parse_seconds, 3),
+            "paragraphs_per_second": round(paragraphs / parse_seconds) if parse_seconds else None,
+            "mb_per_second": round(size / parse_seconds / 1e6, 2) if parse_seconds else None,
+        },
+        "load_seconds": round(load_seconds, 3),
+        "peak_rss_mb": round(peak_rss / 1e6, 1),
+        "latency": {
+            "get": timed(lambda code=code, p_id=p_id: library.get(code, p_id) for code, p_id in lookups),
+            "search": timed(lambda word=word: library.search(word) for word in words),
+            "get_available_laws": timed(lambda query=query: library.get_available_laws(query) for query in fuzzy),
+        },
+    }
+
+
+def environment():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def flatten(obj, prefix=""):
+    """{"a": {"b": 1}} -> {"a.b": 1}, for numeric leaves only."""
+    items = {}
+    for key, value in obj.items():
+        if isinstance(value, dict):
+            items.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            items[f"{prefix}{key}"] = value
+    return items
+
+
+def compare(old_path, new_path):
+    old = {run["corpus_laws"]: flatten(run) for run in json.loads(Path(old_path).read_text())["runs"]}
+    new = {run["corpus_laws"]: flatten(run) for run in json.loads(Path(new_path).read_text())["runs"]}
+    report = {}
+    for laws in sorted(set(old) & set(new)):
+        report[laws] = {
+            metric: round(value / old[laws][metric], 3)
+            for metric, value in new[laws].items()
+            if old[laws].get(metric)
+        }
+    print(json.dumps(report, indent=2))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--sizes', default='10,1000', help='comma separated numbers of laws')
+    arg_parser.add_argument('--paragraphs', type=float, default=25, help='median number of paragraphs per law')
+    arg_parser.add_argument('--samples', type=int, default=500, help='queries per latency measurement')
+    arg_parser.add_argument('--workers', type=int, default=1, help='parse workers of load_laws_from_folder')
+    arg_parser.add_argument('--seed', type=int, default=1)
+    arg_parser.add_argument('--output', type=Path)
+    arg_parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'))
+    arg_parser.add_argument('--single', type=int, help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    if args.single is not None:
+        # Child process measuring one size
+        print(json.dumps(run_size(args.single, args.paragraphs, args.samples, args.workers, args.seed)))
+        return
+
+    runs = []
+    for laws in (int(size) for size in args.sizes.split(',')):
+        # A fresh process per size, so peak RSS is not shared between runs
+        child = subprocess.run(
+            [sys.executable, __file__, '--single', str(laws), '--paragraphs', str(args.paragraphs),
+             '--samples', str(args.samples), '--workers', str(args.workers), '--seed', str(args.seed)],
+            capture_output=True, text=True, check=True
+        )
+        runs.append(json.loads(child.stdout.strip().splitlines()[-1]))
+        print(f"{laws} laws: load {runs[-1]['load_seconds']}s", file=sys.stderr)
+
+    result = json.dumps({"environment": environment(), "runs": runs}, indent=2)
+    if args.output:
+        args.output.write_text(result)
+    print(result)
+
+
+if __name__ == "__main__":
+    main()
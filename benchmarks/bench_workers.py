@@ -0,0 +1,184 @@
+"""
+Serving benchmark: `search_laws` throughput of the HTTP server with several
+worker processes sharing one read-only index.
+
+A synthetic corpus (see `corpus.py`) is indexed once into a file. For every
+number of workers, the server is started with uvicorn in read-only mode
+(`READ_ONLY_INDEX`, lazy loading, response cache disabled) and `--clients`
+client processes send `search_laws` calls over streamable HTTP for
+`--duration` seconds, each waiting for its response before the next call.
+
+Usage:
+    PYTHONPATH=mcp python benchmarks/bench_workers.py [--workers 1,4,8] [--laws 1000] [--clients 16]
+
+Prints a JSON object with the environment and, per number of workers,
+requests per second, p50 / p99 latency and the number of failed calls.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from bench_suite import environment, percentiles  # noqa: E402
+from corpus import NOUNS, generate_corpus, law_identity  # noqa: E402
+
+MCP_DIR = Path(__file__).resolve().parent.parent / "mcp"
+HEADERS = {"Accept": "application/json, text/event-stream", "Content-Type": "application/json"}
+
+
+def build_index(folder, index_path):
+    from parser import LawLibrary
+
+    library = LawLibrary(index_path=index_path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        library.load_laws_from_folder(folder)
+    library.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    library.conn.close()
+    return len(library.catalog)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(index_path, workers, readers, port, overrides=None):
+    """Serve the index read-only with uvicorn; `overrides` changes further settings."""
+    env = dict(
+        os.environ,
+        INDEX_PATH=str(index_path),
+        READ_ONLY_INDEX="true",
+        READER_CONNECTIONS=str(readers),
+        LAZY_LOAD="true",
+        RESPONSE_CACHE_SIZE="1",
+        LOAD_FROM_FOLDER="",
+    )
+    env.update(overrides or {})
+    # Started from the server folder, so the local `mcp` package does not shadow the SDK
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "--app-dir", ".", "--factory", "server:http_app",
+         "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        cwd=MCP_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/metrics", timeout=1).status_code == 200:
+                return server
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("Server did not start")
+
+
+def call_tool(client, url, request_id, name, arguments):
+    """Call a tool over streamable HTTP and return its result message."""
+    response = client.post(url, headers=HEADERS, json={
+        "jsonrpc": "2.0", "id": request_id, "method": "tools/call",
+        "params": {"name": name, "arguments": arguments},
+    })
+    response.raise_for_status()
+    data = next(line[5:] for line in response.text.splitlines() if line.startswith("data:"))
+    return json.loads(data)
+
+
+def call(client, url, request_id, query, laws):
+    arguments = {"query": query, **({"laws": laws} if laws else {})}
+    message = call_tool(client, url, request_id, "search_laws", arguments)
+    return "error" not in message and not message["result"].get("isError")
+
+
+def client_run(args):
+    """One client: sequential calls until the deadline, returning (latencies, failures)."""
+    url, seed, deadline, codes = args
+    rng = random.Random(seed)
+    timings = []
+    failures = 0
+    with httpx.Client(timeout=30) as client:
+        request_id = 0
+        while time.time() < deadline:
+            request_id += 1
+            query = rng.choice(NOUNS)
+            if rng.random() < 0.5:
+                query += f" AND {rng.choice(NOUNS)}"
+            laws = rng.sample(codes, 2) if rng.random() < 0.3 else None
+            start = time.perf_counter()
+            try:
+                ok = call(client, url, request_id, query, laws)
+            except (httpx.HTTPError, StopIteration, ValueError, KeyError):
+                ok = False
+            timings.append(time.perf_counter() - start)
+            failures += not ok
+    return timings, failures
+
+
+def run_workers(index_path, workers, readers, clients, duration, codes):
+    port = free_port()
+    server = start_server(index_path, workers, readers, port)
+    url = f"http://127.0.0.1:{port}/mcp/"
+    try:
+        # Warm up every worker (lazy catalog, page cache) before measuring
+        client_run((url, 0, time.time() + 2, codes))
+        deadline = time.time() + duration
+        with ProcessPoolExecutor(max_workers=clients) as pool:
+            results = list(pool.map(client_run, [(url, seed, deadline, codes) for seed in range(1, clients + 1)]))
+    finally:
+        server.terminate()
+        server.wait()
+
+    timings = [t for client_timings, _ in results for t in client_timings]
+    return {
+        "workers": workers,
+        "requests": len(timings),
+        "failures": sum(failures for _, failures in results),
+        "requests_per_second": round(len(timings) / duration, 1),
+        "latency": percentiles(timings),
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--workers', default='1,4,8', help='comma separated numbers of server processes')
+    arg_parser.add_argument('--readers', type=int, default=4, help='reader connections per process')
+    arg_parser.add_argument('--laws', type=int, default=1000)
+    arg_parser.add_argument('--clients', type=int, default=16, help='concurrent client processes')
+    arg_parser.add_argument('--duration', type=float, default=10, help='seconds per measurement')
+    arg_parser.add_argument('--seed', type=int, default=1)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        folder = Path(workdir) / "gesetze"
+        generate_corpus(folder, args.laws, seed=args.seed)
+        index_path = Path(workdir) / "index.sqlite"
+        laws = build_index(folder, index_path)
+        codes = [law_identity(i)[0] for i in range(min(args.laws, 50))]
+
+        runs = []
+        for workers in (int(n) for n in args.workers.split(',')):
+            runs.append(run_workers(index_path, workers, args.readers, args.clients, args.duration, codes))
+            print(f"{workers} workers: {runs[-1]['requests_per_second']} requests/s", file=sys.stderr)
+
+    print(json.dumps({
+        "environment": {**environment(), "cpus": os.cpu_count()},
+        "laws": laws,
+        "readers": args.readers,
+        "clients": args.clients,
+        "runs": runs,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Synthetic law corpus in the format of bundestag/gesetze (`index.md` with
+front matter, one folder per law).
+
+Laws are generated deterministically from the seed and their position, so
+the first 10 laws of a 6,000 law corpus are the same as those of a 10 law
+corpus. Paragraph counts follow a long-tailed distribution like the real
+corpus (most laws are short, a few have thousands of paragraphs); the
+texts contain Absätze, numbered lists, lettered paragraphs (§ 9a),
+section headings and references to other paragraphs and laws.
+
+Usage:
+    python benchmarks/corpus.py /tmp/gesetze --laws 1000 [--seed 1]
+"""
+import argparse
+import math
+import random
+from pathlib import Path
+from typing import List, Tuple
+
+SUBJECTS = [
+    "Miet", "Arbeits", "Steuer", "Handels", "Bau", "Umwelt", "Wasser", "Energie", "Verkehrs", "Post",
+    "Kredit", "Versicherungs", "Renten", "Kranken", "Pflege", "Wehr", "Zivil", "Straf", "Jugend", "Tierschutz",
+    "Datenschutz", "Wahl", "Gewerbe", "Jagd", "Forst", "Luft", "See", "Bahn", "Fahrzeug", "Patent",
+]
+SUFFIXES = [("gesetz", "G"), ("verordnung", "V"), ("ordnung", "O"), ("gesetzbuch", "GB")]
+NOUNS = [
+    "Anspruch", "Vertrag", "Kündigung", "Frist", "Schadensersatz", "Leistung", "Gläubiger", "Schuldner",
+    "Behörde", "Antrag", "Bescheid", "Genehmigung", "Pflicht", "Zahlung", "Verfahren", "Erklärung",
+    "Verjährung", "Haftung", "Mangel", "Rücktritt", "Vergütung", "Entschädigung", "Anzeige", "Auskunft",
+]
+VERBS = ["ist", "gilt", "kann", "hat", "muss", "soll", "wird", "bedarf"]
+OBJECTS = [
+    "schriftlich zu erteilen", "unverzüglich anzuzeigen", "entsprechend anzuwenden", "ausgeschlossen",
+    "der Schriftform", "innerhalb eines Monats geltend zu machen", "nicht übertragbar", "zu begründen",
+]
+HEADINGS = [
+    "Allgemeine Vorschriften", "Begriffsbestimmungen", "Zuständigkeit", "Verfahren", "Rechte und Pflichten",
+    "Bußgeldvorschriften", "Übergangsvorschriften", "Schlussvorschriften", "Gebühren", "Aufsicht",
+]
+
+
+def law_identity(index: int) -> Tuple[str, str]:
+    """Unique (jurabk, title) of the law at a position."""
+    subject = SUBJECTS[index % len(SUBJECTS)]
+    suffix, abbreviation = SUFFIXES[(index // len(SUBJECTS)) % len(SUFFIXES)]
+    series = index // (len(SUBJECTS) * len(SUFFIXES))
+    code = f"{subject[:4]}{abbreviation}" + (str(series + 1) if series else "")
+    title = f"{subject}{suffix}" + (f" {series + 1}" if series else "")
+    return code, title
+
+
+def paragraph_count(rng: random.Random, mean: float) -> int:
+    """Long-tailed paragraph count with the given median."""
+    return max(1, min(3000, int(rng.lognormvariate(math.log(mean), 1.0))))
+
+
+def sentence(rng: random.Random, codes: List[str], own_paragraphs: int) -> str:
+    text = f"Der {rng.choice(NOUNS)} {rng.choice(VERBS)} {rng.choice(OBJECTS)}"
+    roll = rng.random()
+    if roll < 0.15:
+        text += f", soweit § {rng.randint(1, own_paragraphs)} Abs. {rng.randint(1, 3)} nichts anderes bestimmt"
+    elif roll < 0.22:
+        text += f"; § {rng.randint(1, 200)} {rng.choice(codes)} bleibt unberührt"
+    return text + "."
+
+
+def law_markdown(index: int, mean_paragraphs: float, seed: int, codes: List[str]) -> Tuple[str, str]:
+    """(jurabk, markdown) of the law at a position."""
+    rng = random.Random(seed * 1000003 + index)
+    code, title = law_identity(index)
+    paragraphs = paragraph_count(rng, mean_paragraphs)
+    lines = ["---", f"Title: {title}", f"jurabk: {code}", "layout: default", f"slug: {code.lower()}", "---", "",
+             f"# {title} ({code})", ""]
+
+    number = 0
+    for p in range(paragraphs):
+        if p % 20 == 0:
+            lines += [f"## Abschnitt {p // 20 + 1} - {rng.choice(HEADINGS)}", ""]
+        if rng.random() < 0.05 and number:
+            p_id = f"{number}{'abc'[rng.randint(0, 2)]}"
+        else:
+            number += 1
+            p_id = str(number)
+        lines += [f"### § {p_id} {rng.choice(NOUNS)}", ""]
+        for absatz in range(1, rng.choice([1, 1, 2, 3, 4]) + 1):
+            text = " ".join(sentence(rng, codes, paragraphs) for _ in range(rng.randint(1, 4)))
+            lines.append(f"({absatz}) {text}")
+            if rng.random() < 0.2:
+                lines[-1] = lines[-1][:-1] + ":"
+                lines += [f"{n}. {sentence(rng, codes, paragraphs)[:-1]}," for n in range(1, rng.randint(2, 5))]
+            lines.append("")
+    return code, "\n".join(lines) + "\n"
+
+
+def generate_corpus(folder: Path, laws: int, mean_paragraphs: float = 25, seed: int = 1) -> List[Path]:
+    """Write `laws` laws below `folder` and return the paths of their `index.md` files."""
+    # Referenced laws do not depend on the corpus size, so small corpora are prefixes of large ones
+    codes = [law_identity(i)[0] for i in range(50)]
+    paths = []
+    for i in range(laws):
+        code, markdown = law_markdown(i, mean_paragraphs, seed, codes)
+        path = Path(folder) / code[0].lower() / code.lower() / "index.md"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(markdown, encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('folder', type=Path)
+    arg_parser.add_argument('--laws', type=int, default=1000)
+    arg_parser.add_argument('--paragraphs', type=float, default=25, help='median number of paragraphs per law')
+    arg_parser.add_argument('--seed', type=int, default=1)
+    args = arg_parser.parse_args()
+
+    paths = generate_corpus(args.folder, args.laws, args.paragraphs, args.seed)
+    print(f"Wrote {len(paths)} laws to {args.folder}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Reading laws directly from zip and tar archives (e.g. a packed copy of the
+`laws_md` folder written by `prepare_data`), without extracting them.
+"""
+import calendar
+import tarfile
+import zipfile
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, Callable, Iterator, NamedTuple, Union
+
+
+class ArchiveMember(NamedTuple):
+    name: str
+    mtime_ns: int
+    size: int
+    open: Callable[[], BinaryIO]
+
+
+def is_archive(path: Union[str, Path]) -> bool:
+    path = Path(path)
+    return path.is_file() and (zipfile.is_zipfile(path) or tarfile.is_tarfile(path))
+
+
+def iter_members(path: Union[str, Path], filename: str = 'index.md') -> Iterator[ArchiveMember]:
+    """
+    Files named `filename` (or matching it, e.g. "*.xml") in a zip or tar
+    archive (optionally compressed with gzip, bzip2 or xz), in archive order. A member can only be opened
+    while the iteration has not moved past it.
+
+    Raises:
+        ValueError: if the file is not a zip or tar archive
+    """
+    path = Path(path)
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if info.is_dir() or not PurePosixPath(info.filename).match(filename):
+                    continue
+                # Zip timestamps have no time zone; only equality matters here
+                mtime = calendar.timegm(info.date_time + (0, 0, -1))
+                yield ArchiveMember(
+                    info.filename, mtime * 10**9, info.file_size, lambda info=info: archive.open(info)
+                )
+    elif tarfile.is_tarfile(path):
+        with tarfile.open(path, 'r:*') as archive:
+            for info in archive:
+                if not info.isfile() or not PurePosixPath(info.name).match(filename):
+                    continue
+                yield ArchiveMember(
+                    info.name, int(info.mtime) * 10**9, info.size, lambda info=info: archive.extractfile(info)
+                )
+    else:
+        raise ValueError(f"'{path}' is neither a zip nor a tar archive")
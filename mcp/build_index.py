@@ -0,0 +1,46 @@
+"""
+Build or update the persistent law index without starting the server.
+
+Usage:
+    INDEX_PATH=/app/index.sqlite python build_index.py
+"""
+from contextlib import nullcontext
+from config import settings
+from parser import LawLibrary
+from fetch import HttpFetcher
+from profiling import Profiler, report_load_timings
+
+if __name__ == "__main__":
+    if not settings.index_path:
+        raise SystemExit('INDEX_PATH is not set')
+
+    library = LawLibrary(
+        index_path=settings.index_path,
+        fetcher=HttpFetcher(cache_dir=settings.http_cache_dir, max_workers=settings.http_workers),
+        search_mode=settings.search_mode,
+        record_timings=settings.profile_startup
+    )
+    profiler = Profiler(settings.profile_dir, trace_memory=settings.profile_memory) if settings.profile_startup else None
+
+    with profiler.profile('build_index') if profiler else nullcontext():
+        if settings.load_from_archive:
+            library.load_laws_from_archive(settings.load_from_archive)
+        elif settings.load_from_xml:
+            library.load_laws_from_xml(settings.load_from_xml)
+        elif settings.load_from_folder:
+            library.load_laws_from_folder(settings.load_from_folder, workers=settings.parse_workers)
+        elif settings.load_from_github:
+            library.load_laws_from_github(settings.load_from_github)
+        else:
+            raise SystemExit('No law source provided')
+
+    if profiler:
+        report_load_timings(library, profiler)
+
+    if settings.similarity_index:
+        library.build_similarity_index()
+
+    # Move the WAL into the index file, so it can be served with INDEX_IMMUTABLE
+    library.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    library.conn.close()
+    print(f'Indexed {len(library.catalog)} laws into {settings.index_path}')
@@ -0,0 +1,163 @@
+"""
+Size-bounded LRU cache used for parsed laws and tool responses.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterator, Mapping, Optional
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache bounded by number of items and/or total size.
+
+    The size of an entry is given by the caller (e.g. an estimate of its
+    memory footprint in bytes). Hits, misses and evictions are counted.
+    """
+
+    def __init__(self, max_items: Optional[int] = None, max_bytes: Optional[int] = None):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Look up a value without counting a hit/miss or refreshing it."""
+        entry = self._entries.get(key)
+        return default if entry is None else entry[0]
+
+    def put(self, key: Hashable, value: Any, size: int = 1):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self._entries[key] = (value, size)
+            self.bytes += size
+            self._evict()
+
+    def resize(self, key: Hashable, size: int):
+        """Update the size of an entry that grew or shrank since it was put."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            self._entries[key] = (entry[0], size)
+            self.bytes += size - entry[1]
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def _evict(self):
+        # Always keep the newest entry, even if it alone exceeds the budget
+        while len(self._entries) > 1 and (
+            (self.max_items is not None and len(self._entries) > self.max_items)
+            or (self.max_bytes is not None and self.bytes > self.max_bytes)
+        ):
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+
+    def pop(self, key: Hashable):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.bytes -= entry[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "items": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+class LazyLaws(Mapping):
+    """
+    Read-only mapping of law code -> parsed law that only knows the catalog
+    up front and loads laws on first access into an LRU cache.
+
+    Args:
+        catalog: Mapping of law code -> catalog entry (shared with the library)
+        load: Callable building the parsed law for a law code
+        sizeof: Callable estimating the memory footprint of a parsed law
+        cache: The LRU cache holding parsed laws
+    """
+
+    def __init__(self, catalog: Mapping, load: Callable[[str], Any], sizeof: Callable[[Any], int], cache: LRUCache):
+        self.catalog = catalog
+        self.load = load
+        self.sizeof = sizeof
+        self.cache = cache
+        # One lock per law being loaded, so different laws load in parallel
+        self._lock = threading.Lock()
+        self._loading: Dict[str, list] = {}
+
+    def __getitem__(self, code: str) -> Any:
+        law = self.cache.get(code)
+        if law is not None:
+            return law
+        if code not in self.catalog:
+            raise KeyError(code)
+        with self._lock:
+            # [lock, number of threads using it]
+            loading = self._loading.setdefault(code, [threading.Lock(), 0])
+            loading[1] += 1
+        try:
+            with loading[0]:
+                # Another thread may have loaded it in the meantime
+                law = self.cache.peek(code)
+                if law is None:
+                    law = self.load(code)
+                    self.cache.put(code, law, self.sizeof(law))
+        finally:
+            with self._lock:
+                loading[1] -= 1
+                if not loading[1]:
+                    del self._loading[code]
+        return law
+
+    def __contains__(self, code: object) -> bool:
+        return code in self.catalog
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.catalog)
+
+    def __len__(self) -> int:
+        return len(self.catalog)
+
+    def remeasure(self, code: str):
+        """Update the size of a cached law, e.g. after it built paragraph indexes."""
+        law = self.cache.peek(code)
+        if law is not None:
+            self.cache.resize(code, self.sizeof(law))
+
+    def invalidate(self, code: str):
+        """Drop a cached law, e.g. after it was re-indexed."""
+        self.cache.pop(code)
@@ -0,0 +1,168 @@
+"""
+Parsing of German law citations such as "§ 823 Abs. 1 S. 2 BGB" or
+"§§ 433-453 BGB".
+"""
+import re
+from typing import List, NamedTuple, Optional
+
+# Finer parts of a citation that are not resolved, e.g. "Buchst. a", "Halbsatz 2"
+MINOR_QUALIFIER = r"""(?:,?\s*(?:Buchst(?:abe|\.)|lit\.|Halbs(?:atz|\.)|Alt(?:ernative|\.)|Var(?:iante|\.))\s*(?:\d+|[a-z]{1,2}\b))"""
+
+# Paragraph part of a citation: § 823, §§ 433-453, § 5 Abs. 2 S. 1 Nr. 3
+PARAGRAPH_CITATION = r"""
+    (?P<start>\d+[a-z]*)
+    (?:\s*(?:-|–|bis)\s*(?:§\s*)?(?P<end>\d+[a-z]*))?
+    (?:,?\s*Abs(?:atz|\.)?\s*(?P<absatz>\d+[a-z]*))?
+    (?:,?\s*S(?:atz|\.)\s*(?P<satz>\d+))?
+    (?:,?\s*(?:Nr\.|Nummer)\s*(?P<nummer>\d+[a-z]*))?
+""" + MINOR_QUALIFIER + "*"
+
+CITATION_RE = re.compile(
+    r"""\s*(?:(?P<law_before>[^§\d\s][^§]*?)\s*(?:§§?|Art(?:ikel|\.)?)|(?:§§?|Art(?:ikel|\.)?)?)\s*"""
+    + PARAGRAPH_CITATION
+    + r"""(?:\s+(?P<law>\S.*?))?\s*""",
+    re.X
+)
+
+# Law before the paragraph without a § sign, as typed in a search: "bgb 823"
+BARE_CITATION_RE = re.compile(
+    r"""\s*(?P<law_before>[^§\d\s][^§]*?)\s+"""
+    + PARAGRAPH_CITATION
+    + r"""\s*""",
+    re.X
+)
+
+
+class Citation(NamedTuple):
+    law: Optional[str]
+    start: str
+    end: Optional[str] = None
+    absatz: Optional[str] = None
+    satz: Optional[str] = None
+    nummer: Optional[str] = None
+
+
+def parse_citation(text: str) -> Citation:
+    """
+    Parse a single citation. The law may follow ("§ 823 BGB") or precede
+    ("BGB § 823", "bgb 823") the paragraph, or be missing.
+
+    Raises:
+        ValueError: if the text is not a citation
+    """
+    m = CITATION_RE.fullmatch(text) or BARE_CITATION_RE.fullmatch(text)
+    if not m:
+        raise ValueError(f"Could not parse reference '{text}'")
+    return Citation(
+        m.groupdict().get('law') or m.group('law_before'),
+        m.group('start'),
+        m.group('end'),
+        m.group('absatz'),
+        m.group('satz'),
+        m.group('nummer'),
+    )
+
+
+# Law named after a citation: an abbreviation ("BGB", "SGB V"), a title in
+# genitive ("des Handelsgesetzbuches") or the citing law itself
+LAW_SUFFIX = r"""
+    (?:\s+(?:
+        (?P<code>[A-ZÄÖÜ][A-Za-zÄÖÜäöüß]*[A-ZÄÖÜ](?:\s+(?:[IVX]+|\d+)\b)?)
+        |(?:des|der)\s+(?P<title>(?:[A-ZÄÖÜ][\wäöüß-]*\s+){0,3}[A-ZÄÖÜ][\wäöüß-]*?
+            (?:gesetz|gesetzes|gesetzbuch|gesetzbuches|gesetzbuchs|ordnung|buch|buches|buchs))
+        |(?P<self>dieses\s+Gesetzes|dieser\s+Verordnung|dieses\s+Buches)
+    )\b)?
+"""
+
+# Absatz, Satz or Nummer of a paragraph in a list: "13 Abs. 1"
+QUALIFIER = r"""(?:,?\s*(?:Abs(?:atz|\.)?|S(?:atz|\.)|Nr\.|Nummer)\s*\d+[a-z]*\b|""" + MINOR_QUALIFIER + ")"
+
+# Further paragraphs of a list: ", 13 Abs. 1 und 14"
+LIST_ITEM_RE = re.compile(
+    r"""\s*(?:,|und|oder|sowie)\s*(?P<start>\d+[a-z]*)\b(?:,?\s*Abs(?:atz|\.)?\s*(?P<absatz>\d+[a-z]*)\b)?"""
+    + QUALIFIER + "*"
+)
+
+REFERENCE_RE = re.compile(
+    r"""(?P<sign>§§|§|Art(?:ikel|\.))\s*"""
+    + PARAGRAPH_CITATION
+    + r"""(?P<more>(?:\s*(?:,|und|oder|sowie)\s*\d+[a-z]*\b""" + QUALIFIER + r"""*)*)"""
+    + LAW_SUFFIX,
+    re.X
+)
+
+# Qualifiers that may follow a citation without being understood
+UNRESOLVED_QUALIFIER = r"""Abs\b|Satz\b|S\.|Nr\.|Nummer\b|lit\.|Buchst|Doppelbuchst|Halbs|Teils|Alt\b|Alt\.|Alternative\b|Var\b|Var\.|Variante\b|Unterabs"""
+# Rest of the citation up to a law named at its end
+UNRESOLVED_LAW = (
+    r"""(?:[^§;:.]|\b(?:Abs|S|Nr|lit|Buchst|Doppelbuchst|Halbs|Alt|Var|Unterabs)\.){0,80}?"""
+    r"""\s(?:[A-ZÄÖÜ][A-Za-zÄÖÜäöüß]*[A-ZÄÖÜ]|(?:des|der)\s+[A-ZÄÖÜ][\wäöüß-]*)\b"""
+)
+
+# A list continuing after the match in a form not understood, but naming a
+# law at its end ("§§ 12, 13 Abs. 1 Doppelbuchst. aa und 14 VwVfG")
+UNRESOLVED_LIST_RE = re.compile(r"""\s*(?:,|und|oder|sowie|(?:""" + UNRESOLVED_QUALIFIER + r""")\.?)""" + UNRESOLVED_LAW)
+
+# A single citation continuing the same way ("§ 10 Abs. 1 Teilsatz 2 EStG")
+UNRESOLVED_QUALIFIER_RE = re.compile(r"""\s*(?:""" + UNRESOLVED_QUALIFIER + r""")\.?""" + UNRESOLVED_LAW)
+
+
+class Reference(NamedTuple):
+    """A reference found in a paragraph text. `law` is None for the citing law itself."""
+    law: Optional[str]
+    title: bool
+    start: str
+    end: Optional[str]
+    absatz: Optional[str]
+
+
+def extract_references(text: str) -> List[Reference]:
+    """
+    Find all references to paragraphs in a text, e.g. "§ 280 Abs. 1",
+    "§ 823 BGB", "§§ 433 bis 453" or "§ 5 des Handelsgesetzbuches".
+    `title` is True if `law` is a title rather than an abbreviation.
+    """
+    references = []
+    for m in REFERENCE_RE.finditer(text):
+        law = m.group('code') or m.group('title')
+        title = bool(m.group('title'))
+        is_list = m.group('sign') == '§§'
+        unresolved = UNRESOLVED_LIST_RE if is_list else UNRESOLVED_QUALIFIER_RE
+        if not law and not m.group('self') and unresolved.match(text, m.end()):
+            # The citation names a law we could not attribute; do not guess the citing law
+            continue
+        references.append(Reference(law, title, m.group('start'), m.group('end'), m.group('absatz')))
+        if is_list and m.group('more'):
+            # "§§ 823, 826 und 831" lists several paragraphs
+            references += [
+                Reference(law, title, item.group('start'), None, item.group('absatz'))
+                for item in LIST_ITEM_RE.finditer(m.group('more'))
+            ]
+        elif m.group('more') and m.group('absatz') and not (m.group('satz') or m.group('nummer')):
+            # "§ 823 Abs. 1 und 2" lists several Absätze of one paragraph
+            references += [
+                Reference(law, title, m.group('start'), m.group('end'), item.group('start'))
+                for item in LIST_ITEM_RE.finditer(m.group('more'))
+            ]
+    return references
+
+
+ROMAN_NUMERALS = {'I': 1, 'II': 2, 'III': 3, 'IV': 4, 'V': 5, 'VI': 6, 'VII': 7, 'VIII': 8, 'IX': 9,
+                  'X': 10, 'XI': 11, 'XII': 12, 'XIII': 13, 'XIV': 14}
+
+
+def normalize_law_code(code: str) -> str:
+    """Law code as used in the library: "SGB V" -> "sgb 5", "BGB" -> "bgb"."""
+    words = code.split()
+    if len(words) > 1 and words[-1] in ROMAN_NUMERALS:
+        words[-1] = str(ROMAN_NUMERALS[words[-1]])
+    return ' '.join(words).lower()
+
+
+def title_key(title: str) -> str:
+    """
+    Comparable form of a law title that ignores case and inflection, so
+    "des Bürgerlichen Gesetzbuchs" matches "Bürgerliches Gesetzbuch".
+    """
+    words = re.findall(r'[a-zäöüß]+', title.lower())
+    return ' '.join(re.sub(r'(?:es|en|er|e|s|n)$', '', word) for word in words)
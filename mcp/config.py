@@ -4,6 +4,34 @@ class Settings(BaseSettings):
     min_paragraphs: int = 5
     load_from_github: list[str] | None = None
     load_from_folder: str | None = '/app/gesetze/'
+    load_from_archive: str | None = None
+    load_from_xml: str | None = None
+    index_path: str | None = None
+    reload_interval: float = 0
+    read_only_index: bool = False
+    index_immutable: bool = False
+    reader_connections: int = 4
+    tool_workers: int = 8
+    tool_queue_size: int = 64
+    query_timeout: float = 2.0
+    parse_workers: int = 1
+    http_workers: int = 8
+    http_cache_dir: str | None = None
+    lazy_load: bool = False
+    law_cache_size: int = 256
+    law_cache_memory_mb: float = 256
+    response_cache_size: int = 1024
+    compact_json: bool = False
+    batch_max_paragraphs: int = 100
+    search_name_weight: float = 2.0
+    search_content_weight: float = 1.0
+    search_mode: str = 'unicode61'
+    similarity_index: bool = False
+    profile_dir: str | None = None
+    profile_sample_rate: float = 0.0
+    profile_memory: bool = False
+    profile_startup: bool = False
+    slow_call_seconds: float = 0
 
     class Config:
         env_file = '.env'
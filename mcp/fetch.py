@@ -0,0 +1,191 @@
+"""
+HTTP fetching of law files.
+
+`HttpFetcher` downloads many URLs concurrently over persistent (keep-alive)
+connections, retries transient failures with exponential backoff and can
+keep a disk cache. Cached responses are revalidated with conditional
+requests (If-None-Match / If-Modified-Since), so an unchanged law costs a
+304 response instead of a full download.
+"""
+import gzip
+import hashlib
+import http.client
+import json
+import os
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+USER_AGENT = 'deutsche-gesetze-mcp'
+RETRY_STATUS = {429, 500, 502, 503, 504}
+REDIRECT_STATUS = {301, 302, 303, 307, 308}
+
+
+class FetchError(Exception):
+    """Raised when a URL cannot be fetched (after all retries)."""
+
+    def __init__(self, url: str, message: str, status: Optional[int] = None):
+        super().__init__(f"{url}: {message}")
+        self.url = url
+        self.status = status
+
+
+class HttpFetcher:
+    """
+    Concurrent HTTP client with connection reuse, retries and a
+    conditional-request disk cache.
+
+    Args:
+        cache_dir: Directory for cached responses, or None to disable caching
+        max_workers: Maximum number of concurrent requests in `fetch_many`
+        retries: Number of retries after a failed attempt
+        backoff: Delay before the first retry in seconds, doubled per retry
+        timeout: Socket timeout in seconds
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Union[str, Path]] = None,
+        max_workers: int = 8,
+        retries: int = 3,
+        backoff: float = 0.5,
+        timeout: float = 30
+    ):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self.stats: Dict[str, int] = {"requests": 0, "downloaded": 0, "not_modified": 0, "retries": 0, "errors": 0}
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _connection(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        """Keep-alive connection per thread and host."""
+        connections = getattr(self._local, 'connections', None)
+        if connections is None:
+            connections = self._local.connections = {}
+        conn = connections.get((scheme, netloc))
+        if conn is None:
+            conn_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+            conn = connections[(scheme, netloc)] = conn_class(netloc, timeout=self.timeout)
+        return conn
+
+    def _drop_connection(self, scheme: str, netloc: str):
+        conn = self._local.connections.pop((scheme, netloc), None)
+        if conn is not None:
+            conn.close()
+
+    def _request(self, url: str, headers: Dict[str, str]) -> Tuple[int, http.client.HTTPMessage, bytes]:
+        parts = urllib.parse.urlsplit(url)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        conn = self._connection(parts.scheme, parts.netloc)
+        try:
+            conn.request('GET', path, headers=headers)
+            response = conn.getresponse()
+            body = response.read()
+        except (OSError, http.client.HTTPException):
+            # Stale keep-alive connection or network error: reconnect next time
+            self._drop_connection(parts.scheme, parts.netloc)
+            raise
+        if response.will_close:
+            self._drop_connection(parts.scheme, parts.netloc)
+        if response.headers.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+        return response.status, response.headers, body
+
+    def _cache_paths(self, url: str) -> Tuple[Path, Path]:
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return self.cache_dir / f'{key}.body', self.cache_dir / f'{key}.json'
+
+    def _read_cache(self, url: str) -> Tuple[Optional[bytes], Dict[str, str]]:
+        if not self.cache_dir:
+            return None, {}
+        body_path, meta_path = self._cache_paths(url)
+        try:
+            meta = json.loads(meta_path.read_text())
+            return body_path.read_bytes(), meta
+        except (OSError, ValueError):
+            return None, {}
+
+    def _write_cache(self, url: str, body: bytes, headers: http.client.HTTPMessage):
+        if not self.cache_dir:
+            return
+        body_path, meta_path = self._cache_paths(url)
+        meta = {"url": url, "etag": headers.get('ETag'), "last_modified": headers.get('Last-Modified')}
+        for path, data in ((body_path, body), (meta_path, json.dumps(meta).encode('utf-8'))):
+            tmp = path.with_suffix(path.suffix + f'.{os.getpid()}.{threading.get_ident()}.tmp')
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+
+    def fetch(self, url: str) -> bytes:
+        """
+        Fetch a URL, using and updating the disk cache.
+
+        Raises:
+            FetchError: if the URL cannot be fetched
+        """
+        cached, meta = self._read_cache(url)
+        headers = {'User-Agent': USER_AGENT, 'Accept-Encoding': 'gzip'}
+        if cached is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        target = url
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self._count('retries')
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+            self._count('requests')
+            try:
+                status, response_headers, body = self._request(target, headers)
+                redirects = 0
+                while status in REDIRECT_STATUS and redirects < 5:
+                    target = urllib.parse.urljoin(target, response_headers['Location'])
+                    status, response_headers, body = self._request(target, headers)
+                    redirects += 1
+            except (OSError, http.client.HTTPException) as e:
+                error = FetchError(url, str(e))
+                continue
+
+            if status == 304 and cached is not None:
+                self._count('not_modified')
+                return cached
+            if status == 200:
+                self._count('downloaded')
+                self._write_cache(url, body, response_headers)
+                return body
+
+            error = FetchError(url, f"HTTP {status}", status)
+            if status not in RETRY_STATUS:
+                break
+
+        self._count('errors')
+        raise error
+
+    def fetch_many(self, urls: List[str]) -> Iterator[Tuple[str, Union[bytes, FetchError]]]:
+        """
+        Fetch URLs concurrently (at most `max_workers` at a time) and yield
+        (url, body or error) in the order of `urls`.
+        """
+        def fetch_one(url: str) -> Union[bytes, FetchError]:
+            try:
+                return self.fetch(url)
+            except FetchError as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as pool:
+            yield from zip(urls, pool.map(fetch_one, urls))
@@ -0,0 +1,280 @@
+"""
+SQLite storage for the law library.
+
+The same schema is used for the default in-memory database and for an
+optional index file on disk:
+
+- `sources`: one row per loaded source (file path or URL) with its
+  fingerprint, the rowid range of its paragraphs and its outline
+  (headings above the paragraphs, as JSON)
+- `paragraphs`: the parsed paragraphs, in source order
+- `laws_fts`: FTS5 index over `paragraphs` (external content)
+- `refs`: references found in the paragraphs ("§ 823 BGB"), indexed by
+  citing paragraph and by target for "cited by" lookups
+
+With an index file, a restart only re-parses sources whose fingerprint
+changed; everything else is restored from `paragraphs`. Index files use
+WAL journaling, so read-only connections (`connect_readonly`, e.g. of
+several server processes) read concurrently with each other and with the
+process updating the index.
+
+The tokenizer of `laws_fts` is selected by the search mode (see
+`SEARCH_MODES`). Changing it rebuilds only the FTS index.
+"""
+import hashlib
+import queue
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator, List, Optional, Tuple, Union
+
+SCHEMA_VERSION = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS sources (
+    source TEXT PRIMARY KEY,
+    mtime_ns INTEGER,
+    size INTEGER,
+    digest TEXT,
+    law_code TEXT,
+    short_title TEXT,
+    full_title TEXT,
+    first_id INTEGER,
+    last_id INTEGER,
+    outline TEXT
+);
+CREATE TABLE IF NOT EXISTS paragraphs (
+    id INTEGER PRIMARY KEY,
+    law_code TEXT,
+    paragraph_id TEXT,
+    paragraph_name TEXT,
+    content TEXT
+);
+CREATE TABLE IF NOT EXISTS refs (
+    paragraph_rowid INTEGER,
+    law_ref TEXT,
+    target_law TEXT,
+    target_start TEXT,
+    target_end TEXT,
+    target_absatz TEXT
+);
+CREATE INDEX IF NOT EXISTS refs_paragraph ON refs (paragraph_rowid);
+CREATE INDEX IF NOT EXISTS refs_target ON refs (target_law, target_start);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS laws_fts USING fts5(
+    law_code UNINDEXED,
+    paragraph_id UNINDEXED,
+    paragraph_name,
+    content,
+    content='paragraphs',
+    content_rowid='id',
+    tokenize='{tokenize}'
+);
+"""
+
+# Search mode -> FTS5 tokenizer
+#   unicode61: whole words, as written
+#   german:    whole words without diacritics ("Verträge" = "vertrage"); queries
+#              are stemmed and matched as prefixes (see `normalize_query`)
+#   trigram:   any substring of at least three characters, e.g. "ersatz"
+#              matches "Schadensersatzanspruch"; larger index
+SEARCH_MODES = {
+    'unicode61': 'unicode61',
+    'german': 'unicode61 remove_diacritics 2',
+    'trigram': 'trigram',
+}
+
+TABLES = ('refs', 'laws_fts', 'paragraphs', 'sources', 'meta')
+
+# SQLite VM instructions between two checks of a query's time budget
+PROGRESS_INTERVAL = 1000
+
+
+def connect(path: Optional[Union[str, Path]] = None, search_mode: str = 'unicode61') -> sqlite3.Connection:
+    """
+    Open the index at `path` (or an in-memory database) and make sure the
+    schema is current. An index written by an older schema version is
+    dropped and rebuilt from scratch; an index built for another search
+    mode gets its FTS index rebuilt from the stored paragraphs.
+    """
+    if search_mode not in SEARCH_MODES:
+        raise ValueError(f"Unknown search mode '{search_mode}', expected one of {', '.join(SEARCH_MODES)}")
+    conn = sqlite3.connect(str(path) if path else ':memory:', check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    if path:
+        conn.execute("PRAGMA journal_mode = WAL")
+
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version != SCHEMA_VERSION:
+        for table in TABLES:
+            conn.execute(f"DROP TABLE IF EXISTS {table}")
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    conn.executescript(SCHEMA)
+    current = get_meta(conn, 'search_mode')
+    if current != search_mode:
+        conn.execute("DROP TABLE IF EXISTS laws_fts")
+    conn.executescript(FTS_SCHEMA.format(tokenize=SEARCH_MODES[search_mode]))
+    if current != search_mode:
+        conn.execute("INSERT INTO laws_fts (laws_fts) VALUES ('rebuild')")
+        set_meta(conn, 'search_mode', search_mode)
+    conn.commit()
+    return conn
+
+
+def connect_readonly(path: Union[str, Path], immutable: bool = False) -> sqlite3.Connection:
+    """
+    Open an existing index file read-only. With `immutable`, SQLite skips
+    all locking and change detection; only use it if no process writes to
+    the file while it is open.
+
+    Raises:
+        ValueError: if the file is missing or was built by another schema version
+    """
+    path = Path(path).resolve()
+    if not path.is_file():
+        raise ValueError(f"Index file '{path}' not found, build it with build_index.py")
+    uri = f"{path.as_uri()}?mode=ro" + ("&immutable=1" if immutable else "")
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version != SCHEMA_VERSION:
+        conn.close()
+        raise ValueError(f"Index file '{path}' has schema version {version}, expected {SCHEMA_VERSION}; rebuild it")
+    return conn
+
+
+class ReaderPool:
+    """
+    Fixed set of read-only connections to an index file. Each connection
+    is used by one thread at a time, so queries of concurrent requests run
+    in parallel (SQLite releases the GIL while it executes them).
+    """
+
+    def __init__(self, path: Union[str, Path], size: int, immutable: bool = False):
+        self.size = size
+        self.connections: List[sqlite3.Connection] = [connect_readonly(path, immutable) for _ in range(size)]
+        self._idle: 'queue.LifoQueue[sqlite3.Connection]' = queue.LifoQueue()
+        for conn in self.connections:
+            self._idle.put(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection, waiting until one is idle."""
+        conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self):
+        for conn in self.connections:
+            conn.close()
+
+
+@contextmanager
+def time_budget(conn: sqlite3.Connection, seconds: Optional[float]) -> Iterator[Callable[[], bool]]:
+    """
+    Interrupt queries on `conn` once `seconds` have passed in total. An
+    interrupted query raises `sqlite3.OperationalError`; the yielded
+    function tells whether the budget is used up, to tell an interrupt
+    from other errors. The clock is checked every `PROGRESS_INTERVAL`
+    SQLite VM instructions. No budget if `seconds` is None or 0.
+
+    The progress handler belongs to the connection, so no other thread may
+    run queries on `conn` while the budget is in effect.
+    """
+    if not seconds:
+        yield lambda: False
+        return
+    deadline = time.monotonic() + seconds
+    expired = lambda: time.monotonic() > deadline
+    conn.set_progress_handler(expired, PROGRESS_INTERVAL)
+    try:
+        yield expired
+    finally:
+        conn.set_progress_handler(None, PROGRESS_INTERVAL)
+
+
+def get_meta(conn: sqlite3.Connection, key: str) -> Optional[str]:
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def set_meta(conn: sqlite3.Connection, key: str, value: str):
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+
+def clear(conn: sqlite3.Connection):
+    """Remove all indexed sources, paragraphs and references."""
+    conn.execute("DELETE FROM refs")
+    conn.execute("INSERT INTO laws_fts (laws_fts) VALUES ('delete-all')")
+    conn.execute("DELETE FROM paragraphs")
+    conn.execute("DELETE FROM sources")
+
+
+def stat_fingerprint(path: Path) -> Tuple[int, int]:
+    """Cheap fingerprint of a file: (mtime in ns, size in bytes)."""
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size
+
+
+def digest(data: bytes) -> str:
+    """Content fingerprint, used when mtime/size changed."""
+    return hashlib.sha1(data).hexdigest()
+
+
+def digest_stream(stream: BinaryIO, chunk_size: int = 1 << 16) -> str:
+    """`digest` of the content of a binary stream, read in chunks."""
+    hasher = hashlib.sha1()
+    for chunk in iter(lambda: stream.read(chunk_size), b''):
+        hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+QUERY_TOKEN_RE = re.compile(r'"(?:[^"]|"")*"|[()]|[^\s()"]+')
+QUERY_OPERATORS = {'AND', 'OR', 'NOT'}
+GERMAN_SUFFIXES = ('ern', 'em', 'en', 'er', 'es', 'e', 'n', 's')
+
+
+def _stem(word: str) -> str:
+    """Light German stemming: strip one inflection suffix ("Kündigungen" -> "kündigung")."""
+    word = word.lower()
+    for suffix in GERMAN_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 4:
+            return word[:-len(suffix)]
+    return word
+
+
+def normalize_query(query: str, search_mode: str) -> str:
+    """
+    Rewrite an FTS5 query for the tokenizer of `search_mode`. Operators,
+    parentheses, column filters and prefix queries are kept.
+
+    - german: each word is stemmed and matched as a prefix, so "Kündigungen"
+      finds "Kündigung" and "Kündigungsfrist"; phrases are kept
+    - trigram: each word is matched as a substring
+    """
+    if search_mode == 'unicode61':
+        return query
+
+    parts = []
+    for token in QUERY_TOKEN_RE.findall(query):
+        if token in QUERY_OPERATORS or token in ('(', ')') or token.startswith('NEAR') or ':' in token:
+            parts.append(token)
+        elif search_mode == 'trigram':
+            text = token[1:-1].replace('""', '"') if token.startswith('"') else token.rstrip('*')
+            parts.append('"' + text.replace('"', '""') + '"')
+        elif token.startswith('"') or token.endswith('*'):
+            parts.append(token)
+        else:
+            parts.append('"' + _stem(token).replace('"', '""') + '"*')
+    return ' '.join(parts)
@@ -0,0 +1,165 @@
+"""
+Reading laws directly from the XML published by gesetze-im-internet.de
+(`https://www.gesetze-im-internet.de/<law>/xml.zip`, or the XML files
+`lawde.py loadall` of gesetze-tools extracts from them), without converting
+them to Markdown files first.
+
+A law is one `<dokumente>` element with a `<norm>` per structural unit:
+the first norm describes the law (`jurabk`, `langue`), the others are
+headings (`gliederungseinheit`, e.g. "Buch 1 - Allgemeiner Teil") or
+paragraphs (`enbez`, e.g. "§ 1", with `titel` and the text in `Content`).
+
+`markdown_lines` turns the XML into the lines `lawdown.py convert` would
+write (front matter, headings whose level follows the
+`gliederungskennzahl`, one line per `<P>`, list items as "1.  text"), so
+`LawParser` builds the same law from either format. Inline markup,
+footnotes and images are reduced to plain text. The XML is read with
+`iterparse` and every norm is dropped once converted, so memory is bounded
+by the largest norm, not the law.
+"""
+import xml.etree.ElementTree as ET
+from typing import Any, BinaryIO, Iterator, List, Optional
+
+# Elements whose text is dropped, e.g. footnote references and images
+SKIPPED = {'FnR', 'Footnotes', 'img', 'IMG', 'kommentar', 'fussnoten'}
+# Markup inside a line of text; every other element starts a new line
+INLINE = {'B', 'I', 'U', 'F', 'SUP', 'SUB', 'small', 'NB', 'noindex', 'span', 'Citation', 'AbwFormat'}
+INDENT = '    '
+
+
+class _HashingReader:
+    """File-like wrapper updating a hash with everything read."""
+
+    def __init__(self, stream: BinaryIO, hasher: Any):
+        self.stream = stream
+        self.hasher = hasher
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.stream.read(size)
+        self.hasher.update(data)
+        return data
+
+
+def markdown_lines(stream: BinaryIO, hasher: Optional[Any] = None) -> Iterator[str]:
+    """
+    Lines of the Markdown for the law in an XML stream, converted one norm
+    at a time. If given, `hasher` (e.g. `hashlib.sha1()`) is updated with
+    the raw bytes.
+    """
+    source = _HashingReader(stream, hasher) if hasher is not None else stream
+    root = None
+    first = True
+    # Heading level of the last gliederungseinheit; paragraphs are one deeper
+    level = 1
+    for event, elem in ET.iterparse(source, events=('start', 'end')):
+        if root is None:
+            root = elem
+        if event != 'end' or elem.tag != 'norm':
+            continue
+
+        meta = elem.find('metadaten')
+        if meta is None:
+            meta = ET.Element('metadaten')
+        if first:
+            first = False
+            yield from _header(meta)
+        else:
+            heading = None
+            unit = meta.find('gliederungseinheit')
+            if unit is not None:
+                level = min(len(_text(unit.find('gliederungskennzahl'))) // 3 + 1, 6)
+                heading = ' - '.join(filter(None, (_text(unit.find('gliederungsbez')), _text(unit.find('gliederungstitel')))))
+                heading = '#' * level + ' ' + heading
+            enbez = _text(meta.find('enbez'))
+            if enbez:
+                heading = '#' * min(level + 1, 6) + ' ' + ' '.join(filter(None, (enbez, _text(meta.find('titel')))))
+            if heading:
+                yield heading
+                yield ''
+            content = elem.find('textdaten/text/Content')
+            if content is not None:
+                yield from _block(content, '')
+
+        # Converted norms are not needed anymore
+        root.clear()
+
+
+def _header(meta: ET.Element) -> Iterator[str]:
+    """Front matter and title of the law, from the metadata of its first norm."""
+    code = _text(meta.find('jurabk')) or _text(meta.find('amtabk'))
+    title = _text(meta.find('langue')) or _text(meta.find('kurzue')) or code
+    yield '---'
+    yield f'Title: {title}'
+    yield f'jurabk: {code}'
+    yield '---'
+    yield ''
+    yield f'# {title} ({code})'
+    yield ''
+
+
+def _text(elem: Optional[ET.Element]) -> str:
+    """Text of an element and its inline markup, with whitespace collapsed."""
+    if elem is None:
+        return ''
+    parts = [elem.text or '']
+    for child in elem:
+        if child.tag not in SKIPPED:
+            parts.append(_text(child))
+        parts.append(child.tail or '')
+    return ' '.join(''.join(parts).split())
+
+
+def _block(elem: ET.Element, indent: str) -> List[str]:
+    """
+    Lines of an element with mixed content: inline text is joined into
+    one line, other child elements start new lines. Every `<P>` is
+    followed by an empty line.
+    """
+    lines: List[str] = []
+    current = [elem.text or '']
+
+    def flush():
+        text = ' '.join(''.join(current).split())
+        if text:
+            lines.append(indent + text)
+        current.clear()
+
+    for child in elem:
+        if child.tag in SKIPPED:
+            pass
+        elif child.tag in INLINE:
+            current.append(_text(child))
+        else:
+            flush()
+            if child.tag == 'BR':
+                pass
+            elif child.tag == 'DL':
+                lines.extend(_list(child, indent))
+            elif child.tag == 'row':
+                # Table rows of the CALS tables as one line each
+                lines.append(indent + ' | '.join(_text(entry) for entry in child))
+            elif child.tag == 'pre':
+                lines.extend(indent + line.rstrip() for line in ''.join(child.itertext()).splitlines() if line.strip())
+            else:
+                lines.extend(_block(child, indent))
+                if child.tag == 'P':
+                    lines.append('')
+        current.append(child.tail or '')
+    flush()
+    return lines
+
+
+def _list(dl: ET.Element, indent: str) -> List[str]:
+    """List items ("1.  text", "a)  text"), nested lists indented further."""
+    lines: List[str] = []
+    label = ''
+    for child in dl:
+        if child.tag == 'DT':
+            label = _text(child)
+        elif child.tag == 'DD':
+            item = _block(child, indent + INDENT)
+            first = item.pop(0)[len(indent + INDENT):] if item and item[0].startswith(indent + INDENT) else ''
+            lines.append(f'{indent}{label.ljust(3)} {first}'.rstrip())
+            lines.extend(item)
+            label = ''
+    return lines
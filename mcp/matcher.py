@@ -0,0 +1,151 @@
+"""
+Lookup of laws by code, title or alias.
+
+`LawMatcher` keeps a pre-normalized index of every law's code, short title,
+full title and common aliases ("SGB V" for "SGB 5", "sgb5", inflected titles
+such as "des Bürgerlichen Gesetzbuchs"). Exact lookups are a dict access;
+fuzzy lookups score all choices in one native rapidfuzz call and cache the
+top results per query.
+"""
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from rapidfuzz import fuzz, process, utils
+
+from cache import LRUCache
+from citations import ROMAN_NUMERALS, normalize_law_code, title_key
+
+ARABIC_TO_ROMAN = {str(number): roman for roman, number in ROMAN_NUMERALS.items()}
+
+
+def _code_aliases(short_title: str) -> List[str]:
+    """Spellings of a law code: "SGB 5" -> "sgb 5", "sgb5", "sgb v", "sgbv"."""
+    code = normalize_law_code(short_title)
+    aliases = [code]
+    words = code.split()
+    if len(words) > 1 and words[-1] in ARABIC_TO_ROMAN:
+        aliases.append(' '.join(words[:-1] + [ARABIC_TO_ROMAN[words[-1]].lower()]))
+    aliases += [alias.replace(' ', '') for alias in aliases if ' ' in alias]
+    return aliases
+
+
+class LawMatcher:
+    """
+    Index of law codes, titles and aliases.
+
+    Args:
+        cache_size: Number of fuzzy queries whose results are cached
+        code_cutoff: Minimum score of a fuzzy match on a code or alias
+        title_cutoff: Minimum score of a fuzzy match on a title
+    """
+
+    def __init__(self, cache_size: int = 1024, code_cutoff: float = 60, title_cutoff: float = 75):
+        self.code_cutoff = code_cutoff
+        self.title_cutoff = title_cutoff
+        self._aliases: Dict[str, str] = {}
+        self._titles: Dict[str, str] = {}
+        self._laws: Dict[str, Tuple[List[str], str]] = {}
+        self._choices: Optional[Tuple[List[str], List[str], List[str], List[str]]] = None
+        self._lock = threading.Lock()
+        self.cache = LRUCache(max_items=cache_size)
+
+    def add(self, code: str, short_title: str, full_title: Optional[str]):
+        """Add or update a law."""
+        self.remove(code)
+        aliases = list(dict.fromkeys([code] + _code_aliases(short_title)))
+        key = title_key(full_title) if full_title else ''
+        with self._lock:
+            for alias in aliases:
+                self._aliases.setdefault(alias, code)
+            if key:
+                self._titles.setdefault(key, code)
+            self._laws[code] = (aliases, full_title or '')
+            self._changed()
+
+    def remove(self, code: str):
+        """Remove a law."""
+        with self._lock:
+            law = self._laws.pop(code, None)
+            if law is None:
+                return
+            aliases, full_title = law
+            for alias in aliases:
+                if self._aliases.get(alias) == code:
+                    del self._aliases[alias]
+            key = title_key(full_title)
+            if self._titles.get(key) == code:
+                del self._titles[key]
+            self._changed()
+
+    def _changed(self):
+        self._choices = None
+        self.cache.clear()
+
+    def resolve(self, name: str) -> Optional[str]:
+        """
+        Law code for an exact code, alias or (possibly inflected) title,
+        e.g. "SGB V" -> "sgb 5", "Bürgerlichen Gesetzbuchs" -> "bgb".
+        """
+        name = ' '.join(name.split())
+        code = self._aliases.get(name.lower()) or self._aliases.get(normalize_law_code(name))
+        return code or self._titles.get(title_key(name))
+
+    def _build_choices(self) -> Tuple[List[str], List[str], List[str], List[str]]:
+        """Processed choice strings with their law codes, split into codes/aliases and titles."""
+        choices = self._choices
+        if choices is None:
+            with self._lock:
+                alias_choices, alias_codes, title_choices, title_codes = [], [], [], []
+                for code, (aliases, full_title) in self._laws.items():
+                    for alias in aliases:
+                        alias_choices.append(utils.default_process(alias))
+                        alias_codes.append(code)
+                    if full_title:
+                        title_choices.append(utils.default_process(full_title))
+                        title_codes.append(code)
+                choices = self._choices = (alias_choices, alias_codes, title_choices, title_codes)
+        return choices
+
+    def match(self, query: str, limit: int = 50) -> List[Tuple[str, float]]:
+        """
+        Laws matching a query, as (code, score) pairs ordered by descending
+        score. Exact matches of a code, alias or title score 100; codes
+        and aliases are otherwise compared as a whole, titles also by
+        partial and token-based similarity.
+        """
+        processed = utils.default_process(query)
+        key = (processed, limit)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        scores: Dict[str, float] = {}
+        exact = self.resolve(query)
+        if exact:
+            scores[exact] = 100.0
+        alias_choices, alias_codes, title_choices, title_codes = self._build_choices()
+        for choices, codes, scorer, cutoff in (
+            (alias_choices, alias_codes, fuzz.QRatio, self.code_cutoff),
+            (title_choices, title_codes, fuzz.WRatio, self.title_cutoff),
+        ):
+            for code, score in self._score(processed, choices, codes, scorer, cutoff):
+                if score > scores.get(code, 0):
+                    scores[code] = score
+
+        result = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        self.cache.put(key, result)
+        return result
+
+    @staticmethod
+    def _score(query: str, choices: List[str], codes: List[str], scorer, cutoff: float) -> List[Tuple[str, float]]:
+        if not choices or not query:
+            return []
+        try:
+            # One vectorized call over all choices (needs numpy)
+            row = process.cdist([query], choices, scorer=scorer, score_cutoff=cutoff, workers=1)[0]
+            return [(codes[i], float(row[i])) for i in row.nonzero()[0]]
+        except ImportError:
+            return [
+                (codes[i], score)
+                for _, score, i in process.extract(query, choices, scorer=scorer, score_cutoff=cutoff, limit=None)
+            ]
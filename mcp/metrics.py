@@ -0,0 +1,204 @@
+"""
+In-process metrics: counters, histograms and gauges, rendered in the
+Prometheus text format (for a /metrics scrape endpoint) or as JSON.
+
+Recording a tool call costs two clock reads, a lock and a bisect; gauges
+are only computed when metrics are read.
+"""
+import bisect
+import functools
+import inspect
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Counts of observed values per bucket (upper bounds), plus their sum."""
+
+    __slots__ = ('buckets', 'counts', 'count', 'sum')
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """(upper bound, number of values <= bound) including +Inf."""
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets + (math.inf,), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket containing the q-quantile (None above the last bucket)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        for bound, total in self.cumulative():
+            if total >= rank:
+                return bound if bound != math.inf else None
+        return None
+
+
+def _flatten(prefix: str, value: Any) -> Iterator[Tuple[str, float]]:
+    """Numeric leaves of nested dicts as (name, value), e.g. caches_responses_hits."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from _flatten(f"{prefix}_{key}", item)
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        yield prefix, value
+
+
+def _format_labels(labels: Labels, extra: Labels = ()) -> str:
+    labels = labels + extra
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{value}"' for key, value in labels) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metrics:
+    """Registry of counters, histograms and gauges."""
+
+    def __init__(self, namespace: str = 'deutsche_gesetze'):
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+        self.histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self.gauges: Dict[str, float] = {}
+        self._gauge_callbacks: List[Tuple[str, Callable[[], Dict[str, Any]]]] = []
+
+    def inc(self, name: str, labels: Labels = (), value: float = 1):
+        with self._lock:
+            key = (name, labels)
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, labels: Labels = (), buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        with self._lock:
+            histogram = self.histograms.get((name, labels))
+            if histogram is None:
+                histogram = self.histograms[(name, labels)] = Histogram(buckets)
+            histogram.observe(value)
+
+    def set(self, name: str, value: float):
+        self.gauges[name] = value
+
+    def register_gauges(self, prefix: str, callback: Callable[[], Dict[str, Any]]):
+        """
+        Register a callback returning (nested) statistics. Its numeric
+        values are reported as gauges named `<prefix>_<key>_<subkey>`.
+        """
+        self._gauge_callbacks.append((prefix, callback))
+
+    def instrument(self, tool: str) -> Callable:
+        """
+        Decorator recording calls, errors, latency and response size of a
+        tool function (plain or async).
+        """
+        labels = (('tool', tool),)
+
+        def record(start: float, result: Any = None, failed: bool = False):
+            self.observe('tool_latency_seconds', time.perf_counter() - start, labels)
+            self.inc('tool_requests_total', labels)
+            if failed:
+                self.inc('tool_errors_total', labels)
+            elif isinstance(result, str):
+                self.observe('tool_response_bytes', len(result.encode('utf-8')), labels, SIZE_BUCKETS)
+
+        def decorator(fn: Callable) -> Callable:
+            if inspect.iscoroutinefunction(fn):
+                @functools.wraps(fn)
+                async def async_wrapper(*args, **kwargs):
+                    start = time.perf_counter()
+                    try:
+                        result = await fn(*args, **kwargs)
+                    except Exception:
+                        record(start, failed=True)
+                        raise
+                    record(start, result)
+                    return result
+                return async_wrapper
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    result = fn(*args, **kwargs)
+                except Exception:
+                    record(start, failed=True)
+                    raise
+                record(start, result)
+                return result
+            return wrapper
+        return decorator
+
+    def _gauge_values(self) -> Iterator[Tuple[str, float]]:
+        yield from self.gauges.items()
+        for prefix, callback in self._gauge_callbacks:
+            yield from _flatten(prefix, callback())
+
+    def render(self) -> str:
+        """Prometheus text exposition format."""
+        ns = self.namespace
+        lines = []
+        with self._lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(self.histograms.items(), key=lambda item: item[0])
+            histograms = [(key, histogram.cumulative(), histogram.count, histogram.sum) for key, histogram in histograms]
+
+        typed = set()
+        for (name, labels), value in counters:
+            if name not in typed:
+                lines.append(f"# TYPE {ns}_{name} counter")
+                typed.add(name)
+            lines.append(f"{ns}_{name}{_format_labels(labels)} {_format_value(value)}")
+        for (name, labels), buckets, count, total in histograms:
+            if name not in typed:
+                lines.append(f"# TYPE {ns}_{name} histogram")
+                typed.add(name)
+            for bound, cumulative in buckets:
+                lines.append(f"{ns}_{name}_bucket{_format_labels(labels, (('le', _format_value(bound)),))} {cumulative}")
+            lines.append(f"{ns}_{name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{ns}_{name}_count{_format_labels(labels)} {count}")
+        for name, value in self._gauge_values():
+            lines.append(f"# TYPE {ns}_{name} gauge")
+            lines.append(f"{ns}_{name} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Metrics as a JSON-serializable dict, with approximate latency quantiles per tool."""
+        with self._lock:
+            tools: Dict[str, Dict[str, Any]] = {}
+            for (name, labels), value in self.counters.items():
+                if labels and labels[0][0] == 'tool':
+                    tools.setdefault(labels[0][1], {})[name.replace('tool_', '').replace('_total', '')] = value
+            for (name, labels), histogram in self.histograms.items():
+                if labels and labels[0][0] == 'tool':
+                    key = name.replace('tool_', '')
+                    tools.setdefault(labels[0][1], {})[key] = {
+                        "count": histogram.count,
+                        "sum": round(histogram.sum, 6),
+                        "p50": histogram.quantile(0.5),
+                        "p99": histogram.quantile(0.99),
+                    }
+        return {"tools": tools, "gauges": dict(self._gauge_values())}
@@ -1,15 +1,184 @@
 import re
+import sys
 import json
+import codecs
+import hashlib
 import sqlite3
-from typing import List, Optional, Dict, Any, Union
-import urllib.request
+from typing import List, Optional, Dict, Any, BinaryIO, Callable, Union, Iterable, Iterator, Mapping, Tuple, NamedTuple
+import os
+import time
+import heapq
+import bisect
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext, ExitStack
+from itertools import islice
 from pathlib import Path
 
 from typing import List, Dict, Optional
-from rapidfuzz import process, fuzz
 from config import settings
+from cache import LRUCache, LazyLaws
+from fetch import HttpFetcher
+from matcher import LawMatcher
+from citations import Reference, extract_references, normalize_law_code, parse_citation
+import archive
+import index
+import lawxml
+from similarity import SimilarityIndex
+
+class Absatz(NamedTuple):
+    """
+    Character offsets of an Absatz within the text of its paragraph, with
+    the offsets of its Sätze and Nummern.
+    """
+    start: int
+    end: int
+    saetze: List[Tuple[int, int]]
+    nummern: Dict[str, Tuple[int, int]]
+
+class Section(NamedTuple):
+    """
+    A structural heading of a law (Buch, Abschnitt, Titel, ...) in the
+    outline. Sections are kept in document order; `depth` is the nesting
+    level (0 for top-level sections), and the section covers the paragraphs
+    at positions `start` to `end` (exclusive) in document order.
+    """
+    depth: int
+    title: str
+    start: int
+    end: int
+
+SECTION_ID_RE = re.compile(r'^\d+(\.\d+)*$')
+
+ABSATZ_RE = re.compile(r'^\((?P<number>\d+[a-z]*)\)')
+NUMMER_RE = re.compile(r'^\s*(?P<number>\d+[a-z]?)\.\s+')
+# A sentence ends with . ! or ? followed by whitespace and an uppercase
+# letter, a § sign or an opening quote/bracket
+SATZ_END_RE = re.compile(r'[.!?](?=\s+[„"(]?[A-ZÄÖÜ§])')
+# Words before a period that do not end a sentence
+ABBREVIATIONS = {
+    'abs', 'abschn', 'anl', 'art', 'bgbl', 'bzw', 'buchst', 'ca', 'dr', 'einschl',
+    'evtl', 'ff', 'gem', 'ggf', 'inkl', 'lit', 'nr', 'nrn', 'sog', 'usw', 'vgl',
+    'jan', 'feb', 'aug', 'sept', 'okt', 'nov', 'dez',
+}
+MONTHS = {
+    'januar', 'februar', 'märz', 'april', 'mai', 'juni', 'juli', 'august',
+    'september', 'oktober', 'november', 'dezember',
+}
+ROMAN_RE = re.compile(r'^[IVXLC]+$')
+
+def _split_saetze(text: str, start: int, end: int) -> List[Tuple[int, int]]:
+    """Split text[start:end] into sentences, returned as (start, end) offsets."""
+    saetze = []
+    pos = start
+    while pos < end and text[pos].isspace():
+        pos += 1
+    for m in SATZ_END_RE.finditer(text, start, end):
+        word_start = max(text.rfind(' ', start, m.start()), text.rfind('\n', start, m.start())) + 1
+        word = text[word_start:m.start()].lstrip('(„"')
+        # Single letters are initials or abbreviations, single digits may end a Satz ("nach Nr. 4.")
+        if word.lower() in ABBREVIATIONS or (len(word) == 1 and word.isalpha()) or ROMAN_RE.match(word):
+            continue
+        if word[:1].isdigit():
+            # Nummer marker at line start, or a date like "1. Januar"
+            line_start = text.rfind('\n', start, m.start()) + 1
+            next_word = text[m.end():end].split(None, 1)[0].lower()
+            if not text[line_start:word_start].strip() or next_word in MONTHS:
+                continue
+        saetze.append((pos, m.end()))
+        pos = m.end()
+        while pos < end and text[pos].isspace():
+            pos += 1
+    while pos < end and text[pos].isspace():
+        pos += 1
+    while end > pos and text[end - 1].isspace():
+        end -= 1
+    if pos < end:
+        saetze.append((pos, end))
+    return saetze
+
+def _nummern(text: str, lines: List[Tuple[str, int, int]], start: int, end: int) -> Dict[str, Tuple[int, int]]:
+    """Offsets of the Nummern whose marker lines lie within [start, end)."""
+    inside = [entry for entry in lines if start <= entry[2] < end]
+    nummern: Dict[str, Tuple[int, int]] = {}
+    for i, (number, content_start, _) in enumerate(inside):
+        nummer_end = inside[i + 1][2] - 1 if i + 1 < len(inside) else end
+        while nummer_end > content_start and text[nummer_end - 1].isspace():
+            nummer_end -= 1
+        nummern.setdefault(number, (content_start, nummer_end))
+    return nummern
+
+def build_structure(text: str) -> Dict[Optional[str], Absatz]:
+    """
+    Index the Absätze, Sätze and Nummern of a paragraph text.
+
+    Absätze are keyed by their number. A paragraph without Absatz markers
+    gets a single entry under None that spans the whole text.
+    """
+    markers = []        # (number, content start, line start)
+    nummer_lines = []
+    offset = 0
+    for line in text.split('\n'):
+        stripped = line.lstrip()
+        m = ABSATZ_RE.match(stripped)
+        if m:
+            markers.append((m.group('number'), offset + len(line) - len(stripped) + m.end(), offset))
+        else:
+            m = NUMMER_RE.match(line)
+            if m:
+                nummer_lines.append((m.group('number'), offset + m.end(), offset))
+        offset += len(line) + 1
+
+    if not markers:
+        return {None: Absatz(0, len(text), _split_saetze(text, 0, len(text)), _nummern(text, nummer_lines, 0, len(text)))}
+
+    structure: Dict[Optional[str], Absatz] = {}
+    for i, (number, start, _) in enumerate(markers):
+        end = markers[i + 1][2] - 1 if i + 1 < len(markers) else len(text)
+        if number not in structure:
+            structure[number] = Absatz(start, end, _split_saetze(text, start, end), _nummern(text, nummer_lines, start, end))
+    return structure
+
+def structure_size(structure: Dict[Optional[str], Absatz]) -> int:
+    """Rough estimate of the memory used by a paragraph index in bytes."""
+    # Absatz tuple, lists and dict entry, offset tuples per Satz and Nummer
+    return sum(250 + 120 * len(span.saetze) + 150 * len(span.nummern) for span in structure.values())
+
+def natural_key(paragraph_id: str) -> Tuple:
+    """Sort key for paragraph ids in natural order: 9 < 9a < 9b < 10."""
+    return tuple(
+        (0, int(part), '') if part.isdigit() else (1, 0, part.lower())
+        for part in re.findall(r'\d+|\D+', paragraph_id)
+    )
+
+def _title_matches(title: str, label: str, exact: bool = False) -> bool:
+    """
+    Whether a section title starts with a (lower case) label, at a word
+    boundary, e.g. "Abschnitt 3 - Kauf" for "abschnitt 3" and "kauf" but
+    not for "abschnitt 30".
+    """
+    title = title.lower()
+    names = [title] + title.split(' - ', 1)[1:]
+    if exact:
+        return label in names
+    return any(
+        name.startswith(label) and (len(name) == len(label) or not name[len(label)].isalnum())
+        for name in names
+    )
 
 class LawNode:
+    """
+    A paragraph of a law.
+
+    While parsing, content lines are collected in a list. Once the law is
+    complete, the text of all paragraphs is packed into one UTF-8 buffer per
+    law and a node only keeps its (start, end) byte offsets into that
+    buffer; the text is decoded from a memoryview slice on access. The
+    Absatz/Satz/Nummer index is built on first access and then kept, so
+    paragraphs that are never requested carry no index.
+    """
+    __slots__ = ('node_type', 'id', 'name', 'start', 'end', '_structure', '_buffer', '_lines')
+
     def __init__(
         self,
         node_type: str,
@@ -19,10 +188,52 @@ class LawNode:
         self.node_type = node_type        # 'root', 'paragraph'
         self.id = id                      # e.g. '1', '7'
         self.name = name                  # title/name after number
-        self.content_lines: List[str] = []
+        self.start = 0                    # byte offsets into the law text buffer
+        self.end = 0
+        self._structure: Optional[Dict[Optional[str], Absatz]] = None
+        self._buffer: Optional[memoryview] = None
+        self._lines: Optional[List[str]] = []
 
     def add_content_line(self, line: str):
-        self.content_lines.append(line)
+        self._lines.append(line)
+
+    @property
+    def text(self) -> str:
+        """The paragraph text."""
+        if self._lines is not None:
+            return "\n".join(self._lines)
+        return str(self._buffer[self.start:self.end], 'utf-8')
+
+    @property
+    def content_lines(self) -> List[str]:
+        if self._lines is not None:
+            return self._lines
+        text = self.text
+        return text.split('\n') if text else []
+
+    def slice(self, start: int, end: int) -> str:
+        """Text between two character offsets of the paragraph text."""
+        return self.text[start:end]
+
+    def pack(self, buffer: memoryview, start: int, end: int):
+        """Point this node at its text in the law buffer."""
+        self._buffer = buffer
+        self.start = start
+        self.end = end
+        self._lines = None
+        self._structure = None
+
+    @property
+    def structure(self) -> Dict[Optional[str], Absatz]:
+        """Absatz/Satz/Nummer offsets relative to the paragraph text."""
+        if self._structure is None:
+            self._structure = build_structure(self.text)
+        return self._structure
+
+    @property
+    def absaetze(self) -> List[str]:
+        """Numbers of the Absätze in this paragraph, in document order."""
+        return [number for number in self.structure if number is not None]
 
     def __repr__(self):
         return f"LawNode(type={self.node_type!r}, id={self.id!r}, name={self.name!r})"
@@ -32,7 +243,9 @@ class LawParser:
     Simplified parser for German law texts in Markdown.
     
     - Extracts front-matter fields 'Title' and 'jurabk' into root.full_title and root.short_title
-    - Focuses only on paragraph (§) parsing and absatz retrieval
+    - Focuses on paragraph (§) parsing and absatz retrieval
+    - Keeps the other headings (Buch, Abschnitt, Titel, ...) as an outline
+      of sections with the paragraphs they contain
     - Preserves paragraph names for better context
     - Maintains original text formatting including line breaks
     """
@@ -40,25 +253,34 @@ class LawParser:
     PARAGRAPH_RE = re.compile(r'^§\s*(?P<number>[0-9A-Za-z]+[a-z]?)\s*(?P<name>.*)$')
     FRONTMATTER_BOUNDARY = re.compile(r'^---')
     FRONT_KEYVAL = re.compile(r'^(?P<key>\w+):\s*(?P<value>.+)$')
-    ABSATZ_RE = re.compile(r'^$$(?P<number>\d+)$$')
+    ABSATZ_RE = ABSATZ_RE
 
-    def __init__(self, markdown: str):
-        # split lines
-        lines = markdown.splitlines()
+    def __init__(self, markdown: Union[str, Iterable[str]]):
+        """
+        Args:
+            markdown: The law as a string, or its lines (without line
+                breaks), e.g. from `read_lines`. Lines are consumed in one
+                pass; only the front matter is buffered.
+        """
+        lines = iter(markdown.splitlines() if isinstance(markdown, str) else markdown)
         fm_active = False
         fm_lines: List[str] = []
-        body_start = 0
-        
+        # Lines up to the end of the front matter. If it is never closed,
+        # the whole text is parsed as body.
+        head: List[str] = []
+        body: Iterable[str] = head
+
         # extract front-matter
-        for i, line in enumerate(lines):
+        for line in lines:
             if self.FRONTMATTER_BOUNDARY.match(line):
                 if not fm_active:
                     fm_active = True
                 else:
-                    body_start = i + 1
+                    body = lines
                     break
             elif fm_active:
                 fm_lines.append(line)
+            head.append(line)
                 
         # parse front-matter
         self.full_title = None
@@ -86,14 +308,221 @@ class LawParser:
         # setup root and paragraphs dict
         self.root = LawNode('root', None, None)
         self.paragraphs: Dict[str, LawNode] = {}
+        self.sections: List[Section] = []
         
         # parse body
-        self._parse('\n'.join(lines[body_start:]))
+        self._parse(body)
+
+    @classmethod
+    def from_paragraphs(
+        cls,
+        short_title: Optional[str],
+        full_title: Optional[str],
+        paragraphs: Iterable[Tuple[str, Optional[str], str]],
+        sections: Iterable[Tuple[int, str, int, int]] = ()
+    ) -> 'LawParser':
+        """
+        Rebuild a parser from already parsed paragraphs, e.g. rows restored
+        from the persistent index, without parsing the markdown again.
+
+        Args:
+            short_title: The law abbreviation (jurabk)
+            full_title: The full title of the law
+            paragraphs: (paragraph_id, name, text) tuples in document order
+            sections: The outline, (depth, title, start, end) tuples as in `sections`
+        """
+        parser = cls.__new__(cls)
+        parser.short_title = short_title
+        parser.full_title = full_title
+        parser.root = LawNode('root', None, None)
+        parser.paragraphs = {}
+        parser.sections = [Section(*section) for section in sections]
+        texts = []
+        for p_id, name, text in paragraphs:
+            parser.paragraphs[p_id] = LawNode('paragraph', p_id, name or None)
+            texts.append(text or '')
+        parser._pack(texts)
+        return parser
+
+    def _pack(self, texts: List[str]):
+        """
+        Store the texts of all paragraphs (in order of self.paragraphs) in
+        one UTF-8 buffer.
+        """
+        encoded = [text.encode('utf-8') for text in texts]
+        self.buffer = b"\n".join(encoded)
+        # Estimated size of the Absatz/Satz/Nummer indexes built so far
+        self.structure_bytes = 0
+        view = memoryview(self.buffer)
+        offset = 0
+        for node, data in zip(self.paragraphs.values(), encoded):
+            node.pack(view, offset, offset + len(data))
+            offset += len(data) + 1
 
-    def _parse(self, text: str):
+    @property
+    def paragraph_order(self) -> List[str]:
+        """Paragraph ids in natural sort order (built on first use)."""
+        order = self.__dict__.get('_paragraph_order')
+        if order is None or len(order) != len(self.paragraphs):
+            order = sorted(self.paragraphs, key=natural_key)
+            self._paragraph_order = order
+            self._paragraph_keys = [natural_key(p_id) for p_id in order]
+        return order
+
+    def paragraph_range(self, start: str, end: str) -> List[str]:
+        """
+        Ids of all paragraphs from `start` to `end` (inclusive) in natural
+        order, e.g. 433-453. The bounds do not need to exist themselves.
+        """
+        order = self.paragraph_order
+        lo = bisect.bisect_left(self._paragraph_keys, natural_key(start))
+        hi = bisect.bisect_right(self._paragraph_keys, natural_key(end))
+        return order[lo:hi]
+
+    def references(self) -> Iterator[Tuple[str, Reference]]:
+        """
+        References to other paragraphs found in the text of this law, as
+        (citing paragraph id, reference) pairs.
+        """
+        for p_id, node in self.paragraphs.items():
+            for reference in extract_references(node.text):
+                yield p_id, reference
+
+    @property
+    def outline(self) -> Tuple[List[str], Dict[Optional[int], List[int]]]:
+        """
+        Ids of the sections ("2.8.1": first subsection of the eighth
+        subsection of the second top-level section) and the positions of
+        the subsections of each section (None: top level), built on first use.
+        """
+        outline = self.__dict__.get('_outline')
+        if outline is None:
+            ids: List[str] = []
+            children: Dict[Optional[int], List[int]] = {None: []}
+            open_sections: List[int] = []
+            for i, section in enumerate(self.sections):
+                del open_sections[section.depth:]
+                parent = open_sections[-1] if open_sections else None
+                children[parent].append(i)
+                children[i] = []
+                number = str(len(children[parent]))
+                ids.append(number if parent is None else f"{ids[parent]}.{number}")
+                open_sections.append(i)
+            outline = self._outline = (ids, children)
+        return outline
+
+    def section_paragraphs(self, position: int) -> List[str]:
+        """Ids of the paragraphs of a section (including its subsections) in document order."""
+        section = self.sections[position]
+        return list(islice(self.paragraphs, section.start, section.end))
+
+    def find_section(self, reference: str) -> int:
+        """
+        Position of a section in `sections`, given its id ("2.8") or its
+        title. Titles match by prefix ("Abschnitt 3", or "Kauf" for
+        "Titel 1 - Kauf, Tausch"), and "Buch 2 > Abschnitt 8" narrows a
+        title down to the subsections of a section.
+
+        Raises:
+            KeyError: if no section or several sections match
+        """
+        ids, children = self.outline
+        reference = reference.strip()
+        if SECTION_ID_RE.match(reference):
+            if reference in ids:
+                return ids.index(reference)
+            raise KeyError(f"Section {reference} not found in {self.short_title}")
+
+        candidates = range(len(self.sections))
+        labels = [label for label in re.split(r'\s*>\s*', reference.lower()) if label]
+        if not labels:
+            raise KeyError(f"Section '{reference}' not found in {self.short_title}. "
+                           "Use get_table_of_contents to list the sections.")
+        for n, label in enumerate(labels):
+            matches = [i for i in candidates if _title_matches(self.sections[i].title, label)]
+            if n < len(labels) - 1:
+                candidates = [j for i in matches for j in self._descendants(i)]
+        if len(matches) > 1:
+            exact = [i for i in matches if _title_matches(self.sections[i].title, label, exact=True)]
+            matches = exact if len(exact) == 1 else matches
+        if not matches:
+            raise KeyError(f"Section '{reference}' not found in {self.short_title}. "
+                           "Use get_table_of_contents to list the sections.")
+        if len(matches) > 1:
+            listed = '; '.join(f"{ids[i]} {self.sections[i].title}" for i in matches[:10])
+            raise KeyError(f"Section '{reference}' is ambiguous in {self.short_title}, "
+                           f"use its id or a path like 'Buch 2 > Abschnitt 1'. Matches: {listed}")
+        return matches[0]
+
+    def _descendants(self, position: int) -> range:
+        depth = self.sections[position].depth
+        end = position + 1
+        while end < len(self.sections) and self.sections[end].depth > depth:
+            end += 1
+        return range(position + 1, end)
+
+    def toc(self, section: Optional[str] = None, depth: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Table of contents: the sections (or the subsections of `section`)
+        as nested dicts with their id, title, paragraph span and number of
+        paragraphs. Below `depth` levels, only the number of subsections
+        is given.
+        """
+        ids, children = self.outline
+        order = list(self.paragraphs)
+
+        def node(i: int, level: int) -> Dict[str, Any]:
+            entry = self.sections[i]
+            item: Dict[str, Any] = {"id": ids[i], "title": entry.title}
+            count = entry.end - entry.start
+            if count:
+                first, last = order[entry.start], order[entry.end - 1]
+                item["paragraphs"] = f"§ {first}" if first == last else f"§ {first} - § {last}"
+            item["count"] = count
+            if children[i]:
+                if depth is None or level < depth:
+                    item["sections"] = [node(j, level + 1) for j in children[i]]
+                else:
+                    item["subsections"] = len(children[i])
+            return item
+
+        parent = None if section is None else self.find_section(section)
+        return [node(i, 1) for i in children[parent]]
+
+    def memory_size(self) -> int:
+        """Rough estimate of the memory used by this parsed law in bytes."""
+        # text buffer plus node and dict overhead per paragraph and section,
+        # plus the paragraph indexes built on access
+        return (sys.getsizeof(self.buffer) + 200 * len(self.paragraphs) + 150 * len(self.sections)
+                + self.structure_bytes)
+
+    def __reduce__(self):
+        # Compact pickled form, used to send parsed laws back from worker processes
+        paragraphs = [
+            (p_id, node.name, node.text)
+            for p_id, node in self.paragraphs.items()
+        ]
+        return (LawParser.from_paragraphs, (self.short_title, self.full_title, paragraphs, self.sections))
+
+    def _parse(self, lines: Iterable[str]):
         current_para: Optional[LawNode] = None
+        # (heading level, position in self.sections) of the sections still open
+        open_sections: List[Tuple[int, int]] = []
+
+        def close_sections(level: int):
+            while open_sections and open_sections[-1][0] >= level:
+                _, i = open_sections.pop()
+                self.sections[i] = self.sections[i]._replace(end=len(self.paragraphs))
+        # An empty line is only added once the next line is seen, so a final
+        # empty line of the body is dropped (like splitting the joined body)
+        held_empty = False
         
-        for line in text.splitlines():
+        for line in lines:
+            if held_empty and current_para:
+                current_para.add_content_line("")
+            held_empty = not line
+            if held_empty:
+                continue
             line = line.rstrip()
             if not line:
                 # Preserve empty lines
@@ -108,6 +537,8 @@ class LawParser:
                 # Check if it's a paragraph
                 m_para = self.PARAGRAPH_RE.match(headline)
                 if m_para:
+                    # A paragraph ends the unnumbered headings of its level, e.g. "Eingangsformel"
+                    close_sections(len(m_head.group(1)))
                     num = m_para.group('number')
                     nam = m_para.group('name').strip() or None
                     node = LawNode('paragraph', num, nam)
@@ -115,21 +546,40 @@ class LawParser:
                     current_para = node
                     continue
                     
-                # Skip other headings - we only care about paragraphs
+                # Other headings structure the law. Level 1 is the title of
+                # the document, deeper levels open a section of the outline.
                 current_para = None
+                level = len(m_head.group(1))
+                if level > 1:
+                    close_sections(level)
+                    open_sections.append((level, len(self.sections)))
+                    position = len(self.paragraphs)
+                    self.sections.append(Section(len(open_sections) - 1, headline.strip(), position, position))
                 continue
                 
             # Add content to current paragraph if we have one
             if current_para:
                 current_para.add_content_line(line)
 
-    def get_paragraph(self, paragraph_id: str, absatz_id: Optional[str] = None) -> Dict[str, Any]:
+        close_sections(0)
+        self._pack([node.text for node in self.paragraphs.values()])
+
+    def get_paragraph(
+        self,
+        paragraph_id: str,
+        absatz_id: Optional[str] = None,
+        satz_id: Optional[Union[str, int]] = None,
+        nummer_id: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
-        Retrieve paragraph content, optionally filtered to a specific absatz.
+        Retrieve paragraph content, optionally filtered to a specific absatz,
+        satz and/or nummer (e.g. § 823 Abs. 1 S. 2).
         
         Args:
             paragraph_id: The paragraph number as string
             absatz_id: Optional absatz number as string
+            satz_id: Optional satz (sentence) number, counted from 1
+            nummer_id: Optional nummer as string
             
         Returns:
             Dict containing paragraph info and content
@@ -142,56 +592,211 @@ class LawParser:
             "paragraph": paragraph_id,
             "name": node.name,
         }
-        
-        # If no absatz specified, return the whole paragraph
-        if not absatz_id:
-            result["text"] = "\n".join(node.content_lines)
+        # An empty Satz means none; Satz 0 is rejected below like any Satz out of range
+        if satz_id == '':
+            satz_id = None
+        # If nothing more specific is requested, return the whole paragraph
+        if not absatz_id and satz_id is None and not nummer_id:
+            result["text"] = node.text
             return result
         
-        # Extract the specific absatz
-        result["absatz"] = absatz_id
-        lines = node.content_lines
-        found = False
-        absatz_lines = []
-        
-        i = 0
-        while i < len(lines):
-            line = lines[i]
-            # Check if this line starts with the target absatz
-            if line.strip().startswith(f"({absatz_id})"):
-                found = True
-                # Extract text after the absatz marker
-                marker_end = line.find(f"({absatz_id})") + len(f"({absatz_id})")
-                first_line = line[marker_end:]
-                absatz_lines.append(first_line)
-                
-                # Continue to collect lines until next absatz or end
-                j = i + 1
-                while j < len(lines):
-                    next_line = lines[j]
-                    # Check if we've reached the next absatz
-                    if self.ABSATZ_RE.match(next_line.strip()):
-                        break
-                    absatz_lines.append(next_line)
-                    j += 1
-                break
-            i += 1
-        
-        if not found:
-            # Show what absatz markers are actually in the text
-            detected_absatze = []
-            for line in lines:
-                m = self.ABSATZ_RE.match(line.strip())
-                if m:
-                    detected_absatze.append(m.group('number'))
+        if node._structure is None:
+            self.structure_bytes += structure_size(node.structure)
+        location = f"§ {paragraph_id}"
+        if absatz_id:
+            result["absatz"] = absatz_id
+            span = node.structure.get(absatz_id)
+            if span is None:
+                available = ", ".join(node.absaetze) or "none"
+                raise KeyError(f"Absatz {absatz_id} not found in § {paragraph_id}. Available: {available}")
+            location += f" Abs. {absatz_id}"
+        else:
+            span = node.structure.get(None)
+            if span is None:
+                raise KeyError(f"§ {paragraph_id} has several Absätze, please specify one. "
+                               f"Available: {', '.join(node.absaetze)}")
+        start, end = span.start, span.end
+
+        if satz_id is not None:
+            result["satz"] = str(satz_id)
+            number = int(satz_id) if str(satz_id).isdigit() else 0
+            if not 1 <= number <= len(span.saetze):
+                raise KeyError(f"Satz {satz_id} not found in {location}. Available: 1-{len(span.saetze)}")
+            start, end = span.saetze[number - 1]
             
-            available = ", ".join(sorted(detected_absatze)) if detected_absatze else "none"
-            raise KeyError(f"Absatz {absatz_id} not found in § {paragraph_id}. Available: {available}")
+        if nummer_id:
+            result["nummer"] = nummer_id
+            nummer = span.nummern.get(nummer_id)
+            if nummer is None or not (start <= nummer[0] and nummer[1] <= end):
+                available = ", ".join(span.nummern) or "none"
+                raise KeyError(f"Nummer {nummer_id} not found in {location}. Available: {available}")
+            start, end = nummer
             
         # Preserve the original formatting with newlines
-        result["text"] = "\n".join(absatz_lines)
+        result["text"] = node.slice(start, end)
         return result
 
+def read_lines(stream: BinaryIO, hasher: Optional[Any] = None, chunk_size: int = 1 << 16) -> Iterator[str]:
+    """
+    Decoded lines of a UTF-8 stream, split exactly like `str.splitlines`
+    of the whole text, read in chunks. If given, `hasher` (e.g.
+    `hashlib.sha1()`) is updated with the raw bytes.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    rest = ''
+    for chunk in iter(lambda: stream.read(chunk_size), b''):
+        if hasher is not None:
+            hasher.update(chunk)
+        text = rest + decoder.decode(chunk)
+        # Lines up to the last \n are complete (\r\n is never cut in half)
+        cut = text.rfind('\n') + 1
+        rest = text[cut:]
+        yield from text[:cut].splitlines()
+    rest += decoder.decode(b'', final=True)
+    yield from rest.splitlines()
+
+def parse_law_stream(
+    open_stream: Callable[[], BinaryIO],
+    known_digest: Optional[str] = None,
+    lines: Callable[[BinaryIO, Any], Iterable[str]] = read_lines
+) -> Tuple[str, Optional[LawParser]]:
+    """
+    Parse a law from a binary stream in one pass, hashing it on the way.
+
+    Args:
+        open_stream: Opens the stream, called twice if `known_digest` is given
+        known_digest: Digest stored in the index. If given, the stream is
+            hashed first and not parsed if its content is unchanged.
+        lines: Reads the Markdown lines from the stream, updating the hash
+            (`read_lines`, or `lawxml.markdown_lines` for XML)
+
+    Returns:
+        The content digest and the parsed law, or None instead of the law
+        if the digest equals `known_digest`.
+    """
+    if known_digest is not None:
+        with open_stream() as stream:
+            digest = index.digest_stream(stream)
+        if digest == known_digest:
+            return digest, None
+    hasher = hashlib.sha1()
+    with open_stream() as stream:
+        parser = LawParser(lines(stream, hasher))
+    return hasher.hexdigest(), parser
+
+def _parse_law_file(task: Tuple[str, Optional[str]]) -> Tuple[Tuple[int, int, str], Optional[LawParser], float]:
+    """
+    Read and parse one law file. Runs in worker processes during parallel
+    loading.
+
+    Args:
+        task: (path, digest stored in the index or None)
+
+    Returns:
+        The file fingerprint, the parsed law (or None if the content hash
+        equals the stored digest) and the seconds spent reading and parsing.
+    """
+    start = time.perf_counter()
+    source, known_digest = task
+    path = Path(source)
+    mtime_ns, size = index.stat_fingerprint(path)
+    digest, parser = parse_law_stream(lambda: path.open('rb'), known_digest)
+    return (mtime_ns, size, digest), parser, time.perf_counter() - start
+
+class _ReadWriteLock:
+    """
+    Lock held by any number of readers at once or by one writer. Waiting
+    writers hold back new readers, so a steady stream of readers does not
+    starve them. Readers may nest; the writer may nest and also read.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writer: Optional[int] = None
+        self._waiting_writers = 0
+        self._local = threading.local()
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        held = getattr(self._local, 'held', 0)
+        nested = held or self._writer == threading.get_ident()
+        if not nested:
+            with self._cond:
+                while self._writer is not None or self._waiting_writers:
+                    self._cond.wait()
+                self._readers += 1
+        self._local.held = held + 1
+        try:
+            yield
+        finally:
+            self._local.held = held
+            if not nested:
+                with self._cond:
+                    self._readers -= 1
+                    if not self._readers:
+                        self._cond.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        if self._writer == threading.get_ident():
+            yield
+            return
+        with self._cond:
+            self._waiting_writers += 1
+            while self._writer is not None or self._readers:
+                self._cond.wait()
+            self._waiting_writers -= 1
+            self._writer = threading.get_ident()
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = None
+                self._cond.notify_all()
+
+class _IngestBatch:
+    """Rows collected during `LawLibrary.bulk_ingest` and not yet written."""
+
+    def __init__(self, next_id: int, batch_size: int):
+        self.next_id = next_id
+        self.batch_size = batch_size
+        self.rows: List[tuple] = []
+        self.refs: List[tuple] = []
+        self.sources: Dict[str, tuple] = {}
+        self.total_rows = 0
+
+    def add(self, source_row: tuple, rows: List[tuple], refs: List[tuple]):
+        self.sources[source_row[0]] = source_row
+        self.rows.extend(rows)
+        self.refs.extend(refs)
+        self.next_id += len(rows)
+
+GITHUB_BASE_URL = "https://raw.githubusercontent.com/bundestag/gesetze/refs/heads/master"
+
+class CatalogEntry(NamedTuple):
+    """Lightweight description of a loaded law and where its paragraphs are stored."""
+    code: str
+    short_title: str
+    full_title: Optional[str]
+    source: str
+    first_id: Optional[int]
+    last_id: Optional[int]
+
+    @property
+    def paragraph_count(self) -> int:
+        return 0 if self.first_id is None else self.last_id - self.first_id + 1
+
+class SearchTimeout(Exception):
+    """A search used up its time budget. `results` holds the matches found until then."""
+
+    def __init__(self, seconds: float, results: List[Dict[str, Any]]):
+        super().__init__(
+            f"The search was stopped after {seconds:g} s. Use fewer wildcard (*) or OR terms, "
+            f"or restrict it to some laws."
+        )
+        self.results = results
+
 class LawLibrary:
     """
     Manages multiple German law texts.
@@ -202,63 +807,765 @@ class LawLibrary:
     - Retrieving paragraphs/absätze from specific laws in JSON format
     """
     
-    def __init__(self):
-        self.laws: Dict[str, LawParser] = {}
-        # Initialize in-memory SQLite for FTS
-        self.conn = sqlite3.connect(':memory:', check_same_thread=False)
-        self.conn.execute("""
-            CREATE VIRTUAL TABLE laws_fts USING fts5(
-                law_code UNINDEXED, 
-                paragraph_id UNINDEXED, 
-                paragraph_name, 
-                content
+    def __init__(
+        self,
+        index_path: Optional[Union[str, Path]] = None,
+        lazy: bool = False,
+        cache_size: Optional[int] = 256,
+        cache_memory_mb: Optional[float] = 256,
+        fetcher: Optional[HttpFetcher] = None,
+        response_cache_size: int = 1024,
+        compact_json: bool = False,
+        search_mode: str = 'unicode61',
+        read_only: bool = False,
+        readers: int = 0,
+        immutable: bool = False,
+        record_timings: bool = False
+    ):
+        """
+        Args:
+            index_path: Optional path to a persistent SQLite index file. If
+                given, parsed laws are stored there and only changed source
+                files are parsed again on the next start. Defaults to an
+                in-memory database.
+            lazy: Keep only the catalog of laws in memory and build a law
+                from the index the first time it is requested. Parsed laws
+                are kept in an LRU cache. Requires `index_path`.
+            cache_size: Maximum number of parsed laws kept in lazy mode
+            cache_memory_mb: Approximate memory budget of the parsed laws
+                kept in lazy mode
+            fetcher: HTTP client used to load laws from URLs. Defaults to
+                an `HttpFetcher` without disk cache.
+            response_cache_size: Number of serialized JSON responses kept
+                by the *_json methods
+            compact_json: Serialize JSON responses without indentation
+            search_mode: Tokenization of the fulltext index, 'unicode61'
+                (whole words), 'german' (diacritics folded, stemmed prefix
+                queries) or 'trigram' (substrings)
+            read_only: Serve an index file built beforehand (see
+                `build_index.py`) without writing to it. Laws are restored
+                with `load_index`; loading or reloading sources raises a
+                RuntimeError. Several processes can share one index file
+                this way. The search mode is the one the index was built with.
+            readers: Number of read-only connections used for queries in
+                read-only mode, so concurrent requests are not serialized
+                on one connection (at least 1). A writable library runs
+                queries on its main connection, one at a time.
+            immutable: Open the index in read-only mode without any file
+                locking. Only safe if no process writes to the index file
+                while it is served.
+            record_timings: Record the parse and index time of every parsed
+                law, see `timing_report`
+        """
+        self.catalog: Dict[str, CatalogEntry] = {}
+        self.matcher = LawMatcher()
+        self.lazy = lazy
+        if lazy:
+            # In memory, the index would hold the text of all laws anyway
+            if not index_path:
+                raise ValueError("lazy requires an index_path")
+            max_bytes = int(cache_memory_mb * 1024 * 1024) if cache_memory_mb else None
+            self.laws: Mapping[str, LawParser] = LazyLaws(
+                self.catalog,
+                lambda code: self._read_law(self.catalog[code]),
+                LawParser.memory_size,
+                LRUCache(max_items=cache_size, max_bytes=max_bytes)
             )
-        """)
+        else:
+            self.laws = {}
+        self.index_path = Path(index_path) if index_path else None
+        self.fetcher = fetcher or HttpFetcher()
+        self.response_cache = LRUCache(max_items=response_cache_size)
+        self.compact_json = compact_json
+        self.generation = 0
+        # Codes and (title, code) pairs in sort order, rebuilt after the catalog changed
+        self._catalog_order: Optional[Tuple[List[str], List[Tuple[str, str]]]] = None
+        # Written while a reload is applied, read while tool responses are computed
+        self._lock = _ReadWriteLock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
+        self.reload_stats: Dict[str, Any] = {"reloads": 0, "changed": 0, "removed": 0, "errors": 0}
+        self.read_only = read_only
+        self._readers: Optional[index.ReaderPool] = None
+        # Queries on the main connection run one at a time: its progress
+        # handler (see `index.time_budget`) is shared by all of them
+        self._conn_lock = threading.RLock()
+        if read_only:
+            if self.index_path is None:
+                raise ValueError("read_only requires an index_path")
+            self.conn = index.connect_readonly(self.index_path, immutable)
+            self.search_mode = index.get_meta(self.conn, 'search_mode') or 'unicode61'
+            self._readers = index.ReaderPool(self.index_path, max(1, readers), immutable)
+        else:
+            self.search_mode = search_mode
+            self.conn = index.connect(self.index_path, search_mode)
+        self._batch: Optional[_IngestBatch] = None
+        self.ingest_stats: Dict[str, Any] = {}
+        # Accumulated time per loading phase (discover, parse, restore, ...)
+        self.phase_seconds: Dict[str, float] = {}
+        self.search_errors = 0
+        self.search_timeouts = 0
+        # Per-law parse timings, only collected with record_timings
+        self.law_timings: Optional[List[Dict[str, Any]]] = [] if record_timings else None
+        self.similarity: Optional[SimilarityIndex] = None
+        if not read_only:
+            self._check_index_settings()
 
-    def load_laws_from_folder(self, folder_path: Path):
-        laws = list(Path(folder_path).glob('**/index.md'))
-        for law in laws:
-            loaded = self.load_law_from_file(law)
+    def _check_index_settings(self):
+        # Laws below the paragraph threshold are stored as skipped, so a
+        # changed threshold invalidates the whole index.
+        min_paragraphs = str(settings.min_paragraphs)
+        if index.get_meta(self.conn, 'min_paragraphs') != min_paragraphs:
+            index.clear(self.conn)
+            index.set_meta(self.conn, 'min_paragraphs', min_paragraphs)
+            self.conn.commit()
 
-            if loaded:
-                print(f'{loaded} - {len(self.laws[loaded.lower()].paragraphs)}')
-            
+    def _check_writable(self):
+        if self.read_only:
+            raise RuntimeError("The law index is opened read-only, rebuild it with build_index.py")
+
+    def connections(self) -> List[sqlite3.Connection]:
+        """All database connections of the library: the main one and the readers."""
+        return [self.conn] + (self._readers.connections if self._readers else [])
+
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        """Connection for a read query: one of the reader pool if there is one, else the main connection."""
+        if self._readers is None:
+            with self._conn_lock:
+                yield self.conn
+        else:
+            with self._readers.connection() as conn:
+                yield conn
+
+    def load_index(self):
+        """
+        Restore all laws stored in the index, without looking at their
+        sources. Used to serve an index built beforehand, e.g. in read-only
+        mode.
+        """
+        with self._timed('restore'):
+            for row in self.conn.execute("SELECT * FROM sources ORDER BY rowid").fetchall():
+                self._restore_law(row)
+
+    def load_laws_from_folder(self, folder_path: Path, workers: int = 1):
+        """
+        Load all `index.md` files below a folder.
+
+        Args:
+            folder_path: Folder to scan recursively
+            workers: Number of processes used to parse changed files. 1
+                parses in this process, 0 uses one process per CPU.
+        """
+        folder = Path(folder_path).resolve()
+        with self._timed('discover'):
+            laws = list(folder.glob('**/index.md'))
+        with self.bulk_ingest():
+            for loaded in self._load_files(laws, workers):
+                if loaded:
+                    print(f'{loaded} - {self.catalog[loaded.lower()].paragraph_count}')
+
+        # Drop laws whose files were removed since the index was built
+        self._remove_stale_sources(f'{folder}/', {str(law) for law in laws})
+        self._remove_foreign_sources()
+        self.conn.commit()
+
+    def load_laws_from_archive(self, archive_path: Path):
+        """
+        Load all `index.md` files in a zip or tar archive without extracting
+        it. Members are read and parsed one at a time; members with the same
+        size and modification time as when they were indexed are restored
+        from the index. Sources are named `<archive>!<member>`.
+
+        Args:
+            archive_path: Path to a .zip, .tar, .tar.gz, .tar.bz2 or .tar.xz file
+        """
+        archive_path = Path(archive_path).resolve()
+        prefix = f'{archive_path}!'
+        members = ((prefix + member.name, member) for member in archive.iter_members(archive_path))
+        self._load_members(prefix, members)
+
+    def load_laws_from_xml(self, path: Path):
+        """
+        Load laws from the XML of gesetze-im-internet.de (see `lawxml`)
+        without converting them to Markdown files: a law's `xml.zip`, a zip
+        with the XML of several laws, or a folder with such zips and XML
+        files (e.g. the `laws` folder of `lawde.py loadall`). Files are read
+        and parsed one at a time, laws are the same as when loading the
+        Markdown converted by `lawdown.py`. Unchanged files are restored
+        from the index. Sources in zips are named `<zip>!<member>`.
+
+        Args:
+            path: Path to a zip file, an XML file or a folder
+        """
+        path = Path(path).resolve()
+        if path.is_dir():
+            prefix = f'{path}{os.sep}'
+            files = sorted(p for p in path.rglob('*') if p.suffix.lower() in ('.zip', '.xml') and p.is_file())
+        else:
+            prefix = f'{path}!' if archive.is_archive(path) else str(path)
+            files = [path]
 
-    def _load_law_from_markdown(self, md_text: str) -> str:
-        parser = LawParser(md_text)
+        def members():
+            for file in files:
+                if file.suffix.lower() == '.xml':
+                    mtime_ns, size = index.stat_fingerprint(file)
+                    yield str(file), archive.ArchiveMember(str(file), mtime_ns, size, lambda file=file: file.open('rb'))
+                else:
+                    for member in archive.iter_members(file, '*.xml'):
+                        yield f'{file}!{member.name}', member
+
+        self._load_members(prefix, members(), lawxml.markdown_lines)
+
+    def _load_members(
+        self,
+        prefix: str,
+        members: Iterable[Tuple[str, archive.ArchiveMember]],
+        lines: Callable[[BinaryIO, Any], Iterable[str]] = read_lines
+    ):
+        """
+        Load (source, member) pairs one at a time in one bulk ingest, then
+        drop the sources starting with `prefix` that were not seen.
+        """
+        current = set()
+        with self.bulk_ingest():
+            for source, member in members:
+                current.add(source)
+                row = self.conn.execute("SELECT * FROM sources WHERE source = ?", (source,)).fetchone()
+                if row and (row['mtime_ns'], row['size']) == (member.mtime_ns, member.size):
+                    with self._timed('restore'):
+                        loaded = self._restore_law(row)
+                else:
+                    start = time.perf_counter()
+                    with self._timed('parse'):
+                        digest, parser = parse_law_stream(member.open, row['digest'] if row else None, lines)
+                    parsed = time.perf_counter()
+                    loaded = self._apply_parsed(source, row, (member.mtime_ns, member.size, digest), parser)
+                    if self.law_timings is not None and parser is not None:
+                        self._record_timing(source, loaded, member.size, parsed - start, time.perf_counter() - parsed)
+                if loaded:
+                    print(f'{loaded} - {self.catalog[loaded.lower()].paragraph_count}')
+
+        self._remove_stale_sources(prefix, current)
+        self._remove_foreign_sources()
+        self.conn.commit()
+
+    def _remove_stale_sources(self, prefix: str, current: set):
+        """Remove the sources starting with `prefix` that are not in `current`."""
+        stale = [
+            row['source'] for row in self.conn.execute(
+                "SELECT source FROM sources WHERE substr(source, 1, ?) = ?", (len(prefix), prefix)
+            )
+            if row['source'] not in current
+        ]
+        for source in stale:
+            self._remove_source(source)
+
+    def _remove_foreign_sources(self):
+        """
+        Drop the indexed laws that are not in the catalog, e.g. of another
+        folder loaded into the same index before, so searches only find
+        laws of this library.
+        """
+        foreign = [
+            row['source'] for row in self.conn.execute(
+                "SELECT source, law_code FROM sources WHERE law_code IS NOT NULL"
+            ).fetchall()
+            if row['law_code'] not in self.catalog
+        ]
+        for source in foreign:
+            self._drop_source(source)
+
+    def reload_folder(self, folder_path: Path, workers: int = 1) -> Dict[str, Any]:
+        """
+        Pick up changes to a folder loaded with `load_laws_from_folder`:
+        new and changed `index.md` files are parsed, removed ones dropped.
+
+        Files are parsed without blocking queries. The changes are then
+        written in one transaction and the new laws swapped in while holding
+        the write side of the library lock, so tool responses computed
+        concurrently see either the old or the new laws, never a mix.
+
+        Args:
+            folder_path: Folder to scan recursively
+            workers: Number of processes used to parse changed files
+
+        Returns:
+            Statistics of this reload (also accumulated in `reload_stats`)
+        """
+        self._check_writable()
+        start = time.perf_counter()
+        folder = Path(folder_path).resolve()
+        prefix = f'{folder}/'
+        # Queries on the main connection run one at a time, see _conn_lock
+        with self._conn_lock:
+            known = {
+                row['source']: row for row in self.conn.execute(
+                    "SELECT * FROM sources WHERE substr(source, 1, ?) = ?", (len(prefix), prefix)
+                )
+            }
+        tasks = []
+        current = set()
+        for path in folder.glob('**/index.md'):
+            source = str(path)
+            try:
+                fingerprint = index.stat_fingerprint(path)
+            except OSError:
+                continue
+            current.add(source)
+            row = known.get(source)
+            if row is None or (row['mtime_ns'], row['size']) != fingerprint:
+                tasks.append((source, row['digest'] if row else None))
+        removed = [source for source in known if source not in current]
+
+        stats = {"changed": 0, "removed": len(removed), "errors": 0}
+        if tasks or removed:
+            results = self._parse_files(tasks, workers)
+            with self._lock.write(), self._conn_lock, self.bulk_ingest(optimize=False):
+                for (source, _), result in zip(tasks, results):
+                    try:
+                        if isinstance(result, Exception):
+                            raise result
+                        fingerprint, parser, _ = result
+                        if parser is None:
+                            # Touched but same content
+                            self.conn.execute(
+                                "UPDATE sources SET mtime_ns = ?, size = ? WHERE source = ?",
+                                (fingerprint[0], fingerprint[1], source)
+                            )
+                            continue
+                        self._add_law(parser, source, fingerprint)
+                        stats["changed"] += 1
+                    except Exception as e:
+                        print(f"Failed to reload {source}: {e}")
+                        stats["errors"] += 1
+                        self.reload_stats["last_error"] = f"{source}: {e}"
+                for source in removed:
+                    self._remove_source(source)
+
+        stats["seconds"] = round(time.perf_counter() - start, 3)
+        self.reload_stats["reloads"] += 1
+        for key in ("changed", "removed", "errors"):
+            self.reload_stats[key] += stats[key]
+        self.reload_stats["last_reload"] = time.strftime('%Y-%m-%dT%H:%M:%S')
+        self.reload_stats["last_seconds"] = stats["seconds"]
+        if stats["changed"] or stats["removed"]:
+            print(f'Reloaded {stats["changed"]} changed and {stats["removed"]} removed laws in {stats["seconds"]}s')
+            if self.similarity is not None:
+                self.build_similarity_index()
+        return stats
+
+    @staticmethod
+    def _parse_files(tasks: List[Tuple[str, Optional[str]]], workers: int = 1) -> List[Any]:
+        """Parse law files, returning the result or the exception per task."""
+        def parse(task):
+            try:
+                return _parse_law_file(task)
+            except Exception as e:
+                return e
+
+        workers = workers or os.cpu_count() or 1
+        if workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_parse_law_file, task) for task in tasks]
+                return [future.exception() or future.result() for future in futures]
+        return [parse(task) for task in tasks]
+
+    def watch_folder(self, folder_path: Path, interval: float = 30, workers: int = 1) -> threading.Thread:
+        """
+        Poll a folder every `interval` seconds in a background thread and
+        reload changed laws (see `reload_folder`). Stop with `stop_watching`.
+        """
+        def run():
+            while not self._stop_watching.wait(interval):
+                try:
+                    self.reload_folder(folder_path, workers)
+                except Exception as e:
+                    print(f"Reload failed: {e}")
+                    self.reload_stats["errors"] += 1
+                    self.reload_stats["last_error"] = str(e)
+
+        self.stop_watching()
+        self._stop_watching.clear()
+        self._watcher = threading.Thread(target=run, name='law-reload', daemon=True)
+        self._watcher.start()
+        return self._watcher
+
+    def stop_watching(self):
+        """Stop the background thread started by `watch_folder`."""
+        if self._watcher is not None:
+            self._stop_watching.set()
+            self._watcher.join()
+            self._watcher = None
+
+    def _remove_source(self, source: str):
+        """Drop a source and forget its law, unless another source provides the same law."""
+        row = self.conn.execute("SELECT law_code FROM sources WHERE source = ?", (source,)).fetchone()
+        self._drop_source(source)
+        code = row and row['law_code']
+        entry = self.catalog.get(code) if code else None
+        if entry is None or entry.source != source:
+            return
+        del self.catalog[code]
+        self.matcher.remove(code)
+        if self.lazy:
+            self.laws.invalidate(code)
+        else:
+            self.laws.pop(code, None)
+        # A file with the same jurabk loaded earlier takes over again
+        other = self.conn.execute(
+            "SELECT * FROM sources WHERE law_code = ? ORDER BY rowid DESC LIMIT 1", (code,)
+        ).fetchone()
+        if other is not None:
+            self._restore_law(other)
+
+    def _drop_source(self, source: str):
+        """Remove all indexed paragraphs of a source."""
+        if self._batch is not None and source in self._batch.sources:
+            self._flush_batch()
+        row = self.conn.execute(
+            "SELECT first_id, last_id FROM sources WHERE source = ?", (source,)
+        ).fetchone()
+        if row is None:
+            return
+        self._invalidate_responses()
+        if row['first_id'] is not None:
+            self.conn.execute(
+                """INSERT INTO laws_fts (laws_fts, rowid, law_code, paragraph_id, paragraph_name, content)
+                   SELECT 'delete', id, law_code, paragraph_id, paragraph_name, content
+                   FROM paragraphs WHERE id BETWEEN ? AND ?""",
+                (row['first_id'], row['last_id'])
+            )
+            self.conn.execute(
+                "DELETE FROM paragraphs WHERE id BETWEEN ? AND ?", (row['first_id'], row['last_id'])
+            )
+            self.conn.execute(
+                "DELETE FROM refs WHERE paragraph_rowid BETWEEN ? AND ?", (row['first_id'], row['last_id'])
+            )
+        self.conn.execute("DELETE FROM sources WHERE source = ?", (source,))
+
+    def _restore_law(self, row: sqlite3.Row) -> Optional[str]:
+        """Load a law from the index instead of parsing its source again."""
+        if row['law_code'] is None:
+            return None
+
+        entry = CatalogEntry(
+            row['law_code'], row['short_title'], row['full_title'], row['source'], row['first_id'], row['last_id']
+        )
+        self._set_law(entry)
+        return entry.short_title
+
+    def _set_law(self, entry: CatalogEntry, parser: Optional[LawParser] = None):
+        """Register a law in the catalog (and, unless lazy, keep it parsed in memory)."""
+        self._invalidate_responses()
+        self.catalog[entry.code] = entry
+        self.matcher.add(entry.code, entry.short_title, entry.full_title)
+        if self.lazy:
+            self.laws.invalidate(entry.code)
+        else:
+            self.laws[entry.code] = parser or self._read_law(entry)
+
+    def _read_law(self, entry: CatalogEntry) -> LawParser:
+        """Build a law from its paragraphs stored in the index."""
+        if self._batch is not None and entry.source in self._batch.sources:
+            self._flush_batch()
+        with self._reader() as conn:
+            outline, = conn.execute("SELECT outline FROM sources WHERE source = ?", (entry.source,)).fetchone()
+            paragraphs = conn.execute(
+                "SELECT paragraph_id, paragraph_name, content FROM paragraphs WHERE id BETWEEN ? AND ? ORDER BY id",
+                (entry.first_id, entry.last_id)
+            )
+            return LawParser.from_paragraphs(entry.short_title, entry.full_title, paragraphs, json.loads(outline or '[]'))
+
+    def law_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Hit/miss statistics of the parsed-law cache (lazy mode only)."""
+        return self.laws.cache.stats() if self.lazy else None
+
+    def _load_law_from_markdown(
+        self,
+        md_text: str,
+        source: Optional[str] = None,
+        fingerprint: Optional[Tuple[int, int, str]] = None
+    ) -> str:
+        return self._add_law(LawParser(md_text), source, fingerprint)
+
+    def _add_law(
+        self,
+        parser: LawParser,
+        source: Optional[str] = None,
+        fingerprint: Optional[Tuple[int, int, str]] = None
+    ) -> Optional[str]:
+        """Register a parsed law and index its paragraphs for search."""
+        mtime_ns, size, digest = fingerprint or (None, None, None)
 
         if len(parser.paragraphs) <= settings.min_paragraphs:
+            if source:
+                # Remember the skip so the source is not parsed again
+                self._drop_source(source)
+                self._write_source((source, mtime_ns, size, digest, None, None, None, None, None, None), [], [])
             return None
         
         if not parser.short_title:
             raise ValueError(f"Could not determine short title")
-            
-        self.laws[parser.short_title.lower()] = parser
+
+        law_code = parser.short_title.lower()
+        source = source or law_code
+        self._drop_source(source)
         
         # Index for search
-        for p_id, node in parser.paragraphs.items():
-            text_content = "\n".join(node.content_lines)
-            self.conn.execute(
-                "INSERT INTO laws_fts (law_code, paragraph_id, paragraph_name, content) VALUES (?, ?, ?, ?)",
-                (parser.short_title.lower(), p_id, node.name or "", text_content)
+        next_id = self._next_paragraph_id()
+        rows = [
+            (next_id + i, law_code, p_id, node.name or "", node.text)
+            for i, (p_id, node) in enumerate(parser.paragraphs.items())
+        ]
+        first_id, last_id = (rows[0][0], rows[-1][0]) if rows else (None, None)
+
+        # Reference graph. Titles ("des Handelsgesetzbuches") are resolved
+        # against the catalog once all laws are loaded.
+        rowids = {row[2]: row[0] for row in rows}
+        refs = [
+            (
+                rowids[p_id], ref.law,
+                None if ref.title else (normalize_law_code(ref.law) if ref.law else law_code),
+                ref.start, ref.end, ref.absatz
             )
-        self.conn.commit()
+            for p_id, ref in parser.references()
+        ]
+        self._write_source(
+            (source, mtime_ns, size, digest, law_code, parser.short_title, parser.full_title, first_id, last_id,
+             json.dumps(parser.sections, ensure_ascii=False, separators=(',', ':'))),
+            rows, refs
+        )
+        self._set_law(CatalogEntry(law_code, parser.short_title, parser.full_title, source, first_id, last_id), parser)
+        if self._batch is None:
+            self._resolve_references()
+            self.conn.commit()
 
         return parser.short_title
 
+    def _next_paragraph_id(self) -> int:
+        if self._batch is not None:
+            return self._batch.next_id
+        return self.conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM paragraphs").fetchone()[0]
+
+    def _write_source(self, source_row: tuple, rows: List[tuple], refs: List[tuple]):
+        """Write a source with its paragraph and reference rows, or queue them during bulk ingest."""
+        if self._batch is None:
+            self._insert_rows([source_row], rows, refs)
+            self.conn.commit()
+            return
+
+        self._batch.add(source_row, rows, refs)
+        if len(self._batch.rows) >= self._batch.batch_size:
+            self._flush_batch()
+
+    def _insert_rows(self, source_rows: List[tuple], rows: List[tuple], refs: List[tuple]):
+        self.conn.executemany(
+            "INSERT INTO paragraphs (id, law_code, paragraph_id, paragraph_name, content) VALUES (?, ?, ?, ?, ?)",
+            rows
+        )
+        self.conn.executemany(
+            "INSERT INTO laws_fts (rowid, law_code, paragraph_id, paragraph_name, content) VALUES (?, ?, ?, ?, ?)",
+            rows
+        )
+        self.conn.executemany(
+            """INSERT INTO refs (paragraph_rowid, law_ref, target_law, target_start, target_end, target_absatz)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            refs
+        )
+        self.conn.executemany(
+            """INSERT INTO sources (source, mtime_ns, size, digest, law_code, short_title, full_title, first_id, last_id, outline)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            source_rows
+        )
+
+    def _resolve_references(self):
+        """
+        Resolve references that name a law by its title to the law code,
+        e.g. "des Handelsgesetzbuches" -> "hgb". References to laws that are
+        not loaded stay unresolved and are retried on the next load.
+        """
+        unresolved = [row[0] for row in self.conn.execute(
+            "SELECT DISTINCT law_ref FROM refs WHERE target_law IS NULL"
+        )]
+        if not unresolved:
+            return
+        resolved = [(self.matcher.resolve(law_ref), law_ref) for law_ref in unresolved]
+        self.conn.executemany(
+            "UPDATE refs SET target_law = ? WHERE target_law IS NULL AND law_ref = ?",
+            [(code, law_ref) for code, law_ref in resolved if code]
+        )
+
+    def _flush_batch(self):
+        batch = self._batch
+        with self._timed('ingest'):
+            self._insert_rows(list(batch.sources.values()), batch.rows, batch.refs)
+        batch.total_rows += len(batch.rows)
+        batch.rows = []
+        batch.refs = []
+        batch.sources = {}
+
+    @contextmanager
+    def _timed(self, phase: str):
+        """Add the time spent in the block to `phase_seconds[phase]`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_seconds[phase] = self.phase_seconds.get(phase, 0.0) + time.perf_counter() - start
+
+    @contextmanager
+    def bulk_ingest(self, batch_size: int = 10000, optimize: bool = True):
+        """
+        Load many laws in one transaction.
+
+        Inside the context, paragraphs of all loaded laws are collected and
+        written with `executemany` in batches of `batch_size` rows. Durable
+        syncing and FTS5 segment merging are switched off while loading,
+        the index is optimized once at the end (unless `optimize` is False,
+        e.g. when only a few laws changed).
+
+        Example:
+            with library.bulk_ingest():
+                for path in paths:
+                    library.load_law_from_file(path)
+        """
+        self._check_writable()
+        if self._batch is not None:
+            # Already inside a bulk ingest
+            yield self._batch
+            return
+
+        self.conn.commit()
+        self.conn.execute("PRAGMA synchronous = OFF")
+        self.conn.execute("PRAGMA cache_size = -65536")
+        self.conn.execute("INSERT INTO laws_fts (laws_fts, rank) VALUES ('automerge', 0)")
+        self._batch = _IngestBatch(self._next_paragraph_id(), batch_size)
+        start = time.perf_counter()
+        try:
+            yield self._batch
+        finally:
+            batch = self._batch
+            self._flush_batch()
+            self._batch = None
+            self._resolve_references()
+            self.conn.execute("INSERT INTO laws_fts (laws_fts, rank) VALUES ('automerge', 4)")
+            if batch.total_rows and optimize:
+                with self._timed('optimize'):
+                    self.conn.execute("INSERT INTO laws_fts (laws_fts) VALUES ('optimize')")
+            with self._timed('commit'):
+                self.conn.commit()
+            self.conn.execute("PRAGMA synchronous = FULL")
+
+            elapsed = time.perf_counter() - start
+            self.ingest_stats = {
+                "rows": batch.total_rows,
+                "seconds": round(elapsed, 3),
+                "rows_per_second": round(batch.total_rows / elapsed) if elapsed else None,
+            }
+            print(f'Indexed {batch.total_rows} paragraphs in {elapsed:.1f}s '
+                  f'({self.ingest_stats["rows_per_second"]} rows/s)')
+
     def load_law_from_file(self, file_path: Path) -> str:
         """
-        Load a law from a URL and return its short title.
+        Load a law from a markdown file and return its short title.
+
+        If the file is unchanged since it was indexed (same mtime and size,
+        or same content hash), the law is restored from the index instead
+        of being parsed again.
         
         Args:
-            url: URL to the law markdown file
+            file_path: Path to the law markdown file
             
         Returns:
             Short title (abbreviation) of the loaded law
         """
-        md_text = file_path.read_text()
-            
-        return self._load_law_from_markdown(md_text)
+        return list(self._load_files([Path(file_path).resolve()]))[0]
+
+    def _load_files(self, paths: List[Path], workers: int = 1) -> Iterator[Optional[str]]:
+        """
+        Load law files in order, yielding the short title of each (or None
+        if skipped). Unchanged files are restored from the index, the others
+        are read and parsed, optionally in a process pool. Results are
+        applied in file order, so a duplicate jurabk resolves the same way
+        as in serial loading.
+        """
+        self._check_writable()
+        plan = []
+        tasks = []
+        with self._timed('discover'):
+            for path in paths:
+                source = str(path)
+                row = self.conn.execute("SELECT * FROM sources WHERE source = ?", (source,)).fetchone()
+                unchanged = bool(row) and (row['mtime_ns'], row['size']) == index.stat_fingerprint(path)
+                plan.append((source, row, unchanged))
+                if not unchanged:
+                    tasks.append((source, row['digest'] if row else None))
+
+        workers = workers or os.cpu_count() or 1
+        with ExitStack() as stack:
+            if workers > 1 and len(tasks) > 1:
+                pool = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+                results = pool.map(_parse_law_file, tasks, chunksize=max(1, len(tasks) // (workers * 8)))
+            else:
+                results = map(_parse_law_file, tasks)
+
+            for source, row, unchanged in plan:
+                if unchanged:
+                    with self._timed('restore'):
+                        loaded = self._restore_law(row)
+                    yield loaded
+                    continue
+
+                with self._timed('parse'):
+                    fingerprint, parser, parse_seconds = next(results)
+                start = time.perf_counter()
+                loaded = self._apply_parsed(source, row, fingerprint, parser)
+                if self.law_timings is not None and parser is not None:
+                    self._record_timing(source, loaded, fingerprint[1], parse_seconds, time.perf_counter() - start)
+                yield loaded
+
+    def _apply_parsed(
+        self,
+        source: str,
+        row: Optional[sqlite3.Row],
+        fingerprint: Tuple[int, int, str],
+        parser: Optional[LawParser]
+    ) -> Optional[str]:
+        """Add a parsed law, or restore it if its content was unchanged (`parser` is None)."""
+        if parser is None:
+            # Touched but same content
+            self.conn.execute(
+                "UPDATE sources SET mtime_ns = ?, size = ? WHERE source = ?",
+                (fingerprint[0], fingerprint[1], source)
+            )
+            if self._batch is None:
+                self.conn.commit()
+            return self._restore_law(row)
+        return self._add_law(parser, source, fingerprint)
+
+    def _record_timing(self, source: str, law: Optional[str], size: int, parse_seconds: float, index_seconds: float):
+        entry = self.catalog.get(law.lower()) if law else None
+        self.law_timings.append({
+            "source": source,
+            "law": law,
+            "bytes": size,
+            "paragraphs": entry.paragraph_count if entry else 0,
+            "parse_seconds": round(parse_seconds, 6),
+            "index_seconds": round(index_seconds, 6),
+        })
+
+    def timing_report(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Parse and index time of every law parsed since the library was
+        created (with `record_timings`), slowest first. Restored laws are
+        not included. Index time excludes the batched writes of
+        `bulk_ingest`, which are shared by all laws.
+        """
+        if self.law_timings is None:
+            return []
+        timings = sorted(self.law_timings, key=lambda t: t["parse_seconds"] + t["index_seconds"], reverse=True)
+        return timings[:limit] if limit else timings
 
     def load_law_from_url(self, url: str) -> str:
         """
@@ -270,83 +1577,150 @@ class LawLibrary:
         Returns:
             Short title (abbreviation) of the loaded law
         """
-        with urllib.request.urlopen(url) as f:
-            md_text = f.read().decode("utf-8")
-            
-        return self._load_law_from_markdown(md_text)
+        return self._load_law_from_bytes(self.fetcher.fetch(url), source=url)
+
+    def _load_law_from_bytes(self, data: bytes, source: str) -> Optional[str]:
+        """Load a downloaded law, restoring it from the index if its content is unchanged."""
+        self._check_writable()
+        digest = index.digest(data)
+        row = self.conn.execute("SELECT * FROM sources WHERE source = ?", (source,)).fetchone()
+        if row and row['digest'] == digest:
+            return self._restore_law(row)
+        return self._load_law_from_markdown(data.decode("utf-8"), source=source, fingerprint=(None, len(data), digest))
         
-    def load_laws_from_github(self, codes: List[str]) -> List[str]:
+    def load_laws_from_github(self, codes: List[str], base_url: str = GITHUB_BASE_URL) -> List[str]:
         """
         Load multiple laws from the German Bundestag GitHub repository.
+
+        Laws are downloaded concurrently by `self.fetcher` and applied in
+        the order of `codes`.
         
         Args:
             codes: List of law codes (e.g., ['bgb', 'hgb'])
+            base_url: Base URL of the repository (raw file access)
             
         Returns:
             List of successfully loaded law codes
         """
-        base_url = "https://raw.githubusercontent.com/bundestag/gesetze/refs/heads/master"
+        urls = [f"{base_url}/{code[0].lower()}/{code.lower()}/index.md" for code in codes]
         loaded = []
         
-        for code in codes:
-            try:
-                url = f"{base_url}/{code[0].lower()}/{code.lower()}/index.md"
-                self.load_law_from_url(url)
-                loaded.append(code)
-            except Exception as e:
-                print(f"Failed to load {code}: {str(e)}")
-                
+        with self.bulk_ingest():
+            for code, (url, result) in zip(codes, self.fetcher.fetch_many(urls)):
+                try:
+                    if isinstance(result, Exception):
+                        raise result
+                    self._load_law_from_bytes(result, source=url)
+                    loaded.append(code)
+                except Exception as e:
+                    print(f"Failed to load {code}: {str(e)}")
+
+        self._remove_foreign_sources()
+        self.conn.commit()
         return loaded
         
     def get_available_laws(self, search_string: Optional[str] = None) -> List[Dict[str, str]]:
         """
         Return all available laws with their full titles in JSON format.
-        If search_string is provided, returns only those laws whose titles closely match the search string.
+        If search_string is provided, returns only those laws whose codes,
+        aliases or titles closely match the search string.
 
         Args:
-            search_string: Optional string to fuzzy-match against law titles.
+            search_string: Optional string to fuzzy-match against law codes and titles.
 
         Returns:
             List of dicts containing law codes and full titles
         """
-        # Prepare list of all laws
-        all_laws = [
-            {"code": code, "title": parser.full_title}
-            for code, parser in self.laws.items()
-        ]
-
-        # If no search string is given, return all
         if not search_string:
-            return all_laws
-
-        # Use rapidfuzz to extract matches above a threshold
-
-        # Extract matches
-        matches = process.extract(
-            search_string,
-            self.laws.keys(),
-            scorer=fuzz.QRatio,
-            processor=lambda s: s.lower(),
-            limit=50,
-            score_cutoff=60
-        )
+            return [
+                {"code": code, "title": entry.full_title}
+                for code, entry in self.catalog.items()
+            ]
 
-        # Sort matches by descending score
-        sorted_matches = sorted(matches, key=lambda x: x[1], reverse=True)
-        
-        # Map to list of dicts
-        matched_laws = [
+        return [
             {
                 "code": code,
-                "title": self.laws[code].full_title,
+                "title": self.catalog[code].full_title,
                 "similarity": score
             }
-            for code, score, *_ in sorted_matches
+            for code, score in self.matcher.match(search_string, limit=50)
         ]
-        
-        return matched_laws
 
-    def get(self, law_code: str, paragraph_id: str, absatz_id: Optional[str] = None) -> Dict[str, Any]:
+    def _sorted_catalog(self) -> Tuple[List[str], List[Tuple[str, str]]]:
+        order = self._catalog_order
+        if order is None:
+            codes = sorted(self.catalog)
+            titles = sorted(
+                ((entry.full_title or entry.short_title).lower(), code) for code, entry in self.catalog.items()
+            )
+            order = self._catalog_order = (codes, titles)
+        return order
+
+    def list_laws(self, prefix: Optional[str] = None, cursor: Optional[str] = None, limit: int = 50) -> Dict[str, Any]:
+        """
+        One page of the catalog, sorted by law code.
+
+        The sorted catalog is built once after laws were added or removed,
+        so a page of the unfiltered catalog costs a binary search and a
+        slice, however many laws are loaded.
+
+        Args:
+            prefix: Only laws whose code or full title starts with it
+                (case-insensitive), e.g. "SGB" or "Bürgerliches"
+            cursor: `next_cursor` of the previous page
+            limit: Maximum number of laws on the page
+
+        Returns:
+            Dict with the `laws` of the page (code and title), the `total`
+            number of matching laws and the `next_cursor` (None on the
+            last page)
+        """
+        codes, titles = self._sorted_catalog()
+        if prefix and prefix.strip():
+            key = prefix.strip().lower()
+            end = key[:-1] + chr(ord(key[-1]) + 1)
+            matches = set(codes[bisect.bisect_left(codes, key):bisect.bisect_left(codes, end)])
+            matches.update(
+                code for _, code in titles[bisect.bisect_left(titles, (key,)):bisect.bisect_left(titles, (end,))]
+            )
+            codes = sorted(matches)
+
+        # The cursor is the last code of the previous page, so pages stay
+        # consistent when laws before it are added or removed
+        start = bisect.bisect_right(codes, cursor.strip().lower()) if cursor else 0
+        page = codes[start:start + limit]
+        return {
+            "laws": [{"code": code, "title": self.catalog[code].full_title} for code in page],
+            "total": len(codes),
+            "next_cursor": page[-1] if page and start + limit < len(codes) else None,
+        }
+
+    def resolve_law(self, law_code: str) -> str:
+        """
+        Code of a loaded law given its code, an alias ("SGB V") or its
+        title ("Bürgerliches Gesetzbuch").
+
+        Raises:
+            KeyError: if no such law is loaded, listing similar laws
+        """
+        code = law_code.strip().lower()
+        if code in self.catalog:
+            return code
+        code = self.matcher.resolve(law_code)
+        if code is not None:
+            return code
+        similar = [self.catalog[code].short_title for code, _ in self.matcher.match(law_code, limit=5)]
+        hint = f"Similar laws: {', '.join(similar)}" if similar else "Use get_lawlibrary to list the available laws."
+        raise KeyError(f"Law '{law_code}' not available. {hint}")
+
+    def get(
+        self,
+        law_code: str,
+        paragraph_id: str,
+        absatz_id: Optional[str] = None,
+        satz_id: Optional[Union[str, int]] = None,
+        nummer_id: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Retrieve paragraph or absatz from a specific law in JSON format.
         
@@ -354,25 +1728,433 @@ class LawLibrary:
             law_code: The abbreviation of the law (e.g., 'BGB', 'HGB')
             paragraph_id: The paragraph number
             absatz_id: Optional absatz number
+            satz_id: Optional satz number
+            nummer_id: Optional nummer
             
         Returns:
             Dict containing law, paragraph info and text content
         """
         
-        law_code_lower = law_code.lower()
-        if law_code_lower not in self.laws:
-            available = self.get_available_laws_json(law_code)
-            raise KeyError(f"Law '{law_code}' not available. Available laws: {available}")
-        
-        law = self.laws[law_code_lower]
-        result = law.get_paragraph(paragraph_id, absatz_id)
+        code = self.resolve_law(law_code)
+        law = self.laws[code]
+        structure_bytes = law.structure_bytes
+        result = law.get_paragraph(paragraph_id, absatz_id, satz_id, nummer_id)
+        if self.lazy and law.structure_bytes != structure_bytes:
+            # The paragraph index built for this request counts against the cache budget
+            self.laws.remeasure(code)
         result["law"] = law.short_title
         result["law_title"] = law.full_title
         result["url"] = f'https://www.gesetze-im-internet.de/{law.short_title.lower()}/__{paragraph_id}.html'
         
         return result
         
-    def get_json(self, law_code: str, paragraph_id: str, absatz_id: Optional[str] = None) -> str:
+    def get_many(
+        self,
+        references: List[str],
+        default_law: Optional[str] = None,
+        max_paragraphs: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        Retrieve several paragraphs and paragraph ranges in one call.
+
+        Args:
+            references: Citations such as "§ 823 Abs. 1 BGB", "§§ 433-453 BGB"
+                or "BGB § 280"
+            default_law: Law used for references that do not name one
+            max_paragraphs: Maximum number of paragraphs returned overall
+
+        Returns:
+            One item per reference, with either a list of `paragraphs`
+            (as returned by get()) or an `error` message. Items cut short
+            by `max_paragraphs` are marked `truncated`.
+        """
+        items = []
+        remaining = max_paragraphs
+        for reference in references:
+            item: Dict[str, Any] = {"reference": reference}
+            try:
+                citation = parse_citation(reference)
+                law_code = citation.law or default_law
+                if not law_code:
+                    raise ValueError(f"No law given in reference '{reference}'")
+
+                if citation.end:
+                    if citation.absatz or citation.satz or citation.nummer:
+                        raise ValueError("Absatz, Satz or Nummer cannot be combined with a paragraph range")
+                    ids = self.laws[self.resolve_law(law_code)].paragraph_range(citation.start, citation.end)
+                    if not ids:
+                        raise KeyError(f"No paragraphs found in § {citation.start} - § {citation.end}")
+                else:
+                    ids = [citation.start]
+
+                if len(ids) > remaining:
+                    ids = ids[:remaining]
+                    item["truncated"] = True
+                item["paragraphs"] = [
+                    self.get(law_code.strip(), p_id, citation.absatz, citation.satz, citation.nummer) for p_id in ids
+                ]
+                remaining -= len(ids)
+            except (KeyError, ValueError) as e:
+                item["error"] = e.args[0] if e.args else str(e)
+            items.append(item)
+        return items
+
+    def table_of_contents(self, law_code: str, section: Optional[str] = None,
+                          depth: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Outline of a law: its Bücher, Abschnitte, Titel etc. with the
+        paragraphs they contain.
+
+        Args:
+            law_code: The abbreviation of the law
+            section: Optional section (id or title, see `LawParser.find_section`)
+                to list the subsections of
+            depth: Number of levels listed (all by default)
+
+        Returns:
+            Dict with the law and its nested `sections`
+        """
+        law = self.laws[self.resolve_law(law_code)]
+        result: Dict[str, Any] = {"law": law.short_title, "law_title": law.full_title}
+        # An empty section lists the whole law
+        section = section.strip() if section else None
+        if section:
+            ids = law.outline[0]
+            position = law.find_section(section)
+            result["section"] = {"id": ids[position], "title": law.sections[position].title}
+        result["sections"] = law.toc(section, depth)
+        return result
+
+    def get_section(self, law_code: str, section: str, offset: int = 0, max_paragraphs: int = 100) -> Dict[str, Any]:
+        """
+        All paragraphs of a section of a law (e.g. "Buch 2 > Abschnitt 8 >
+        Titel 1" or its id "2.8.1"), in document order.
+
+        Args:
+            law_code: The abbreviation of the law
+            section: Id or title of the section
+            offset: Number of paragraphs of the section to skip
+            max_paragraphs: Maximum number of paragraphs returned
+
+        Returns:
+            Dict with the section, its `path` of titles, the paragraphs,
+            their `total` number and the `next_offset` if there are more
+        """
+        law = self.laws[self.resolve_law(law_code)]
+        ids = law.outline[0]
+        position = law.find_section(section)
+        entry = law.sections[position]
+        path = [entry.title]
+        depth = entry.depth
+        for previous in reversed(law.sections[:position]):
+            if previous.depth < depth:
+                path.insert(0, previous.title)
+                depth = previous.depth
+        paragraph_ids = law.section_paragraphs(position)
+        offset = max(0, offset)
+        page = paragraph_ids[offset:offset + max_paragraphs]
+        return {
+            "law": law.short_title,
+            "section": {"id": ids[position], "title": entry.title, "path": path},
+            "paragraphs": [law.get_paragraph(p_id) for p_id in page],
+            "total": len(paragraph_ids),
+            "next_offset": offset + len(page) if offset + len(page) < len(paragraph_ids) else None,
+        }
+
+    def _paragraph_rowid(self, law_code: str, paragraph_id: str) -> int:
+        """Row id of a paragraph in the index."""
+        entry = self.catalog[self.resolve_law(law_code)]
+        with self._reader() as conn:
+            row = conn.execute(
+                "SELECT id FROM paragraphs WHERE id BETWEEN ? AND ? AND paragraph_id = ?",
+                (entry.first_id, entry.last_id, str(paragraph_id).strip())
+            ).fetchone()
+        if row is None:
+            raise KeyError(f"Paragraph {paragraph_id} not found in {entry.short_title}")
+        return row[0]
+
+    def references(self, law_code: str, paragraph_id: str) -> List[Dict[str, Any]]:
+        """
+        References made by a paragraph, in text order.
+
+        Returns:
+            List of dicts with the referenced `law` (code, or None if the
+            law could not be resolved), `paragraph`, `end` (for ranges such
+            as §§ 433-453) and `absatz`
+        """
+        rowid = self._paragraph_rowid(law_code, paragraph_id)
+        with self._reader() as conn:
+            rows = conn.execute(
+                "SELECT law_ref, target_law, target_start, target_end, target_absatz FROM refs "
+                "WHERE paragraph_rowid = ? ORDER BY rowid",
+                (rowid,)
+            ).fetchall()
+        return [
+            {"law": row['target_law'], "paragraph": row['target_start'], "end": row['target_end'],
+             "absatz": row['target_absatz'], **({"law_ref": row['law_ref']} if row['target_law'] is None else {})}
+            for row in rows
+        ]
+
+    def cited_by(self, law_code: str, paragraph_id: str) -> List[Dict[str, Any]]:
+        """
+        Paragraphs that refer to a paragraph, directly or through a
+        paragraph range containing it.
+
+        Returns:
+            List of dicts with the citing `law` and `paragraph` and the
+            cited `absatz`, in index order
+        """
+        code = self.resolve_law(law_code)
+        paragraph_id = str(paragraph_id).strip()
+        self._paragraph_rowid(code, paragraph_id)
+        key = natural_key(paragraph_id)
+        with self._reader() as conn:
+            rows = conn.execute(
+                """SELECT p.law_code, p.paragraph_id, r.target_start, r.target_end, r.target_absatz
+                   FROM refs r JOIN paragraphs p ON p.id = r.paragraph_rowid
+                   WHERE r.target_law = ? AND (r.target_start = ? OR r.target_end IS NOT NULL)
+                   ORDER BY r.paragraph_rowid""",
+                (code, paragraph_id)
+            ).fetchall()
+        results = []
+        seen = set()
+        for row in rows:
+            if row['target_end'] is not None and not (
+                natural_key(row['target_start']) <= key <= natural_key(row['target_end'])
+            ):
+                continue
+            citing = (row['law_code'], row['paragraph_id'])
+            if citing == (code, paragraph_id) or citing in seen:
+                continue
+            seen.add(citing)
+            results.append({"law": row['law_code'], "paragraph": row['paragraph_id'], "absatz": row['target_absatz']})
+        return results
+
+    def reference_graph(
+        self,
+        law_code: str,
+        paragraph_id: str,
+        depth: int = 2,
+        max_paragraphs: int = 50,
+        direction: str = 'out',
+        include_text: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Follow references from a paragraph transitively (breadth first).
+
+        Args:
+            law_code: The abbreviation of the law
+            paragraph_id: The paragraph to start from
+            depth: Maximum number of hops
+            max_paragraphs: Maximum number of paragraphs returned, including
+                the start paragraph
+            direction: 'out' follows the references made by the paragraphs,
+                'in' follows the paragraphs citing them ("cited by")
+            include_text: Whether to include the paragraph texts
+
+        Returns:
+            Dict with the reached `paragraphs` (law, paragraph, title, depth
+            and text), the `edges` between them and whether the result was
+            `truncated` by `max_paragraphs`
+        """
+        if direction not in ('out', 'in'):
+            raise ValueError("direction must be 'out' or 'in'")
+        start = (self.resolve_law(law_code), str(paragraph_id).strip())
+        self._paragraph_rowid(*start)
+
+        nodes = {start: 0}
+        edges = {}
+        truncated = False
+        frontier = [start]
+        for level in range(1, depth + 1):
+            next_frontier = []
+            for node in frontier:
+                for target, absatz in self._neighbours(node, direction):
+                    if target not in nodes:
+                        if len(nodes) >= max_paragraphs:
+                            truncated = True
+                            continue
+                        nodes[target] = level
+                        next_frontier.append(target)
+                    edge = ((node, target) if direction == 'out' else (target, node)) + (absatz,)
+                    if edge not in edges:
+                        edges[edge] = {"from": self._label(*edge[0]), "to": self._label(*edge[1]), "absatz": absatz}
+            frontier = next_frontier
+
+        paragraphs = []
+        for (code, p_id), level in nodes.items():
+            law = self.laws[code]
+            node = law.paragraphs[p_id]
+            item = {"law": law.short_title, "paragraph": p_id, "title": node.name, "depth": level}
+            if include_text:
+                item["text"] = node.text
+            paragraphs.append(item)
+        return {"paragraphs": paragraphs, "edges": list(edges.values()), "truncated": truncated}
+
+    def _neighbours(self, node: Tuple[str, str], direction: str) -> Iterator[Tuple[Tuple[str, str], Optional[str]]]:
+        """Existing paragraphs one reference away from `node`, with the cited Absatz."""
+        if direction == 'in':
+            for ref in self.cited_by(*node):
+                yield (ref["law"], ref["paragraph"]), ref["absatz"]
+            return
+        for ref in self.references(*node):
+            code = ref["law"]
+            if code not in self.laws:
+                continue
+            law = self.laws[code]
+            ids = law.paragraph_range(ref["paragraph"], ref["end"]) if ref["end"] else [ref["paragraph"]]
+            for p_id in ids:
+                if p_id in law.paragraphs and (code, p_id) != node:
+                    yield (code, p_id), ref["absatz"]
+
+    def _label(self, code: str, paragraph_id: str) -> str:
+        return f"§ {paragraph_id} {self.catalog[code].short_title}"
+
+    def _similarity_path(self) -> Optional[Path]:
+        if self.index_path is None:
+            return None
+        return self.index_path.with_name(f"{self.index_path.stem}.tfidf.npz")
+
+    def build_similarity_index(self) -> SimilarityIndex:
+        """
+        Build the TF-IDF vectors of all paragraphs used by
+        `similar_paragraphs`. With an index file, they are saved next to it
+        (`<index>.tfidf.npz`) and loaded instead of rebuilt as long as the
+        indexed sources are unchanged.
+
+        Raises:
+            RuntimeError: if numpy is not installed
+        """
+        with self._reader() as conn, self._timed('similarity'):
+            sources = conn.execute("SELECT source, digest, first_id, last_id FROM sources ORDER BY source").fetchall()
+            signature = index.digest(json.dumps([tuple(row) for row in sources]).encode('utf-8'))
+            path = self._similarity_path()
+            similarity = SimilarityIndex.load(path, signature) if path else None
+            if similarity is None:
+                rows = conn.execute("SELECT id, paragraph_name, content FROM paragraphs ORDER BY id")
+                similarity = SimilarityIndex.build((row[0], f"{row[1] or ''}\n{row[2]}") for row in rows)
+                if path and not self.read_only:
+                    similarity.save(path, signature)
+        self.similarity = similarity
+        self._invalidate_responses()
+        return similarity
+
+    def similar_paragraphs(
+        self,
+        law_code: Optional[str] = None,
+        paragraph_id: Optional[str] = None,
+        text: Optional[str] = None,
+        limit: int = 10,
+        law_codes: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Paragraphs worded most similarly to a paragraph or a free text, by
+        cosine similarity of their TF-IDF vectors.
+
+        Args:
+            law_code: Law of the paragraph to compare with
+            paragraph_id: Paragraph to compare with
+            text: Free text to compare with, if no paragraph is given
+            limit: Maximum number of results
+            law_codes: Optional list of law codes to restrict the results to
+
+        Returns:
+            List of paragraphs with their similarity (0-1), most similar first
+
+        Raises:
+            RuntimeError: if `build_similarity_index` was not called
+            KeyError: if the law or paragraph does not exist
+            ValueError: if neither a paragraph nor a text is given
+        """
+        if self.similarity is None:
+            raise RuntimeError("The similarity index is not enabled (SIMILARITY_INDEX)")
+        exclude = []
+        if law_code and paragraph_id:
+            rowid = self._paragraph_rowid(law_code, paragraph_id)
+            with self._reader() as conn:
+                row = conn.execute("SELECT paragraph_name, content FROM paragraphs WHERE id = ?", (rowid,)).fetchone()
+            text = f"{row[0] or ''}\n{row[1]}"
+            exclude.append(rowid)
+        elif not text or not text.strip():
+            raise ValueError("Pass a law and paragraph, or a text to compare with")
+
+        ranges = None
+        if law_codes:
+            entries = [self.catalog[self.resolve_law(code)] for code in law_codes]
+            ranges = [(entry.first_id, entry.last_id) for entry in entries if entry.first_id is not None]
+
+        matches = self.similarity.query(text, max(1, limit), exclude, ranges)
+        if not matches:
+            return []
+        with self._reader() as conn:
+            rows = {
+                row['id']: row for row in conn.execute(
+                    f"SELECT id, law_code, paragraph_id, paragraph_name FROM paragraphs "
+                    f"WHERE id IN ({', '.join('?' * len(matches))})",
+                    [rowid for rowid, _ in matches]
+                )
+            }
+        results = []
+        for rowid, score in matches:
+            row = rows.get(rowid)
+            entry = self.catalog.get(row['law_code']) if row else None
+            if entry is None or not entry.first_id <= rowid <= entry.last_id:
+                # Removed or replaced since the vectors were built
+                continue
+            code = row['law_code']
+            results.append({
+                "law": code,
+                "paragraph": row['paragraph_id'],
+                "title": row['paragraph_name'],
+                "similarity": score,
+                "url": f'https://www.gesetze-im-internet.de/{code.lower()}/__{row["paragraph_id"]}.html'
+            })
+        return results
+
+    def similar_paragraphs_json(self, law_code: Optional[str] = None, paragraph_id: Optional[str] = None,
+                                text: Optional[str] = None, limit: int = 10,
+                                law_codes: Optional[List[str]] = None) -> str:
+        """Similar paragraphs (see `similar_paragraphs`) as a JSON string."""
+        codes = tuple(sorted({code.strip().lower() for code in law_codes})) if law_codes else None
+        key = ('similar', law_code and law_code.strip().lower(), paragraph_id and str(paragraph_id).strip(),
+               text and text.strip(), limit, codes)
+        return self._cached_json(
+            key, lambda: self.similar_paragraphs(law_code, paragraph_id, text, limit, list(codes) if codes else None)
+        )
+
+    def get_many_json(self, references: List[str], default_law: Optional[str] = None, max_paragraphs: int = 100) -> str:
+        """
+        Same as get_many() but returns a JSON string instead of a list.
+        """
+        key = ('get_many', tuple(reference.strip() for reference in references),
+               default_law and default_law.strip().lower(), max_paragraphs)
+        return self._cached_json(key, lambda: self.get_many(references, default_law, max_paragraphs))
+
+    def table_of_contents_json(self, law_code: str, section: Optional[str] = None, depth: Optional[int] = None) -> str:
+        """Outline of a law (see `table_of_contents`) as a JSON string."""
+        key = ('toc', law_code.strip().lower(), section.strip() if section else None, depth)
+        return self._cached_json(key, lambda: self.table_of_contents(law_code.strip(), key[2], depth))
+
+    def get_section_json(self, law_code: str, section: str, offset: int = 0, max_paragraphs: int = 100) -> str:
+        """Paragraphs of a section (see `get_section`) as a JSON string."""
+        key = ('section', law_code.strip().lower(), section.strip(), offset, max_paragraphs)
+        return self._cached_json(key, lambda: self.get_section(law_code.strip(), key[2], offset, max_paragraphs))
+
+    def reference_graph_json(self, law_code: str, paragraph_id: str, **kwargs) -> str:
+        """
+        Same as reference_graph() but returns a JSON string instead of a dict.
+        """
+        key = ('refs', law_code.strip().lower(), str(paragraph_id).strip(), tuple(sorted(kwargs.items())))
+        return self._cached_json(key, lambda: self.reference_graph(law_code, paragraph_id, **kwargs))
+
+    def get_json(
+        self,
+        law_code: str,
+        paragraph_id: str,
+        absatz_id: Optional[str] = None,
+        satz_id: Optional[Union[str, int]] = None,
+        nummer_id: Optional[str] = None
+    ) -> str:
         """
         Same as get() but returns a JSON string instead of a dict.
         
@@ -380,11 +2162,17 @@ class LawLibrary:
             law_code: The abbreviation of the law
             paragraph_id: The paragraph number
             absatz_id: Optional absatz number
+            satz_id: Optional satz number
+            nummer_id: Optional nummer
             
         Returns:
             JSON string representation of the result
         """
-        return json.dumps(self.get(law_code, paragraph_id, absatz_id), ensure_ascii=False, indent=2)
+        key = (
+            'get', law_code.strip().lower(), str(paragraph_id).strip(),
+            absatz_id and str(absatz_id).strip(), satz_id and str(satz_id).strip(), nummer_id and str(nummer_id).strip()
+        )
+        return self._cached_json(key, lambda: self.get(law_code.strip(), *key[2:]))
         
     def get_available_laws_json(self, search_string: Optional[str] = None) -> str:
         """
@@ -393,36 +2181,175 @@ class LawLibrary:
         Returns:
             JSON string representation of available laws
         """
-        return json.dumps(self.get_available_laws(search_string=search_string), ensure_ascii=False, indent=2)
+        key = ('laws', search_string and search_string.strip().lower())
+        return self._cached_json(key, lambda: self.get_available_laws(search_string=search_string))
+
+    def list_laws_json(self, prefix: Optional[str] = None, cursor: Optional[str] = None, limit: int = 50) -> str:
+        """One page of the catalog (see `list_laws`) as a JSON string."""
+        key = ('list', prefix and prefix.strip().lower(), cursor, limit)
+        return self._cached_json(key, lambda: self.list_laws(prefix, cursor, limit))
 
-    def search(self, query: str, law_codes: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    def search_json(self, query: str, law_codes: Optional[List[str]] = None, **kwargs) -> str:
         """
-        Fulltext search over laws.
+        Same as search() but returns a JSON string instead of a list.
+
+        Args:
+            query: FTS5 query string
+            law_codes: Optional list of law codes to restrict the search to
+            **kwargs: limit, offset, weights and timeout as in search()
+
+        Returns:
+            JSON string representation of the results, or of an object with
+            an error message and the partial results if the search timed out
         """
-        sql = "SELECT law_code, paragraph_id, paragraph_name, snippet(laws_fts, 3, '<b>', '</b>', '...', 64) as preview FROM laws_fts WHERE laws_fts MATCH ? ORDER BY rank LIMIT 20"
-        
+        codes = tuple(sorted({code.strip().lower() for code in law_codes})) if law_codes else None
+        key = ('search', query.strip(), codes, tuple(sorted(kwargs.items())))
         try:
-            cursor = self.conn.execute(sql, (query,))
-            results = []
-            
-            for row in cursor:
-                code = row[0]
-                # Filter by law code if requested
-                if law_codes and code.lower() not in [l.lower() for l in law_codes]:
-                    continue
-                    
-                results.append({
-                    "law": code,
-                    "paragraph": row[1],
-                    "title": row[2],
-                    "match": row[3],
-                    "url": f'https://www.gesetze-im-internet.de/{code.lower()}/__{row[1]}.html'
-                })
-            return results
-        except sqlite3.OperationalError as e:
-            # Handle FTS syntax errors gracefully
-            print(f"Search error: {e}")
-            return []
+            return self._cached_json(key, lambda: self.search(query, list(codes) if codes else None, **kwargs))
+        except SearchTimeout as e:
+            # Not cached: the search may finish in time once the system is less busy
+            self.search_timeouts += 1
+            return self._dumps({"error": e.args[0], "results": e.results})
+
+    def _cached_json(self, key: tuple, compute: Callable[[], Any]) -> str:
+        """
+        Serialized tool response from the response cache, computed and
+        cached on a miss. Keys include the library generation, so entries
+        computed before a reload are never returned. Cache hits need no
+        lock. Misses are computed concurrently under the read side of the
+        library lock, so they never see a reload half-applied (a reload
+        takes the write side); a read-only library never changes and needs
+        no lock at all.
+        """
+        text = self.response_cache.get((self.generation,) + key)
+        if text is not None:
+            return text
+        with nullcontext() if self.read_only else self._lock.read():
+            key = (self.generation,) + key
+            # Another call may have computed it while this one waited for the lock
+            text = self.response_cache.peek(key)
+            if text is None:
+                text = self._dumps(compute())
+                self.response_cache.put(key, text)
+            return text
+
+    def _dumps(self, obj: Any) -> str:
+        if self.compact_json:
+            return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+        return json.dumps(obj, ensure_ascii=False, indent=2)
+
+    def _invalidate_responses(self):
+        """Called whenever laws are added or removed."""
+        self.generation += 1
+        self.response_cache.clear()
+        self._catalog_order = None
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Statistics of the response cache, the law name matcher and (in lazy mode) the parsed-law cache."""
+        return {
+            "responses": self.response_cache.stats(),
+            "matcher": self.matcher.cache.stats(),
+            "laws": self.law_cache_stats(),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Size of the library, loading phase timings, cache, reload and fetch statistics."""
+        # A reload changes the catalog while holding the write side of the lock
+        with nullcontext() if self.read_only else self._lock.read():
+            laws = len(self.catalog)
+            paragraphs = sum(entry.paragraph_count for entry in self.catalog.values())
+        with self._reader() as conn:
+            page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+            page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        return {
+            "laws": laws,
+            "paragraphs": paragraphs,
+            "index_bytes": page_count * page_size,
+            "search_errors": self.search_errors,
+            "search_timeouts": self.search_timeouts,
+            "phase_seconds": {phase: round(seconds, 3) for phase, seconds in self.phase_seconds.items()},
+            "ingest": self.ingest_stats,
+            "caches": self.cache_stats(),
+            "reload": self.reload_stats,
+            "fetch": self.fetcher.stats,
+        }
+
+    def search(
+        self,
+        query: str,
+        law_codes: Optional[List[str]] = None,
+        limit: int = 20,
+        offset: int = 0,
+        name_weight: float = 1.0,
+        content_weight: float = 1.0,
+        timeout: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Fulltext search over laws.
+
+        Args:
+            query: FTS5 query string, rewritten for the search mode (see
+                `index.normalize_query`)
+            law_codes: Optional list of law codes to restrict the search to
+            limit: Maximum number of results
+            offset: Number of results to skip (for paging)
+            name_weight: BM25 weight of the paragraph name column
+            content_weight: BM25 weight of the paragraph text column
+            timeout: Time budget of the query in seconds (None: unlimited)
+
+        Returns:
+            List of matches ordered by relevance
+
+        Raises:
+            SearchTimeout: if the query takes longer than `timeout`. With
+                `law_codes`, it carries the matches of the laws searched so far.
+        """
+        query = index.normalize_query(query, self.search_mode)
+        rank = f"bm25(0.0, 0.0, {float(name_weight)}, {float(content_weight)})"
+        sql = ("SELECT law_code, paragraph_id, paragraph_name, snippet(laws_fts, 3, '<b>', '</b>', '...', 64) as preview, rank "
+               "FROM laws_fts WHERE laws_fts MATCH ? AND rank MATCH ?")
+
+        def result(row) -> Dict[str, Any]:
+            code = row[0]
+            return {
+                "law": code,
+                "paragraph": row[1],
+                "title": row[2],
+                "match": row[3],
+                "url": f'https://www.gesetze-im-internet.de/{code.lower()}/__{row[1]}.html'
+            }
+
+        parts = []
+        with self._reader() as conn, index.time_budget(conn, timeout) as expired:
+            try:
+                if not law_codes:
+                    rows = conn.execute(sql + " ORDER BY rank LIMIT ? OFFSET ?", (query, rank, limit, offset))
+                    return [result(row) for row in rows]
+
+                # The paragraphs of each source occupy one contiguous rowid
+                # range, which FTS5 can use to restrict the match. Every range
+                # returns its best rows, merged by (corpus-wide) BM25 rank.
+                codes = [code.lower() for code in law_codes]
+                ranges = conn.execute(
+                    f"SELECT first_id, last_id FROM sources WHERE first_id IS NOT NULL "
+                    f"AND law_code IN ({', '.join('?' * len(codes))})",
+                    codes
+                ).fetchall()
+                for first_id, last_id in ranges:
+                    parts.append(conn.execute(
+                        sql + " AND rowid BETWEEN ? AND ? ORDER BY rank LIMIT ?",
+                        (query, rank, first_id, last_id, offset + limit)
+                    ).fetchall())
+                rows = islice(heapq.merge(*parts, key=lambda row: row[4]), offset, offset + limit)
+                return [result(row) for row in rows]
+            except sqlite3.OperationalError as e:
+                if expired():
+                    rows = islice(heapq.merge(*parts, key=lambda row: row[4]), offset, offset + limit)
+                    raise SearchTimeout(timeout, [result(row) for row in rows]) from None
+                # Handle FTS syntax errors gracefully
+                print(f"Search error: {e}")
+                self.search_errors += 1
+                return []
 
 # Example usage
 if __name__ == "__main__":
@@ -0,0 +1,164 @@
+"""
+Opt-in profiling of tool calls and of loading the laws.
+
+- Sampled profiles: a fraction of calls runs under cProfile (and
+  optionally tracemalloc). Each writes `<name>-<time>.prof` (pstats format,
+  e.g. `python -m pstats` or snakeviz) and, with memory tracing, a
+  `<name>-<time>.mem.txt` with the allocation sites that grew the most.
+- Slow-call log: calls taking longer than a threshold are printed with
+  their arguments, duration and the SQLite statements they ran. Statement
+  durations are approximate: the time from the start of a statement to
+  the start of the next one (or the end of the call), including the
+  statements FTS5 runs internally.
+
+Nothing is installed unless a `Profiler` is created; the server only
+creates one if profiling is configured.
+"""
+import cProfile
+import json
+import random
+import sqlite3
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+
+class Profiler:
+    def __init__(
+        self,
+        output_dir: Optional[Union[str, Path]] = None,
+        sample_rate: float = 0.0,
+        trace_memory: bool = False,
+        slow_seconds: float = 0.0,
+        top: int = 25
+    ):
+        """
+        Args:
+            output_dir: Folder for profiles and reports. Without it, calls
+                are not profiled (the slow-call log still works).
+            sample_rate: Fraction of calls profiled with cProfile
+            trace_memory: Also trace allocations of profiled calls
+            slow_seconds: Log calls taking longer than this (0: no log)
+            top: Number of entries in reports
+        """
+        self.output_dir = Path(output_dir) if output_dir else None
+        self.sample_rate = sample_rate if self.output_dir else 0.0
+        self.trace_memory = trace_memory
+        self.slow_seconds = slow_seconds
+        self.top = top
+        self.slow_calls = 0
+        self.profiles = 0
+        # Only one profile at a time: concurrent calls are not sampled
+        self._profiling = threading.Lock()
+        # Statements run by the current thread's call, if it is timed
+        self._local = threading.local()
+
+    def watch(self, connections: Iterable[sqlite3.Connection]):
+        """Record the statements run on these connections for the slow-call log."""
+        if not self.slow_seconds:
+            return
+        for conn in connections:
+            conn.set_trace_callback(self._trace)
+
+    def _trace(self, statement: str):
+        statements = getattr(self._local, 'statements', None)
+        # Statements run by FTS5 for a query start with "-- " and count towards it
+        if statements is not None and not statement.startswith('-- '):
+            statements.append((time.perf_counter(), statement))
+
+    def call(self, name: str, fn: Callable, *args, **kwargs) -> Any:
+        """Run `fn(*args, **kwargs)`, profiled if sampled and logged if slow."""
+        sampled = self.sample_rate and random.random() < self.sample_rate
+        with self.profile(name) if sampled else nullcontext():
+            if not self.slow_seconds:
+                return fn(*args, **kwargs)
+            self._local.statements = statements = []
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                end = time.perf_counter()
+                self._local.statements = None
+                if end - start > self.slow_seconds:
+                    self._log_slow(name, args, kwargs, end - start, statement_timings(statements, end))
+
+    def _log_slow(self, name: str, args: tuple, kwargs: Dict[str, Any], seconds: float,
+                  statements: List[Tuple[float, str]]):
+        self.slow_calls += 1
+        arguments = ', '.join([_short(repr(arg)) for arg in args] + [f'{key}={_short(repr(value))}' for key, value in kwargs.items()])
+        lines = [f"Slow call {name}({arguments}) took {seconds:.3f}s, {len(statements)} statements"]
+        for duration, statement in sorted(statements, reverse=True)[:5]:
+            lines.append(f"  {duration:.3f}s {_short(' '.join(statement.split()), 200)}")
+        print('\n'.join(lines))
+
+    @contextmanager
+    def profile(self, name: str) -> Iterator[None]:
+        """Profile the block with cProfile (and tracemalloc) unless another profile is running."""
+        if self.output_dir is None or not self._profiling.acquire(blocking=False):
+            yield
+            return
+        stem = self.output_dir / f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-{self.profiles}"
+        self.profiles += 1
+        profile = cProfile.Profile()
+        tracing = self.trace_memory and not tracemalloc.is_tracing()
+        try:
+            if tracing:
+                tracemalloc.start()
+                before = tracemalloc.take_snapshot()
+            profile.enable()
+            try:
+                yield
+            finally:
+                profile.disable()
+                self.output_dir.mkdir(parents=True, exist_ok=True)
+                profile.dump_stats(f"{stem}.prof")
+                if tracing:
+                    growth = tracemalloc.take_snapshot().compare_to(before, 'lineno')
+                    peak = tracemalloc.get_traced_memory()[1]
+                    tracemalloc.stop()
+                    with open(f"{stem}.mem.txt", 'w') as f:
+                        f.write(f"Peak traced memory: {peak / 1024 / 1024:.1f} MiB\n")
+                        f.writelines(f"{stat}\n" for stat in growth[:self.top])
+        finally:
+            self._profiling.release()
+
+    def write_report(self, name: str, text: str) -> Optional[Path]:
+        """Write a text report to the output folder."""
+        if self.output_dir is None:
+            return None
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        path = self.output_dir / name
+        path.write_text(text, encoding='utf-8')
+        return path
+
+
+def report_load_timings(library, profiler: Optional[Profiler] = None, top: int = 10):
+    """
+    Print the laws that took longest to parse and index (see
+    `LawLibrary.timing_report`) and write all timings to
+    `load_timings.json` in the profiler's output folder.
+    """
+    timings = library.timing_report()
+    if not timings:
+        return
+    print(f"Slowest of {len(timings)} parsed laws (parse / index seconds):")
+    for timing in timings[:top]:
+        print(f"  {timing['parse_seconds']:.4f} / {timing['index_seconds']:.4f}  {timing['law']} "
+              f"({timing['paragraphs']} paragraphs, {timing['bytes']} bytes) {timing['source']}")
+    if profiler is not None:
+        path = profiler.write_report('load_timings.json', json.dumps(timings, indent=2))
+        if path:
+            print(f"Load timings written to {path}")
+
+
+def statement_timings(statements: List[Tuple[float, str]], end: float) -> List[Tuple[float, str]]:
+    """(duration, statement) from (start, statement), each lasting until the next one starts."""
+    ends = [start for start, _ in statements[1:]] + [end]
+    return [(stop - start, statement) for (start, statement), stop in zip(statements, ends)]
+
+
+def _short(text: str, length: int = 80) -> str:
+    return text if len(text) <= length else text[:length - 3] + '...'
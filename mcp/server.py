@@ -1,66 +1,307 @@
+from contextlib import nullcontext
+from functools import partial
+import anyio
 from mcp.server.fastmcp import FastMCP
 from parser import LawLibrary
+from fetch import HttpFetcher
+from metrics import Metrics
+from profiling import Profiler, report_load_timings
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
 import json
+import time
 from config import settings
 
 mcp = FastMCP("deutsche-gesetze-mcp", stateless_http=True, host='0.0.0.0', port=8001, debug=True)
 
 LAWS = []
 
-library = LawLibrary()
+metrics = Metrics()
+startup_start = time.perf_counter()
+
+library = LawLibrary(
+    index_path=settings.index_path,
+    lazy=settings.lazy_load,
+    cache_size=settings.law_cache_size,
+    cache_memory_mb=settings.law_cache_memory_mb,
+    fetcher=HttpFetcher(cache_dir=settings.http_cache_dir, max_workers=settings.http_workers),
+    response_cache_size=settings.response_cache_size,
+    compact_json=settings.compact_json,
+    search_mode=settings.search_mode,
+    read_only=settings.read_only_index,
+    readers=settings.reader_connections,
+    immutable=settings.index_immutable,
+    record_timings=settings.profile_startup
+)
+
+# Profiling is opt-in: without a profiler, tools and loading run unwrapped
+profiler = None
+if settings.profile_dir or settings.slow_call_seconds > 0:
+    profiler = Profiler(
+        settings.profile_dir,
+        sample_rate=settings.profile_sample_rate,
+        trace_memory=settings.profile_memory,
+        slow_seconds=settings.slow_call_seconds
+    )
+    profiler.watch(library.connections())
 
 # Load multiple laws
-if settings.load_from_folder:
-    library.load_laws_from_folder(settings.load_from_folder)
-elif settings.load_from_github:
-    library.load_laws_from_github(settings.load_from_github)
-else:
-    ValueError('No law source provided')
+with profiler.profile('startup') if profiler and settings.profile_startup else nullcontext():
+    if settings.read_only_index:
+        # Serve an index built beforehand with build_index.py, e.g. shared by several workers
+        library.load_index()
+    elif settings.load_from_archive:
+        library.load_laws_from_archive(settings.load_from_archive)
+    elif settings.load_from_xml:
+        library.load_laws_from_xml(settings.load_from_xml)
+    elif settings.load_from_folder:
+        library.load_laws_from_folder(settings.load_from_folder, workers=settings.parse_workers)
+        if settings.reload_interval > 0:
+            library.watch_folder(settings.load_from_folder, settings.reload_interval, workers=settings.parse_workers)
+    elif settings.load_from_github:
+        library.load_laws_from_github(settings.load_from_github)
+    else:
+        ValueError('No law source provided')
+
+if settings.profile_startup:
+    report_load_timings(library, profiler)
+
+if settings.similarity_index:
+    try:
+        library.build_similarity_index()
+    except RuntimeError as e:
+        print(f"Similarity index disabled: {e}")
+
+metrics.set('startup_seconds', round(time.perf_counter() - startup_start, 3))
+metrics.register_gauges('library', library.stats)
+if profiler is not None:
+    metrics.register_gauges('profiler', lambda: {"slow_calls": profiler.slow_calls, "profiles": profiler.profiles})
+
+# Tools run in worker threads, so a slow query never blocks the event loop
+# and other requests. At most `tool_workers` run at once.
+tool_limiter = anyio.CapacityLimiter(max(1, settings.tool_workers))
+# Tool calls running or waiting for a worker (only changed on the event loop)
+tool_calls = 0
+metrics.register_gauges('tool_pool', lambda: {
+    "calls": tool_calls,
+    "busy": tool_limiter.borrowed_tokens,
+})
+
+
+async def run_tool(tool: str, fn, *args, **kwargs) -> str:
+    """
+    Run a blocking tool function in the worker pool. While all workers
+    are busy and `tool_queue_size` calls are already waiting, calls are
+    rejected right away instead of queueing up without bound.
+    """
+    global tool_calls
+    if tool_calls >= tool_limiter.total_tokens + settings.tool_queue_size:
+        metrics.inc('tool_rejected_total', (('tool', tool),))
+        return "The server is busy, please retry in a moment"
+    tool_calls += 1
+    call = partial(fn, *args, **kwargs) if profiler is None else partial(profiler.call, tool, fn, *args, **kwargs)
+    try:
+        return await anyio.to_thread.run_sync(call, limiter=tool_limiter)
+    finally:
+        tool_calls -= 1
 
 
 @mcp.tool()
-def get_lawlibrary(law: str | None = None) -> str:
-    """Get a list of available german laws. If `law` is provided, list 
-    all laws with similar names."""
-    if len(library.laws) > 50:
-        return 'Es sind mehr als 50 Gesetze in der Datenbank. Um nach einem Gesetz zu suchen' \
-                'übergebe ein Gesetzeskürzel (EStG, HGB, etc ...) als `law` Parameter.'
-    
-    laws = library.get_available_laws_json(law)
-    laws = json.dumps(laws)
-    return laws
+@metrics.instrument('get_lawlibrary')
+async def get_lawlibrary(law: str | None = None, prefix: str | None = None, cursor: str | None = None,
+                   limit: int = 50) -> str:
+    """List the available german laws, sorted by code, one page at a time.
+    Pass `next_cursor` of a page as `cursor` to get the next page.
+    Example values:
+    - prefix: only laws whose code or title starts with it, e.g. SGB, Bürgerliches (optional)
+    - cursor: next_cursor of the previous page (optional)
+    - limit: number of laws per page (1-200)
+    If `law` is provided instead, list all laws with similar names (e.g. EStG, Krankenversicherung).
+    """
+    if law:
+        return await run_tool('get_lawlibrary', library.get_available_laws_json, law)
+
+    return await run_tool('get_lawlibrary', library.list_laws_json, prefix, cursor, limit=max(1, min(limit, 200)))
+
+@mcp.tool()
+@metrics.instrument('get_paragraph')
+async def get_paragraph(law: str, paragraph: str, absatz: str | None = None, satz: int | None = None,
+                  nummer: str | None = None) -> str:
+    """Get the content of a paragraph of a german law, or of a single
+    Absatz, Satz or Nummer of it (e.g. § 823 Abs. 1 S. 2 BGB).
+    Example values:
+    - law: BGB, HGB, SGB 5, etc ...
+    - paragraph: 2, 14a, etc ...
+    - absatz: 1, 2a, etc ... (optional)
+    - satz: 1, 2, etc ... (optional)
+    - nummer: 1, 3a, etc ... (optional)
+    """
+    return await run_tool('get_paragraph', library.get_json, law, paragraph, absatz, satz, nummer)
+
+@mcp.tool()
+@metrics.instrument('get_paragraphs')
+async def get_paragraphs(references: list[str], law: str | None = None) -> str:
+    """Get several paragraphs or paragraph ranges in one call. Use this to
+    follow all references found in a text at once.
+    Example values:
+    - references: ["§ 823 Abs. 1 BGB", "§§ 433-436 BGB", "§ 280", "HGB § 9b"]
+    - law: law used for references without a law, e.g. BGB (optional)
+    Errors for single references are reported per item.
+    """
+    return await run_tool(
+        'get_paragraphs', library.get_many_json, references, default_law=law,
+        max_paragraphs=settings.batch_max_paragraphs
+    )
 
 @mcp.tool()
-def get_paragraph(law: str, paragraph: str) -> str:
-    """Get the content of a paragraph of a german law. 
+@metrics.instrument('get_table_of_contents')
+async def get_table_of_contents(law: str, section: str | None = None, depth: int = 2) -> str:
+    """Get the table of contents of a german law: its Bücher, Abschnitte,
+    Titel etc. with their ids and the paragraphs they contain.
+    Example values:
+    - law: BGB, HGB, SGB 5, etc ...
+    - section: only list the subsections of this section, by id ("2.8")
+      or title ("Buch 2 > Abschnitt 8") (optional)
+    - depth: number of levels listed (1-10)
+    """
+    try:
+        return await run_tool(
+            'get_table_of_contents', library.table_of_contents_json, law, section, max(1, min(depth, 10))
+        )
+    except (KeyError, ValueError) as e:
+        return e.args[0] if e.args else str(e)
+
+@mcp.tool()
+@metrics.instrument('get_section')
+async def get_section(law: str, section: str, offset: int = 0) -> str:
+    """Get all paragraphs of a section of a german law (e.g. a Titel or
+    Abschnitt) in one call. Use get_table_of_contents to find the section.
+    Example values:
+    - law: BGB, HGB, SGB 5, etc ...
+    - section: id ("2.8.1") or title ("Buch 2 > Abschnitt 8 > Titel 1", "Kaufvertrag")
+    - offset: number of paragraphs to skip, `next_offset` of the previous response
+    """
+    try:
+        return await run_tool(
+            'get_section', library.get_section_json, law, section,
+            max(0, offset), settings.batch_max_paragraphs
+        )
+    except (KeyError, ValueError) as e:
+        return e.args[0] if e.args else str(e)
+
+@mcp.tool()
+@metrics.instrument('get_references')
+async def get_references(law: str, paragraph: str, depth: int = 1, direction: str = 'out',
+                   max_paragraphs: int = 30, include_text: bool = True) -> str:
+    """Follow the references of a paragraph (e.g. "§ 280 Abs. 1", "§ 823 BGB")
+    transitively and return all reached paragraphs with their texts in one call.
+    With direction "in", returns the paragraphs citing it instead ("cited by").
     Example values:
     - law: BGB, HGB, SGB 5, etc ...
     - paragraph: 2, 14a, etc ...
+    - depth: number of hops to follow (1-5)
+    - direction: "out" (referenced paragraphs) or "in" (citing paragraphs)
+    - max_paragraphs: maximum number of paragraphs returned
+    - include_text: set to false to only get the reference graph
+    """
+    try:
+        return await run_tool(
+            'get_references', library.reference_graph_json, law, paragraph,
+            depth=max(1, min(depth, 5)),
+            max_paragraphs=max(1, min(max_paragraphs, settings.batch_max_paragraphs)),
+            direction=direction,
+            include_text=include_text
+        )
+    except (KeyError, ValueError) as e:
+        return e.args[0] if e.args else str(e)
+
+@mcp.tool()
+@metrics.instrument('get_similar_paragraphs')
+async def get_similar_paragraphs(law: str | None = None, paragraph: str | None = None, text: str | None = None,
+                           laws: list[str] | None = None, limit: int = 10) -> str:
+    """Find the paragraphs worded most similarly to a paragraph (e.g. "which
+    paragraphs are like § 823 BGB") or to a free text, ranked by TF-IDF
+    cosine similarity over all laws.
+    Example values:
+    - law, paragraph: BGB, 823 (compare with this paragraph)
+    - text: a description or draft text, if no paragraph is given
+    - laws: optional list of law codes to restrict the results to, e.g. ["BGB", "HGB"]
+    - limit: maximum number of results (1-50)
     """
-    text = library.get_json(law, paragraph)
-    return text
+    try:
+        return await run_tool(
+            'get_similar_paragraphs', library.similar_paragraphs_json,
+            law, paragraph, text, max(1, min(limit, 50)), laws
+        )
+    except (KeyError, ValueError, RuntimeError) as e:
+        return e.args[0] if e.args else str(e)
 
 @mcp.tool()
-def search_laws(query: str, laws: list[str] | None = None) -> str:
+@metrics.instrument('search_laws')
+async def search_laws(query: str, laws: list[str] | None = None, limit: int = 20, offset: int = 0) -> str:
     """Fulltext search over all laws or a specific list of laws.
     
     Args:
         query: The search query (e.g. "Schadensersatz", "Kündigung").
         laws: Optional list of law codes to filter by (e.g. ["BGB", "HGB"]).
+        limit: Maximum number of results (1-100).
+        offset: Number of results to skip, to page through further results.
+
+    Searches running longer than the server's time budget (e.g. many
+    wildcard terms) are stopped and return an error with the results
+    found so far.
     """
+    return await run_tool('search_laws', _search, query, laws, limit, offset)
+
+def _search(query: str, laws: list[str] | None, limit: int, offset: int) -> str:
     normalized_laws = None
     if laws:
         normalized_laws = []
         for law in laws:
-            law_lower = law.strip().lower()
-            if law_lower not in library.laws:
-                available = library.get_available_laws_json(law)
-                return f"Law '{law}' not available. Available laws: {available}"
-            normalized_laws.append(law_lower)
-            
-    results = library.search(query, normalized_laws)
-    return json.dumps(results, ensure_ascii=False, indent=2)
+            try:
+                normalized_laws.append(library.resolve_law(law))
+            except KeyError as e:
+                return e.args[0]
+
+    return library.search_json(
+        query,
+        normalized_laws,
+        limit=max(1, min(limit, 100)),
+        offset=max(0, offset),
+        name_weight=settings.search_name_weight,
+        content_weight=settings.search_content_weight,
+        timeout=settings.query_timeout or None
+    )
+
+@mcp.resource("stats://cache")
+def cache_stats() -> str:
+    """Hit rates of the response cache and the parsed-law cache."""
+    return json.dumps(library.cache_stats(), indent=2)
 
+# The library gauges wait for the database connection, which a running
+# search may hold up to its time budget, so they are read in a thread.
+
+@mcp.resource("stats://metrics")
+async def metrics_snapshot() -> str:
+    """Request counts, latencies and response sizes per tool, library size and loading phase timings."""
+    return json.dumps(await anyio.to_thread.run_sync(metrics.snapshot), indent=2)
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics_endpoint(request: Request) -> PlainTextResponse:
+    """Metrics in the Prometheus text format."""
+    return PlainTextResponse(await anyio.to_thread.run_sync(metrics.render), media_type="text/plain; version=0.0.4")
+
+@mcp.resource("stats://reload")
+def reload_stats() -> str:
+    """Number and duration of reloads of changed law files."""
+    return json.dumps(library.reload_stats, indent=2)
+
+def http_app():
+    """
+    ASGI app for running several worker processes with uvicorn, e.g.
+    `uvicorn --app-dir mcp --factory server:http_app --workers 4`.
+    """
+    return mcp.streamable_http_app()
 
 if __name__ == "__main__":
     mcp.run(transport="streamable-http")
\ No newline at end of file
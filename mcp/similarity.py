@@ -0,0 +1,192 @@
+"""
+"Similar paragraphs" retrieval with TF-IDF vectors.
+
+Every paragraph becomes a sparse, L2-normalized TF-IDF vector over its
+words (sublinear term frequency, smoothed IDF). Words in fewer than
+`min_df` paragraphs or in more than `max_df` of all paragraphs are
+dropped, which removes typos and stop words and keeps the index small.
+
+The vectors are stored column-wise (one posting list of paragraphs and
+weights per word), so the cosine similarity of a query to all paragraphs
+is a single `numpy.bincount` over the posting lists of the query words.
+Building, scoring and top-k selection are vectorized; only tokenization
+runs per paragraph in Python.
+
+NumPy is required for this module; without it `SimilarityIndex.build`
+raises a RuntimeError.
+"""
+import os
+import re
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+TOKEN_RE = re.compile(r'\w{3,}')
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+class SimilarityIndex:
+    """
+    TF-IDF vectors of paragraphs, identified by their row ids in the law index.
+
+    Attributes:
+        rowids: Paragraph row ids, ascending
+        vocabulary: Word -> column
+        idf: IDF weight per column
+        indptr: Start of the posting list of each column in `docs`/`weights`
+        docs: Paragraph positions (into `rowids`) of all posting lists
+        weights: Normalized TF-IDF weights of all posting lists
+    """
+
+    def __init__(self, rowids, vocabulary: Dict[str, int], idf, indptr, docs, weights):
+        self.rowids = rowids
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.indptr = indptr
+        self.docs = docs
+        self.weights = weights
+
+    @classmethod
+    def build(cls, paragraphs: Iterable[Tuple[int, str]], min_df: int = 2, max_df: float = 0.5) -> 'SimilarityIndex':
+        """
+        Args:
+            paragraphs: (row id, text) in ascending row id order
+            min_df: Minimum number of paragraphs a word must occur in
+            max_df: Maximum fraction of paragraphs a word may occur in
+        """
+        if np is None:
+            raise RuntimeError("The similarity index requires numpy")
+
+        # Tokenize in Python, collecting (paragraph, word, count) triples in compact arrays
+        words: Dict[str, int] = {}
+        rowids = array('q')
+        doc_ids = array('i')
+        word_ids = array('i')
+        counts = array('f')
+        for position, (rowid, text) in enumerate(paragraphs):
+            rowids.append(rowid)
+            tf = Counter(tokenize(text))
+            doc_ids.extend([position] * len(tf))
+            word_ids.extend([words.setdefault(word, len(words)) for word in tf])
+            counts.extend(tf.values())
+
+        n_docs = len(rowids)
+        doc_ids = np.frombuffer(doc_ids, dtype=np.int32)
+        word_ids = np.frombuffer(word_ids, dtype=np.int32)
+        counts = np.frombuffer(counts, dtype=np.float32)
+
+        # Drop rare and very common words and renumber the rest
+        df = np.bincount(word_ids, minlength=len(words))
+        keep = (df >= min_df) & (df <= max(1, max_df * n_docs))
+        column = np.full(len(words), -1, dtype=np.int32)
+        column[keep] = np.arange(int(keep.sum()), dtype=np.int32)
+        vocabulary = {word: int(column[i]) for word, i in words.items() if keep[i]}
+        mask = keep[word_ids]
+        doc_ids, word_ids, counts = doc_ids[mask], column[word_ids[mask]], counts[mask]
+
+        idf = (np.log((1 + n_docs) / (1 + df[keep])) + 1).astype(np.float32)
+        weights = (1 + np.log(counts)) * idf[word_ids]
+        norms = np.sqrt(np.bincount(doc_ids, weights=weights * weights, minlength=n_docs)).astype(np.float32)
+        weights /= norms[doc_ids]
+
+        # Column-wise layout: posting lists sorted by word
+        order = np.argsort(word_ids, kind='stable')
+        indptr = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(word_ids, minlength=len(vocabulary)), out=indptr[1:])
+        return cls(
+            np.frombuffer(rowids, dtype=np.int64).copy(), vocabulary, idf,
+            indptr, doc_ids[order], weights[order].astype(np.float32)
+        )
+
+    def __len__(self) -> int:
+        return len(self.rowids)
+
+    def vector(self, text: str) -> Tuple['np.ndarray', 'np.ndarray']:
+        """Columns and normalized weights of the TF-IDF vector of a text."""
+        tf = Counter(word for word in tokenize(text) if word in self.vocabulary)
+        columns = np.fromiter((self.vocabulary[word] for word in tf), dtype=np.int64, count=len(tf))
+        weights = (1 + np.log(np.fromiter(tf.values(), dtype=np.float32, count=len(tf)))) * self.idf[columns]
+        norm = np.sqrt(np.dot(weights, weights))
+        return columns, weights / norm if norm else weights
+
+    def query(
+        self,
+        text: str,
+        limit: int = 10,
+        exclude: Sequence[int] = (),
+        ranges: Optional[Sequence[Tuple[int, int]]] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Paragraphs most similar to a text.
+
+        Args:
+            text: Query text, e.g. the text of a paragraph
+            limit: Number of results
+            exclude: Row ids never returned (e.g. the query paragraph)
+            ranges: Only return row ids within these (first, last) ranges
+
+        Returns:
+            (row id, cosine similarity) pairs, most similar first; only
+            paragraphs sharing at least one word with the text
+        """
+        columns, query_weights = self.vector(text)
+        if not len(columns):
+            return []
+        starts, ends = self.indptr[columns], self.indptr[columns + 1]
+        postings = np.concatenate([np.arange(start, end) for start, end in zip(starts, ends)])
+        scores = np.bincount(
+            self.docs[postings],
+            weights=self.weights[postings] * np.repeat(query_weights, ends - starts),
+            minlength=len(self.rowids)
+        )
+
+        if ranges is not None:
+            allowed = np.zeros(len(self.rowids), dtype=bool)
+            for first, last in ranges:
+                allowed[np.searchsorted(self.rowids, first):np.searchsorted(self.rowids, last, side='right')] = True
+            scores[~allowed] = 0
+        for rowid in exclude:
+            position = np.searchsorted(self.rowids, rowid)
+            if position < len(self.rowids) and self.rowids[position] == rowid:
+                scores[position] = 0
+
+        limit = min(limit, len(scores))
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(int(self.rowids[i]), round(float(scores[i]), 4)) for i in top if scores[i] > 0]
+
+    def save(self, path: Union[str, Path], signature: str):
+        """Write the index to a .npz file (atomically), tagged with the signature of the indexed data."""
+        path = Path(path)
+        words = sorted(self.vocabulary, key=self.vocabulary.get)
+        tmp = path.with_name(path.name + '.tmp')
+        with open(tmp, 'wb') as f:
+            np.savez(
+                f, signature=np.array(signature), rowids=self.rowids, idf=self.idf, indptr=self.indptr,
+                docs=self.docs, weights=self.weights,
+                vocabulary=np.frombuffer('\n'.join(words).encode('utf-8'), dtype=np.uint8)
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path], signature: str) -> Optional['SimilarityIndex']:
+        """The index saved at `path`, or None if there is none for this signature (or no numpy)."""
+        if np is None or not Path(path).is_file():
+            return None
+        with np.load(path) as data:
+            if str(data['signature']) != signature:
+                return None
+            words = data['vocabulary'].tobytes().decode('utf-8').split('\n') if len(data['vocabulary']) else []
+            return cls(
+                data['rowids'], {word: i for i, word in enumerate(words)}, data['idf'],
+                data['indptr'], data['docs'], data['weights']
+            )
@@ -19,3 +19,34 @@ It has multiple lines.
 $$3$$
 (3) Third absatz with marker.
 """
+
+@pytest.fixture
+def outline_law_markdown():
+    return """---
+Title: Gliederungsgesetz
+Jurabk: GliedG
+---
+# Gliederungsgesetz (GliedG)
+
+### § 1 Zweck
+Einleitung.
+
+## Buch 1 - Allgemeiner Teil
+### Abschnitt 1 - Personen
+##### § 2 Rechtsfähigkeit
+Text.
+##### § 3 Volljährigkeit
+Text.
+### Abschnitt 2 - Sachen
+##### § 4 Begriff
+Text.
+## Buch 2 - Schuldrecht
+### Abschnitt 1 - Inhalt
+#### Titel 1 - Kauf, Tausch
+##### § 5 Kaufvertrag
+Text.
+#### Titel 2 - Schenkung
+##### § 6 Begriff
+Text.
+### Abschnitt 10 - Schlussvorschriften
+"""
@@ -0,0 +1,57 @@
+import pytest
+
+from citations import Reference, extract_references, parse_citation
+
+def test_parse_citation():
+    citation = parse_citation("§ 823 Abs. 1 S. 2 BGB")
+    assert (citation.law, citation.start, citation.absatz, citation.satz) == ("BGB", "823", "1", "2")
+    citation = parse_citation("§§ 433-453 BGB")
+    assert (citation.start, citation.end) == ("433", "453")
+    assert parse_citation("SGB 5 § 1").law == "SGB 5"
+    assert parse_citation("14a").law is None
+    # The law before the number without a § sign
+    citation = parse_citation("bgb 823")
+    assert (citation.law, citation.start) == ("bgb", "823")
+    citation = parse_citation("SGB 5 1 Abs. 2")
+    assert (citation.law, citation.start, citation.absatz) == ("SGB 5", "1", "2")
+    with pytest.raises(ValueError, match="Could not parse"):
+        parse_citation("kein Zitat")
+
+def test_extract_references():
+    text = ("Der Schuldner haftet nach § 280 Abs. 1 und §§ 823, 826 BGB. "
+            "§§ 433 bis 453 gelten entsprechend; § 5 des Handelsgesetzbuches und § 1 SGB V bleiben unberührt.")
+    assert extract_references(text) == [
+        Reference(None, False, "280", None, "1"),
+        Reference("BGB", False, "823", None, None),
+        Reference("BGB", False, "826", None, None),
+        Reference(None, False, "433", "453", None),
+        Reference("Handelsgesetzbuches", True, "5", None, None),
+        Reference("SGB V", False, "1", None, None),
+    ]
+    # Absatz qualifiers inside a list, the law at its end applies to all items
+    assert extract_references("gemäß §§ 12, 13 Abs. 1 und 14 VwVfG") == [
+        Reference("VwVfG", False, "12", None, None),
+        Reference("VwVfG", False, "13", None, "1"),
+        Reference("VwVfG", False, "14", None, None),
+    ]
+    assert extract_references("nach §§ 12, 13 lit. b und 14 VwVfG") == [
+        Reference("VwVfG", False, "12", None, None),
+        Reference("VwVfG", False, "13", None, None),
+        Reference("VwVfG", False, "14", None, None),
+    ]
+    # Several Absätze of one paragraph
+    assert extract_references("§ 823 Abs. 1 und 2 BGB") == [
+        Reference("BGB", False, "823", None, "1"),
+        Reference("BGB", False, "823", None, "2"),
+    ]
+    # Buchstaben, Halbsätze and Alternativen keep the law of the citation
+    for text, paragraph, absatz in [
+        ("§ 10 Abs. 1 Nr. 2 Buchstabe a EStG", "10", "1"),
+        ("§ 3 Nr. 1 lit. a EStG", "3", None),
+        ("§ 10 Abs. 1 S. 2 Halbsatz 2 EStG", "10", "1"),
+        ("§ 10 Abs. 1 Alt. 2 EStG", "10", "1"),
+    ]:
+        assert extract_references(text) == [Reference("EStG", False, paragraph, None, absatz)]
+    # A citation whose law cannot be attributed is not assigned to the citing law
+    assert extract_references("nach §§ 12, 13 Doppelbuchst. aa und 14 VwVfG") == []
+    assert extract_references("§ 10 Abs. 1 Nr. 2 Doppelbuchst. aa EStG") == []
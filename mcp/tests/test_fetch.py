@@ -0,0 +1,101 @@
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from fetch import FetchError, HttpFetcher
+from parser import LawLibrary, LawParser
+
+class LawServer(ThreadingHTTPServer):
+    """Local stand-in for raw.githubusercontent.com."""
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), LawHandler)
+        self.files = {}
+        self.fail_next = 0
+        self.requests = []
+
+class LawHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.path, self.headers.get('If-None-Match')))
+        if server.fail_next:
+            server.fail_next -= 1
+            return self.respond(503, b'')
+        body = server.files.get(self.path)
+        if body is None:
+            return self.respond(404, b'')
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if self.headers.get('If-None-Match') == etag:
+            return self.respond(304, b'')
+        self.respond(200, body, {'ETag': etag})
+
+    def respond(self, status, body, headers=None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def law_server(sample_law_markdown):
+    server = LawServer()
+    for code in ('testa', 'testb', 'testc'):
+        server.files[f'/{code[0]}/{code}/index.md'] = sample_law_markdown.replace("TestG", code.upper()).encode()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def test_fetch_retries_and_revalidates(law_server, tmp_path):
+    url = f'http://127.0.0.1:{law_server.server_port}/t/testa/index.md'
+    fetcher = HttpFetcher(cache_dir=tmp_path, backoff=0.01)
+
+    law_server.fail_next = 2
+    body = fetcher.fetch(url)
+    assert b"TESTA" in body
+    assert fetcher.stats["retries"] == 2
+
+    # A new fetcher with the same cache sends a conditional request
+    fetcher = HttpFetcher(cache_dir=tmp_path)
+    assert fetcher.fetch(url) == body
+    assert fetcher.stats["not_modified"] == 1
+    assert law_server.requests[-1][1] is not None
+
+    with pytest.raises(FetchError):
+        fetcher.fetch(f'http://127.0.0.1:{law_server.server_port}/x/missing/index.md')
+
+def test_load_laws_from_github_concurrently(law_server, tmp_path):
+    base_url = f'http://127.0.0.1:{law_server.server_port}'
+    codes = ['TESTA', 'TESTB', 'missing', 'TESTC']
+    with patch('parser.settings') as mock_settings:
+        mock_settings.min_paragraphs = 1
+        index_path = tmp_path / "index.sqlite"
+        lib = LawLibrary(index_path=index_path, fetcher=HttpFetcher(cache_dir=tmp_path / "http", max_workers=3))
+        assert lib.load_laws_from_github(codes, base_url=base_url) == ['TESTA', 'TESTB', 'TESTC']
+        assert set(lib.laws) == {'testa', 'testb', 'testc'}
+
+        # Restart: unchanged laws are revalidated and not parsed again
+        law_server.files['/t/testc/index.md'] = law_server.files['/t/testc/index.md'].replace(b"Scope", b"Changed")
+        fetcher = HttpFetcher(cache_dir=tmp_path / "http")
+        lib = LawLibrary(index_path=index_path, fetcher=fetcher)
+        parsed = []
+        original_init = LawParser.__init__
+        def counting_init(self, markdown):
+            parsed.append(markdown)
+            original_init(self, markdown)
+        with patch.object(LawParser, '__init__', counting_init):
+            lib.load_laws_from_github(codes, base_url=base_url)
+        assert len(parsed) == 1
+        assert fetcher.stats["not_modified"] == 2
+        assert lib.get('TESTC', '1')['name'] == 'Changed'
+        assert lib.get('TESTA', '1')['name'] == 'Scope'
@@ -0,0 +1,354 @@
+import json
+import tarfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from parser import LawLibrary, LawParser
+from unittest.mock import patch
+
+import pytest
+
+def write_law(folder, code, markdown):
+    law_dir = folder / code
+    law_dir.mkdir(parents=True, exist_ok=True)
+    (law_dir / "index.md").write_text(markdown)
+
+def test_index_restores_unchanged_laws(sample_law_markdown, tmp_path):
+    with patch('parser.settings') as mock_settings:
+        mock_settings.min_paragraphs = 1
+        folder = tmp_path / "gesetze"
+        write_law(folder, "testg", sample_law_markdown)
+        index_path = tmp_path / "index.sqlite"
+
+        lib = LawLibrary(index_path=index_path)
+        lib.load_laws_from_folder(folder)
+        expected = lib.get("TestG", "2")
+
+        with patch.object(LawParser, '__init__', side_effect=AssertionError("parsed again")):
+            restored = LawLibrary(index_path=index_path)
+            restored.load_laws_from_folder(folder)
+
+        assert restored.get("TestG", "2") == expected
+        assert restored.laws["testg"].full_title == "Test Law"
+        assert restored.search("Scope")[0]["paragraph"] == "1"
+
+def test_index_reparses_changed_and_drops_removed(sample_law_markdown, tmp_path):
+    with patch('parser.settings') as mock_settings:
+        mock_settings.min_paragraphs = 1
+        folder = tmp_path / "gesetze"
+        write_law(folder, "testg", sample_law_markdown)
+        write_law(folder, "other", sample_law_markdown.replace("TestG", "OtherG"))
+        index_path = tmp_path / "index.sqlite"
+
+        LawLibrary(index_path=index_path).load_laws_from_folder(folder)
+
+        write_law(folder, "testg", sample_law_markdown.replace("Scope", "Geltungsbereich"))
+        (folder / "other" / "index.md").unlink()
+
+        lib = LawLibrary(index_path=index_path)
+        lib.load_laws_from_folder(folder)
+
+        assert set(lib.laws) == {"testg"}
+        assert lib.laws["testg"].paragraphs["1"].name == "Geltungsbereich"
+        assert lib.search("Scope") == []
+        assert lib.search("Geltungsbereich")[0]["law"] == "testg"
+        assert lib.conn.execute("SELECT COUNT(*) FROM paragraphs").fetchone()[0] == 2
+
+def test_index_shared_between_folders(sample_law_markdown, tmp_path):
+    with patch('parser.settings') as mock_settings:
+        mock_settings.min_paragraphs = 1
+        index_path = tmp_path / "index.sqlite"
+        write_law(tmp_path / "a", "other", sample_law_markdown.replace("TestG", "OtherG"))
+        write_law(tmp_path / "b", "testg", sample_law_markdown)
+        LawLibrary(index_path=index_path).load_laws_from_folder(tmp_path / "a")
+
+        # Laws of the folder loaded before are not found anymore
+        lib = LawLibrary(index_path=index_path)
+        lib.load_laws_from_folder(tmp_path / "b")
+        assert set(lib.laws) == {"testg"}
+        assert [hit["law"] for hit in lib.search("Scope")] == ["testg"]
+        assert lib.conn.execute("SELECT COUNT(*) FROM paragraphs").fetchone()[0] == 2
+
+def test_index_rebuilds_when_min_paragraphs_changes(sample_law_markdown, tmp_path):
+    folder = tmp_path / "gesetze"
+    write_law(folder, "testg", sample_law_markdown)
+    index_path = tmp_path / "index.sqlite"
+
+    with patch('parser.settings') as mock_settings:
+        mock_settings.min_paragraphs = 5
+        lib = LawLibrary(index_path=index_path)
+        lib.load_laws_from_folder(folder)
+        assert lib.laws == {}
+
+    with patch('parser.settings') as mock_settings:
+        mock_settings.min_paragraphs = 1
+        lib = LawLibrary(index_path=index_path)
+        lib.load_laws_from_folder(folder)
+        assert "testg" in lib.laws
+
+def test_parallel_loading_matches_serial(sample_law_markdown, tmp_path):
+    with patch('parser.settings') as mock_settings:
+        mock_settings.min_paragraphs = 1
+        folder = tmp_path / "gesetze"
+        for i in range(6):
+            write_law(folder, f"law{i}", sample_law_markdown.replace("TestG", f"TestG{i}"))
+        # Duplicate jurabk and a law below min_paragraphs
+        write_law(folder, "dup", sample_law_markdown.replace("TestG", "TestG0").replace("Scope", "Duplicate"))
+        write_law(folder, "small", "---\nTitle: Small\nJurabk: SmallG\n---\n# § 1 Only\nText\n")
+
+        serial = LawLibrary()
+        serial.load_laws_from_folder(folder)
+        parallel = LawLibrary()
+        parallel.load_laws_from_folder(folder, workers=2)
+
+        assert list(parallel.laws) == list(serial.laws)
+        assert "smallg" not in parallel.laws
+        for code in serial.laws:
+            for p_id in serial.laws[code].paragraphs:
+                assert parallel.get(code, p_id) == serial.get(code, p_id)
+        assert parallel.search("Scope OR Duplicate") == serial.search("Scope OR Duplicate")
+
+def test_lazy_loading_with_lru(sample_law_markdown, tmp_path):
+    with patch('parser.settings') as mock_settings:
+        mock_settings.min_paragraphs = 1
+        folder = tmp_path / "gesetze"
+        for i in range(3):
+            write_law(folder, f"law{i}", sample_law_markdown.replace("TestG", f"TestG{i}"))
+        index_path = tmp_path / "index.sqlite"
+        LawLibrary(index_path=index_path).load_laws_from_folder(folder)
+
+        lib = LawLibrary(index_path=index_path, lazy=True, cache_size=2)
+        lib.load_laws_from_folder(folder)
+
+        # Only the catalog is loaded at startup
+        assert len(lib.laws) == 3
+        assert "testg1" in lib.laws
+        assert lib.law_cache_stats()["items"] == 0
+        assert {law["code"] for law in lib.get_available_laws()} == {"testg0", "testg1", "testg2"}
+
+        assert lib.get("TestG0", "2", "1")["text"] == " First absatz."
+        lib.get("TestG0", "1")
+        lib.get("TestG1", "1")
+        lib.get("TestG2", "1")
+        stats = lib.law_cache_stats()
+        assert stats["items"] == 2
+        assert stats["hits"] == 1
+        assert stats["misses"] == 3
+        assert stats["evictions"] == 1
+        assert lib.search("Scope", law_codes=["testg2"])[0]["law"] == "testg2"
+
+def test_lazy_loads_laws_in_parallel(sample_law_markdown, tmp_path):
+    with patch('parser.settings') as mock_settings:
+        mock_settings.min_paragraphs = 1
+        with pytest.raises(ValueError, match="index_path"):
+            LawLibrary(lazy=True)
+
+        folder = tmp_path / "gesetze"
+        for i in range(2):
+            write_law(folder, f"law{i}", sample_law_markdown.replace("TestG", f"TestG{i}"))
+        lib = LawLibrary(index_path=tmp_path / "index.sqlite", lazy=True)
+        lib.load_laws_from_folder(folder)
+
+        # Both loads have to be running at the same time to pass the barrier
+        barrier = threading.Barrier(2, timeout=5)
+        load = lib.laws.load
+        def wait_and_load(code):
+            barrier.wait()
+            return load(code)
+        lib.laws.load = wait_and_load
+        with ThreadPoolExecutor(2) as pool:
+            names = list(pool.map(lambda code: lib.get(code, "1")["name"], ["TestG0", "TestG1"]))
+        assert names == ["Scope", "Scope"]
+        assert lib.laws._loading == {}
+
+def test_lazy_cache_counts_paragraph_indexes(sample_law_markdown, tmp_path):
+    with patch('parser.settings') as mock_settings:
+        mock_settings.min_paragraphs = 1
+        folder = tmp_path / "gesetze"
+        write_law(folder, "testg", sample_law_markdown)
+        index_path = tmp_path / "index.sqlite"
+        LawLibrary(index_path=index_path).load_laws_from_folder(folder)
+
+        lib = LawLibrary(index_path=index_path, lazy=True)
+        lib.load_laws_from_folder(folder)
+        lib.get("TestG", "2")
+        size = lib.law_cache_stats()["bytes"]
+        assert size == lib.laws["testg"].memory_size()
+
+        # Building the Absatz index of § 2 grows the cached law
+        lib.get("TestG", "2", "1")
+        grown = lib.law_cache_stats()["bytes"]
+        assert grown > size
+        assert grown == lib.laws["testg"].memory_size()
+        lib.get("TestG", "2", "2")
+        assert lib.law_cache_stats()["bytes"] == grown
+
+def test_reload_folder(sample_law_markdown, tmp_path):
+    with patch('parser.settings') as mock_settings:
+        mock_settings.min_paragraphs = 1
+        folder = tmp_path / "gesetze"
+        write_law(folder, "testg", sample_law_markdown)
+        write_law(folder, "other", sample_law_markdown.replace("TestG", "OtherG"))
+        lib = LawLibrary(index_path=tmp_path / "index.sqlite")
+        lib.load_laws_from_folder(folder)
+        before = lib.search_json("Scope")
+
+        assert lib.reload_folder(folder)["changed"] == 0
+
+        write_law(folder, "testg", sample_law_markdown.replace("Scope", "Geltungsbereich"))
+        write_law(folder, "new", sample_law_markdown.replace("TestG", "NewG"))
+        (folder / "other" / "index.md").unlink()
+        parsed = []
+        original_init = LawParser.__init__
+        def counting_init(self, markdown):
+            parsed.append(markdown)
+            original_init(self, markdown)
+        with patch.object(LawParser, '__init__', counting_init):
+            stats = lib.reload_folder(folder)
+
+        assert len(parsed) == 2
+        assert stats["changed"] == 2 and stats["removed"] == 1
+        assert set(lib.laws) == {"testg", "newg"}
+        assert lib.get("TestG", "1")["name"] == "Geltungsbereich"
+        assert {r["law"] for r in lib.search("Geltungsbereich OR Scope")} == {"testg", "newg"}
+        assert lib.search_json("Scope") != before
+        assert lib.resolve_law("NewG") == "newg"
+        assert lib.reload_stats["reloads"] == 2
+
+def test_watch_folder(sample_law_markdown, tmp_path):
+    with patch('parser.settings') as mock_settings:
+        mock_settings.min_paragraphs = 1
+        folder = tmp_path / "gesetze"
+        write_law(folder, "testg", sample_law_markdown)
+        lib = LawLibrary()
+        lib.load_laws_from_folder(folder)
+
+        lib.watch_folder(folder, interval=0.01)
+        try:
+            write_law(folder, "new", sample_law_markdown.replace("TestG", "NewG"))
+            deadline = time.time() + 5
+            while "newg" not in lib.laws and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            lib.stop_watching()
+        assert lib.get("NewG", "1")["name"] == "Scope"
+
+def test_read_only_index(sample_law_markdown, tmp_path):
+    with patch('parser.settings') as mock_settings:
+        mock_settings.min_paragraphs = 1
+        folder = tmp_path / "gesetze"
+        write_law(folder, "testg", sample_law_markdown)
+        index_path = tmp_path / "index.sqlite"
+        writer = LawLibrary(index_path=index_path, search_mode='german')
+        writer.load_laws_from_folder(folder)
+        expected = writer.get("TestG", "2")
+
+        lib = LawLibrary(index_path=index_path, read_only=True, readers=2, lazy=True)
+        lib.load_index()
+        assert lib.search_mode == 'german'
+        assert lib.get("TestG", "2") == expected
+
+        # Queries of concurrent threads use separate reader connections
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda _: lib.search_json("Scope"), range(8)))
+        assert len(set(results)) == 1
+        assert json.loads(results[0])[0]["paragraph"] == "1"
+
+        with pytest.raises(RuntimeError):
+            lib.load_laws_from_folder(folder)
+        with pytest.raises(RuntimeError):
+            lib.reload_folder(folder)
+
+        # Readers see laws committed by the writer process after they opened
+        write_law(folder, "other", sample_law_markdown.replace("TestG", "OtherG"))
+        writer.reload_folder(folder)
+        assert lib.search("Scope", law_codes=["otherg"])[0]["law"] == "otherg"
+
+        # Immutable readers ignore the WAL, it has to be checkpointed into the file
+        writer.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        immutable = LawLibrary(index_path=index_path, read_only=True, immutable=True)
+        # Read-only libraries always query through a reader pool
+        assert len(immutable.connections()) == 2
+        immutable.load_index()
+        assert sorted(immutable.catalog) == ["otherg", "testg"]
+
+        with pytest.raises(ValueError):
+            LawLibrary(index_path=tmp_path / "missing.sqlite", read_only=True)
+
+def test_load_laws_from_archive(sample_law_markdown, tmp_path):
+    with patch('parser.settings') as mock_settings:
+        mock_settings.min_paragraphs = 1
+        folder = tmp_path / "gesetze"
+        write_law(folder, "testg", sample_law_markdown)
+        write_law(folder, "other", sample_law_markdown.replace("TestG", "OtherG"))
+        expected = LawLibrary()
+        expected.load_laws_from_folder(folder)
+
+        zip_path = tmp_path / "gesetze.zip"
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            for path in sorted(folder.glob("**/index.md")):
+                zf.write(path, path.relative_to(tmp_path))
+        tar_path = tmp_path / "gesetze.tar.gz"
+        with tarfile.open(tar_path, "w:gz") as tf:
+            tf.add(folder, arcname=".")
+
+        index_path = tmp_path / "index.sqlite"
+        for archive_path in (zip_path, tar_path):
+            lib = LawLibrary(index_path=index_path)
+            lib.load_laws_from_archive(archive_path)
+            assert sorted(lib.catalog) == ["otherg", "testg"]
+            assert lib.get("OtherG", "2") == expected.get("OtherG", "2")
+            assert lib.catalog["testg"].source.startswith(f"{archive_path}!")
+
+        # Unchanged members are restored from the index
+        with patch.object(LawParser, '__init__', side_effect=AssertionError("parsed again")):
+            restored = LawLibrary(index_path=index_path)
+            restored.load_laws_from_archive(tar_path)
+        assert restored.search("Scope", law_codes=["otherg"])[0]["law"] == "otherg"
+
+        # Changed members are parsed again, removed ones dropped
+        with tarfile.open(tar_path, "w:gz") as tf:
+            write_law(folder, "testg", sample_law_markdown.replace("Scope", "Geltungsbereich"))
+            tf.add(folder / "testg", arcname="testg")
+        lib = LawLibrary(index_path=index_path)
+        lib.load_laws_from_archive(tar_path)
+        assert list(lib.catalog) == ["testg"]
+        assert lib.get("TestG", "1")["name"] == "Geltungsbereich"
+
+def test_responses_computed_concurrently_with_reload_lock(sample_law_markdown, tmp_path):
+    with patch('parser.settings') as mock_settings:
+        mock_settings.min_paragraphs = 1
+        folder = tmp_path / "gesetze"
+        write_law(folder, "testg", sample_law_markdown)
+        lib = LawLibrary(index_path=tmp_path / "index.sqlite")
+        lib.load_laws_from_folder(folder)
+
+        # A slow search does not hold up other tool calls of a writable library
+        started, release = threading.Event(), threading.Event()
+        def slow_search(*args, **kwargs):
+            started.set()
+            assert release.wait(5)
+            return []
+        with patch.object(lib, 'search', slow_search), ThreadPoolExecutor(2) as pool:
+            search = pool.submit(lib.search_json, "Scope")
+            assert started.wait(5)
+            assert json.loads(lib.get_json("TestG", "1"))["name"] == "Scope"
+
+            # A reload waits for responses being computed
+            write_law(folder, "testg", sample_law_markdown.replace("Scope", "Geltungsbereich"))
+            reload = pool.submit(lib.reload_folder, folder)
+            time.sleep(0.2)
+            assert not reload.done()
+            release.set()
+            assert search.result(5) == "[]"
+            assert reload.result(5)["changed"] == 1
+        assert json.loads(lib.get_json("TestG", "1"))["name"] == "Geltungsbereich"
+
+        # Library statistics wait while a reload changes the catalog
+        with ThreadPoolExecutor(1) as pool:
+            with lib._lock.write():
+                stats = pool.submit(lib.stats)
+                time.sleep(0.2)
+                assert not stats.done()
+            assert stats.result(5)["laws"] == 1
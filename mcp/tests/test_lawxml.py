@@ -0,0 +1,225 @@
+import io
+import zipfile
+from parser import LawLibrary, LawParser
+from unittest.mock import patch
+
+from lawxml import markdown_lines
+
+LAW_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE dokumente SYSTEM "http://www.gesetze-im-internet.de/dtd/1.01/gii-norm.dtd">
+<dokumente builddate="20240101000000" doknr="BJNR000010000">
+  <norm builddate="20240101000000" doknr="BJNR000010000">
+    <metadaten>
+      <jurabk>TestG</jurabk>
+      <ausfertigung-datum manuell="ja">2000-01-01</ausfertigung-datum>
+      <langue>Gesetz über Tests
+        und Prüfungen</langue>
+    </metadaten>
+    <textdaten>
+      <text format="XML"><Content><P>Vorbemerkung, die zu keinem Paragraphen gehört.</P></Content></text>
+    </textdaten>
+  </norm>
+  <norm doknr="BJNR000010000BJNE000100000">
+    <metadaten>
+      <jurabk>TestG</jurabk>
+      <enbez>Eingangsformel</enbez>
+    </metadaten>
+    <textdaten><text format="XML"><Content><P>Der Bundestag hat das folgende Gesetz beschlossen:</P></Content></text></textdaten>
+  </norm>
+  <norm doknr="BJNR000010000BJNG000100000">
+    <metadaten>
+      <jurabk>TestG</jurabk>
+      <gliederungseinheit>
+        <gliederungskennzahl>010</gliederungskennzahl>
+        <gliederungsbez>Abschnitt 1</gliederungsbez>
+        <gliederungstitel>Allgemeines</gliederungstitel>
+      </gliederungseinheit>
+    </metadaten>
+  </norm>
+  <norm doknr="BJNR000010000BJNE000200000">
+    <metadaten>
+      <jurabk>TestG</jurabk>
+      <enbez>§ 1</enbez>
+      <titel format="parat">Zweck<FnR ID="F1"/></titel>
+    </metadaten>
+    <textdaten>
+      <text format="XML">
+        <Content>
+          <P>(1) Dieses Gesetz regelt <B>Tests</B> nach § 3.</P>
+          <P>(2) Es gilt nicht für Prüfungen. Näheres regelt Absatz 1.</P>
+        </Content>
+      </text>
+      <fussnoten><Content><P>Fußnote, die nicht übernommen wird.</P></Content></fussnoten>
+    </textdaten>
+  </norm>
+  <norm doknr="BJNR000010000BJNG000200000">
+    <metadaten>
+      <jurabk>TestG</jurabk>
+      <gliederungseinheit>
+        <gliederungskennzahl>010010</gliederungskennzahl>
+        <gliederungsbez>Titel 1</gliederungsbez>
+        <gliederungstitel>Pflichten</gliederungstitel>
+      </gliederungseinheit>
+    </metadaten>
+  </norm>
+  <norm doknr="BJNR000010000BJNE000300000">
+    <metadaten>
+      <jurabk>TestG</jurabk>
+      <enbez>§ 2a</enbez>
+      <titel format="parat">Ordnungswidrigkeiten</titel>
+    </metadaten>
+    <textdaten>
+      <text format="XML">
+        <Content>
+          <P>(1) Ordnungswidrig handelt, wer
+            <DL Font="normal" Type="arabic">
+              <DT>1.</DT><DD Font="normal"><LA Size="normal">entgegen § 1 prüft,</LA></DD>
+              <DT>2.</DT><DD Font="normal"><LA Size="normal">eine Meldung
+                <DL Font="normal" Type="alpha">
+                  <DT>a)</DT><DD Font="normal"><LA Size="normal">nicht,</LA></DD>
+                  <DT>b)</DT><DD Font="normal"><LA Size="normal">nicht rechtzeitig</LA></DD>
+                </DL>
+              erstattet.</LA></DD>
+            </DL>
+          </P>
+          <P>(2) Die Geldbuße beträgt bis zu 10<SUP>3</SUP> Euro.<BR/>Satz 1 gilt entsprechend.</P>
+        </Content>
+      </text>
+    </textdaten>
+  </norm>
+  <norm doknr="BJNR000010000BJNG000300000">
+    <metadaten>
+      <jurabk>TestG</jurabk>
+      <gliederungseinheit>
+        <gliederungskennzahl>020</gliederungskennzahl>
+        <gliederungsbez>Abschnitt 2</gliederungsbez>
+        <gliederungstitel>Schlussvorschriften</gliederungstitel>
+      </gliederungseinheit>
+    </metadaten>
+  </norm>
+  <norm doknr="BJNR000010000BJNE000400000">
+    <metadaten>
+      <jurabk>TestG</jurabk>
+      <enbez>§ 3</enbez>
+      <titel format="parat">Inkrafttreten</titel>
+    </metadaten>
+    <textdaten>
+      <text format="XML"><Content><P>Dieses Gesetz tritt am Tag nach der Verkündung in Kraft.</P></Content></text>
+    </textdaten>
+  </norm>
+</dokumente>
+"""
+
+# The same law as converted by lawdown.py
+LAW_MARKDOWN = """---
+Title: Gesetz über Tests und Prüfungen
+jurabk: TestG
+---
+
+# Gesetz über Tests und Prüfungen (TestG)
+
+## Eingangsformel
+
+Der Bundestag hat das folgende Gesetz beschlossen:
+
+## Abschnitt 1 - Allgemeines
+
+### § 1 Zweck
+
+(1) Dieses Gesetz regelt Tests nach § 3.
+
+(2) Es gilt nicht für Prüfungen. Näheres regelt Absatz 1.
+
+### Titel 1 - Pflichten
+
+#### § 2a Ordnungswidrigkeiten
+
+(1) Ordnungswidrig handelt, wer
+1.  entgegen § 1 prüft,
+2.  eine Meldung
+    a)  nicht,
+    b)  nicht rechtzeitig
+    erstattet.
+
+(2) Die Geldbuße beträgt bis zu 103 Euro.
+Satz 1 gilt entsprechend.
+
+## Abschnitt 2 - Schlussvorschriften
+
+### § 3 Inkrafttreten
+
+Dieses Gesetz tritt am Tag nach der Verkündung in Kraft.
+
+"""
+
+def write_xml_zip(path, xml, member="BJNR000010000.xml"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr(member, xml)
+
+def test_markdown_lines():
+    # The text of the first norm and the footnotes are left out
+    assert list(markdown_lines(io.BytesIO(LAW_XML.encode("utf-8")))) == LAW_MARKDOWN.splitlines()
+
+def test_xml_matches_markdown(tmp_path):
+    with patch('parser.settings') as mock_settings:
+        mock_settings.min_paragraphs = 1
+        law_dir = tmp_path / "gesetze" / "testg"
+        law_dir.mkdir(parents=True)
+        (law_dir / "index.md").write_text(LAW_MARKDOWN)
+        expected = LawLibrary()
+        expected.load_laws_from_folder(tmp_path / "gesetze")
+
+        write_xml_zip(tmp_path / "xml" / "t" / "testg" / "xml.zip", LAW_XML)
+        lib = LawLibrary()
+        lib.load_laws_from_xml(tmp_path / "xml")
+
+        assert list(lib.catalog) == ["testg"]
+        law, markdown_law = lib.laws["testg"], expected.laws["testg"]
+        assert (law.short_title, law.full_title) == ("TestG", "Gesetz über Tests und Prüfungen")
+        assert list(law.paragraphs) == ["1", "2a", "3"]
+        for p_id in law.paragraphs:
+            assert lib.get("TestG", p_id) == expected.get("TestG", p_id)
+            assert law.paragraphs[p_id].absaetze == markdown_law.paragraphs[p_id].absaetze
+        assert law.sections == markdown_law.sections
+        assert [(s.title, s.start, s.end) for s in law.sections] == [
+            ("Eingangsformel", 0, 0),
+            ("Abschnitt 1 - Allgemeines", 0, 2),
+            ("Titel 1 - Pflichten", 1, 2),
+            ("Abschnitt 2 - Schlussvorschriften", 2, 3),
+        ]
+        assert lib.get("TestG", "2a", "1", nummer_id="2")["text"].split() == [
+            "eine", "Meldung", "a)", "nicht,", "b)", "nicht", "rechtzeitig", "erstattet."
+        ]
+        assert lib.search("Geldbuße")[0]["paragraph"] == "2a"
+
+def test_load_laws_from_xml_index(tmp_path):
+    with patch('parser.settings') as mock_settings:
+        mock_settings.min_paragraphs = 1
+        folder = tmp_path / "laws"
+        write_xml_zip(folder / "t" / "testg" / "xml.zip", LAW_XML)
+        # Extracted by lawde.py
+        (folder / "o" / "otherg").mkdir(parents=True)
+        (folder / "o" / "otherg" / "BJNR000020000.xml").write_text(LAW_XML.replace("TestG", "OtherG"))
+        index_path = tmp_path / "index.sqlite"
+
+        lib = LawLibrary(index_path=index_path)
+        lib.load_laws_from_xml(folder)
+        assert sorted(lib.catalog) == ["otherg", "testg"]
+        assert lib.catalog["testg"].source == f"{folder / 't' / 'testg' / 'xml.zip'}!BJNR000010000.xml"
+
+        # Unchanged files are restored from the index
+        with patch.object(LawParser, '__init__', side_effect=AssertionError("parsed again")):
+            restored = LawLibrary(index_path=index_path)
+            restored.load_laws_from_xml(folder)
+        assert restored.get("OtherG", "3") == lib.get("OtherG", "3")
+        assert restored.laws["testg"].sections == lib.laws["testg"].sections
+
+        # Removed files are dropped, a single zip can be loaded on its own
+        (folder / "o" / "otherg" / "BJNR000020000.xml").unlink()
+        lib = LawLibrary(index_path=index_path)
+        lib.load_laws_from_xml(folder)
+        assert list(lib.catalog) == ["testg"]
+        single = LawLibrary()
+        single.load_laws_from_xml(folder / "t" / "testg" / "xml.zip")
+        assert list(single.catalog) == ["testg"]
@@ -1,6 +1,16 @@
-from parser import LawLibrary
+from parser import LawLibrary, SearchTimeout
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from unittest.mock import patch
+import itertools
 import json
+import sqlite3
+import threading
+import time
+
+import pytest
+
+import index
 
 def test_library_load(sample_law_markdown):
     with patch('parser.settings') as mock_settings:
@@ -36,6 +46,45 @@ def test_get_available_laws(sample_law_markdown):
         assert laws[0]["code"] == "testg"
         assert laws[0]["title"] == "Test Law"
 
+def test_list_laws_pages(sample_law_markdown):
+    with patch('parser.settings') as mock_settings:
+        mock_settings.min_paragraphs = 1
+        lib = LawLibrary()
+        for i in range(25):
+            lib._load_law_from_markdown(
+                sample_law_markdown.replace("TestG", f"G{i:02d}").replace("Test Law", f"Gesetz Nr. {i}"),
+                source=f"g{i}"
+            )
+        lib._load_law_from_markdown(sample_law_markdown.replace("TestG", "SGB 5").replace(
+            "Test Law", "Sozialgesetzbuch Fünftes Buch"), source="sgb5")
+
+        codes = []
+        cursor = None
+        while True:
+            page = lib.list_laws(cursor=cursor, limit=10)
+            assert page["total"] == 26
+            codes += [law["code"] for law in page["laws"]]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert codes == sorted(lib.catalog)
+        assert len(codes) == 26
+
+        # Prefix on codes and titles, case-insensitive
+        assert [law["code"] for law in lib.list_laws(prefix="g1")["laws"]] == [f"g{i}" for i in range(10, 20)]
+        assert lib.list_laws(prefix="sozialgesetz")["laws"] == [{"code": "sgb 5", "title": "Sozialgesetzbuch Fünftes Buch"}]
+        page = lib.list_laws(prefix="Gesetz Nr. 2", limit=3)
+        assert [law["code"] for law in page["laws"]] == ["g02", "g20", "g21"]
+        assert page["total"] == 6
+        assert [law["code"] for law in lib.list_laws(prefix="Gesetz Nr. 2", cursor=page["next_cursor"])["laws"]] == \
+            ["g22", "g23", "g24"]
+        assert lib.list_laws(prefix="xyz") == {"laws": [], "total": 0, "next_cursor": None}
+
+        # The sorted catalog follows added laws
+        lib._load_law_from_markdown(sample_law_markdown.replace("TestG", "AAG"), source="aag")
+        assert lib.list_laws(limit=1)["laws"][0]["code"] == "aag"
+        assert json.loads(lib.list_laws_json(limit=1))["next_cursor"] == "aag"
+
 def test_get_json(sample_law_markdown):
     with patch('parser.settings') as mock_settings:
         mock_settings.min_paragraphs = 1
@@ -47,3 +96,310 @@ def test_get_json(sample_law_markdown):
         assert data["law"] == "TestG"
         assert data["paragraph"] == "1"
         assert "Scope" in data["name"]
+
+def test_bulk_ingest(sample_law_markdown):
+    with patch('parser.settings') as mock_settings:
+        mock_settings.min_paragraphs = 1
+        lib = LawLibrary()
+        with lib.bulk_ingest(batch_size=3):
+            for i in range(5):
+                lib._load_law_from_markdown(sample_law_markdown.replace("TestG", f"TestG{i}"))
+            # Loading the same law again replaces its rows
+            lib._load_law_from_markdown(sample_law_markdown.replace("TestG", "TestG0"))
+
+        assert len(lib.laws) == 5
+        assert lib.ingest_stats["rows"] == 12
+        assert lib.conn.execute("SELECT COUNT(*) FROM paragraphs").fetchone()[0] == 10
+        results = lib.search("Scope")
+        assert sorted(r["law"] for r in results) == [f"testg{i}" for i in range(5)]
+
+        # Per-law loading still works after the bulk ingest
+        lib._load_law_from_markdown(sample_law_markdown)
+        assert len(lib.search("Scope")) == 6
+
+def test_search_filter_and_paging(sample_law_markdown):
+    with patch('parser.settings') as mock_settings:
+        mock_settings.min_paragraphs = 1
+        lib = LawLibrary()
+        with lib.bulk_ingest():
+            for i in range(25):
+                lib._load_law_from_markdown(sample_law_markdown.replace("TestG", f"TestG{i}"))
+
+        # The filter is applied in the query, not on the global top 20
+        results = lib.search("Scope", law_codes=["TESTG24"])
+        assert [r["law"] for r in results] == ["testg24"]
+        assert lib.search("Scope", law_codes=["unknown"]) == []
+
+        first = lib.search("Scope", limit=10)
+        rest = lib.search("Scope", limit=10, offset=20)
+        assert len(first) == 10
+        assert len(rest) == 5
+        assert not {r["law"] for r in first} & {r["law"] for r in rest}
+
+        filtered = lib.search("Scope OR absatz", law_codes=["testg3", "testg7"], limit=3, offset=1)
+        assert len(filtered) == 3
+        assert {r["law"] for r in filtered} <= {"testg3", "testg7"}
+
+def test_time_budget_interrupts_queries():
+    conn = sqlite3.connect(":memory:")
+    endless = "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c) SELECT count(*) FROM c"
+    with index.time_budget(conn, 0.05) as expired:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute(endless).fetchone()
+        assert expired()
+    # The handler is removed afterwards
+    assert conn.execute("SELECT count(*) FROM (WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 100000) SELECT x FROM c)").fetchone() == (100000,)
+    with index.time_budget(conn, None) as expired:
+        assert not expired()
+
+def test_search_timeout(sample_law_markdown):
+    with patch('parser.settings') as mock_settings:
+        mock_settings.min_paragraphs = 1
+        lib = LawLibrary()
+        with lib.bulk_ingest():
+            for i in range(25):
+                lib._load_law_from_markdown(sample_law_markdown.replace("TestG", f"TestG{i}"))
+
+        query = "s* OR t* OR a* OR f*"
+        assert len(lib.search(query, timeout=60)) == 20
+
+        # A clock advancing one second per reading exhausts any budget at the first check
+        with patch('index.time') as mock_time, patch('index.PROGRESS_INTERVAL', 1):
+            mock_time.monotonic.side_effect = itertools.count()
+            with pytest.raises(SearchTimeout) as timeout:
+                lib.search(query, timeout=0.5)
+            assert timeout.value.results == []
+            with pytest.raises(SearchTimeout) as timeout:
+                lib.search(query, law_codes=["testg3", "testg7"], timeout=0.5)
+            assert timeout.value.results == []
+
+            response = json.loads(lib.search_json(query, timeout=0.5))
+            assert "stopped after 0.5 s" in response["error"]
+            assert response["results"] == []
+        assert lib.stats()["search_timeouts"] == 1
+        assert lib.search_errors == 0
+
+        # Timed out responses are not cached
+        assert len(json.loads(lib.search_json(query, timeout=0.5))) == 20
+
+def test_search_name_weight(sample_law_markdown):
+    with patch('parser.settings') as mock_settings:
+        mock_settings.min_paragraphs = 1
+        lib = LawLibrary()
+        lib._load_law_from_markdown(sample_law_markdown.replace("# § 2 Details", "# § 2 Details paragraph"))
+
+        by_name = lib.search("paragraph", name_weight=10.0, content_weight=1.0)
+        by_content = lib.search("paragraph", name_weight=0.1, content_weight=1.0)
+        assert by_name[0]["paragraph"] == "2"
+        assert by_content[0]["paragraph"] == "1"
+
+def test_response_cache(sample_law_markdown):
+    with patch('parser.settings') as mock_settings:
+        mock_settings.min_paragraphs = 1
+        lib = LawLibrary(compact_json=True)
+        lib._load_law_from_markdown(sample_law_markdown)
+
+        first = lib.get_json("TestG", "2", "1")
+        assert lib.get_json(" testg ", "2", "1") is first
+        assert "\n  " not in first
+        assert json.loads(first)["text"] == " First absatz."
+
+        laws = lib.get_available_laws_json()
+        assert json.loads(laws) == [{"code": "testg", "title": "Test Law"}]
+        assert json.loads(lib.search_json("Scope", ["TestG"]))[0]["paragraph"] == "1"
+        assert lib.search_json("Scope", ["testg"]) is lib.search_json("Scope", ["TESTG"])
+
+        stats = lib.cache_stats()["responses"]
+        assert stats["hits"] == 3
+        assert stats["misses"] == 3
+
+        # Loading a law invalidates cached responses
+        lib._load_law_from_markdown(sample_law_markdown.replace("TestG", "OtherG"))
+        assert len(json.loads(lib.get_available_laws_json())) == 2
+
+def test_get_many(sample_law_markdown):
+    with patch('parser.settings') as mock_settings:
+        mock_settings.min_paragraphs = 1
+        lib = LawLibrary()
+        lib._load_law_from_markdown(sample_law_markdown.replace("# § 2 Details", """# § 9b Nine b
+Text 9b.
+
+# § 10 Ten
+Text 10.
+
+# § 9 Nine
+Text 9.
+
+# § 2 Details"""))
+
+        items = lib.get_many(["§§ 2-10 TestG", "§ 2 Abs. 3", "TestG § 99", "§ 1 UnknownG", "kein Zitat"], default_law="TestG")
+        assert [p["paragraph"] for p in items[0]["paragraphs"]] == ["2", "9", "9b", "10"]
+        assert items[1]["paragraphs"][0]["text"] == " Third absatz with marker."
+        assert "not found" in items[2]["error"]
+        assert "not available" in items[3]["error"]
+        assert "Could not parse" in items[4]["error"]
+
+        items = lib.get_many(["§§ 1-10 TestG", "§ 1 TestG"], max_paragraphs=3)
+        assert len(items[0]["paragraphs"]) == 3
+        assert items[0]["truncated"]
+        assert items[1]["paragraphs"] == []
+        assert json.loads(lib.get_many_json(["§ 1 TestG"]))[0]["paragraphs"][0]["name"] == "Scope"
+
+REFERRING_LAW = """---
+Title: Referring Law
+Jurabk: RefG
+---
+
+# § 1 Start
+Es gilt § 2 Abs. 1 und § 1 des Testgesetzes.
+
+# § 2 Middle
+Siehe §§ 3 bis 4 sowie § 2 TestG.
+
+# § 3 End
+Kein Verweis.
+
+# § 4 Other
+Siehe § 9 UnknownG.
+"""
+
+def test_reference_graph(sample_law_markdown, tmp_path):
+    with patch('parser.settings') as mock_settings:
+        mock_settings.min_paragraphs = 1
+        lib = LawLibrary(index_path=tmp_path / "index.sqlite")
+        lib._load_law_from_markdown(REFERRING_LAW)
+        lib._load_law_from_markdown(sample_law_markdown.replace("Title: Test Law", "Title: Testgesetz"))
+
+        # The title reference is resolved once TestG is loaded
+        assert lib.references("RefG", "1") == [
+            {"law": "refg", "paragraph": "2", "end": None, "absatz": "1"},
+            {"law": "testg", "paragraph": "1", "end": None, "absatz": None},
+        ]
+        assert lib.cited_by("TestG", "2") == [{"law": "refg", "paragraph": "2", "absatz": None}]
+        assert lib.cited_by("RefG", "4") == [{"law": "refg", "paragraph": "2", "absatz": None}]
+
+        graph = lib.reference_graph("RefG", "1", depth=2)
+        reached = {(p["law"], p["paragraph"]): p["depth"] for p in graph["paragraphs"]}
+        assert reached == {("RefG", "1"): 0, ("RefG", "2"): 1, ("TestG", "1"): 1,
+                           ("RefG", "3"): 2, ("RefG", "4"): 2, ("TestG", "2"): 2}
+        assert {"from": "§ 1 RefG", "to": "§ 2 RefG", "absatz": "1"} in graph["edges"]
+        assert not graph["truncated"]
+
+        assert len(lib.reference_graph("RefG", "1", depth=1)["paragraphs"]) == 3
+        limited = lib.reference_graph("RefG", "1", max_paragraphs=2)
+        assert len(limited["paragraphs"]) == 2 and limited["truncated"]
+
+        cited = lib.reference_graph("TestG", "2", direction="in", include_text=False)
+        assert [(p["law"], p["paragraph"]) for p in cited["paragraphs"]] == [("TestG", "2"), ("RefG", "2"), ("RefG", "1")]
+
+        # Edges are persisted and replaced when their law is reloaded
+        restored = LawLibrary(index_path=tmp_path / "index.sqlite")
+        assert restored.conn.execute("SELECT COUNT(*) FROM refs").fetchone()[0] == 5
+        lib._load_law_from_markdown(REFERRING_LAW.replace("Siehe §§ 3 bis 4 sowie § 2 TestG.", "Kein Verweis."))
+        assert lib.conn.execute("SELECT COUNT(*) FROM refs").fetchone()[0] == 3
+        assert lib.cited_by("TestG", "2") == []
+
+COMPOUND_LAW = """---
+Title: Compound Law
+Jurabk: CompG
+---
+
+# § 1 Schadensersatzanspruch
+Der Schadensersatzanspruch verjährt nach drei Jahren.
+
+# § 2 Kündigung
+Die Kündigung der Verträge bedarf der Schriftform.
+"""
+
+def test_search_modes(tmp_path):
+    with patch('parser.settings') as mock_settings:
+        mock_settings.min_paragraphs = 1
+        index_path = tmp_path / "index.sqlite"
+        lib = LawLibrary(index_path=index_path)
+        lib._load_law_from_markdown(COMPOUND_LAW)
+        assert lib.search("Schadensersatz") == []
+        assert lib.search("Kündigungen") == []
+
+        german = LawLibrary(index_path=index_path, search_mode="german")
+        german._load_law_from_markdown(COMPOUND_LAW)
+        assert [r["paragraph"] for r in german.search("Schadensersatz")] == ["1"]
+        assert [r["paragraph"] for r in german.search("Kündigungen AND Vertrag")] == ["2"]
+        assert [r["paragraph"] for r in german.search('"der Vertrage"')] == ["2"]
+
+        # Switching the mode rebuilds the FTS index from the stored paragraphs
+        trigram = LawLibrary(index_path=index_path, search_mode="trigram")
+        assert [r["paragraph"] for r in trigram.search("ersatz")] == ["1"]
+        assert {r["paragraph"] for r in trigram.search("ündig OR jähr")} == {"1", "2"}
+
+def test_table_of_contents_and_sections(outline_law_markdown, tmp_path):
+    with patch('parser.settings') as mock_settings:
+        mock_settings.min_paragraphs = 1
+        folder = tmp_path / "gesetze" / "gliedg"
+        folder.mkdir(parents=True)
+        (folder / "index.md").write_text(outline_law_markdown)
+        index_path = tmp_path / "index.sqlite"
+        LawLibrary(index_path=index_path).load_laws_from_folder(tmp_path / "gesetze")
+
+        # Restored from the index without parsing the law again
+        lib = LawLibrary(index_path=index_path, lazy=True)
+        lib.load_laws_from_folder(tmp_path / "gesetze")
+        toc = lib.table_of_contents("GliedG", depth=1)
+        assert toc["law"] == "GliedG"
+        assert [(s["id"], s["count"], s.get("subsections")) for s in toc["sections"]] == [("1", 3, 2), ("2", 2, 2)]
+        assert lib.table_of_contents("gliedg", "Buch 2")["section"] == {"id": "2", "title": "Buch 2 - Schuldrecht"}
+
+        section = lib.get_section("GliedG", "Buch 2 > Abschnitt 1", max_paragraphs=1)
+        assert section["section"] == {
+            "id": "2.1", "title": "Abschnitt 1 - Inhalt", "path": ["Buch 2 - Schuldrecht", "Abschnitt 1 - Inhalt"]
+        }
+        assert [p["paragraph"] for p in section["paragraphs"]] == ["5"]
+        assert (section["total"], section["next_offset"]) == (2, 1)
+        section = json.loads(lib.get_section_json("GliedG", "2.1", offset=1, max_paragraphs=1))
+        assert section["paragraphs"][0]["name"] == "Begriff" and section["next_offset"] is None
+
+        with pytest.raises(KeyError, match="ambiguous"):
+            lib.get_section("GliedG", "Abschnitt 1")
+        for section in ("", " > "):
+            with pytest.raises(KeyError, match="not found"):
+                lib.get_section("GliedG", section)
+        # An empty section lists the whole law
+        assert json.loads(lib.table_of_contents_json("GliedG", "", depth=1))["sections"] == toc["sections"]
+
+def test_slow_search_does_not_delay_other_calls(sample_law_markdown, tmp_path):
+    with patch('parser.settings') as mock_settings:
+        mock_settings.min_paragraphs = 1
+        law_dir = tmp_path / "gesetze" / "testg"
+        law_dir.mkdir(parents=True)
+        (law_dir / "index.md").write_text(sample_law_markdown)
+        # The default configuration: a writable index file, laws kept in memory
+        lib = LawLibrary(index_path=tmp_path / "index.sqlite")
+        lib.load_laws_from_folder(tmp_path / "gesetze")
+
+        # A search stuck in its query holds the main connection and its time budget
+        started, release = threading.Event(), threading.Event()
+        budgets = []
+        time_budget = index.time_budget
+        @contextmanager
+        def slow_budget(conn, seconds):
+            with time_budget(conn, seconds) as expired:
+                budgets.append(seconds)
+                if len(budgets) == 1:
+                    started.set()
+                    assert release.wait(5)
+                yield expired
+
+        with patch('index.time_budget', slow_budget), ThreadPoolExecutor(2) as pool:
+            slow = pool.submit(lib.search_json, "Scope", timeout=30)
+            assert started.wait(5)
+            start = time.perf_counter()
+            assert json.loads(lib.get_json("TestG", "1"))["name"] == "Scope"
+            assert time.perf_counter() - start < 1
+
+            # Other searches wait for the connection instead of replacing its progress handler
+            other = pool.submit(lib.search_json, "Details", timeout=0.5)
+            time.sleep(0.2)
+            assert not other.done() and budgets == [30]
+            release.set()
+            assert json.loads(slow.result(5))[0]["paragraph"] == "1"
+            assert json.loads(other.result(5))[0]["paragraph"] == "2"
+            assert budgets == [30, 0.5]
@@ -0,0 +1,55 @@
+from unittest.mock import patch
+
+import pytest
+
+from matcher import LawMatcher
+from parser import LawLibrary
+
+LAWS = [
+    ("bgb", "BGB", "Bürgerliches Gesetzbuch"),
+    ("hgb", "HGB", "Handelsgesetzbuch"),
+    ("sgb 5", "SGB 5", "Sozialgesetzbuch (SGB) Fünftes Buch (V) - Gesetzliche Krankenversicherung"),
+    ("estg", "EStG", "Einkommensteuergesetz"),
+]
+
+@pytest.fixture
+def matcher():
+    matcher = LawMatcher()
+    for law in LAWS:
+        matcher.add(*law)
+    return matcher
+
+def test_resolve_aliases_and_titles(matcher):
+    assert matcher.resolve("BGB") == "bgb"
+    assert matcher.resolve("SGB V") == "sgb 5"
+    assert matcher.resolve("sgb5") == "sgb 5"
+    assert matcher.resolve("Bürgerliches Gesetzbuch") == "bgb"
+    assert matcher.resolve("Bürgerlichen  Gesetzbuchs") == "bgb"
+    assert matcher.resolve("Handelsgesetzbuches") == "hgb"
+    assert matcher.resolve("StGB") is None
+
+    matcher.remove("hgb")
+    assert matcher.resolve("HGB") is None
+
+def test_fuzzy_match(matcher):
+    assert matcher.match("Einkommensteuer")[0][0] == "estg"
+    assert matcher.match("Krankenversicherung")[0][0] == "sgb 5"
+    assert matcher.match("BGB")[0] == ("bgb", 100.0)
+    assert matcher.match("xyz") == []
+
+    # Results are cached until the laws change
+    matcher.match("Einkommensteuer")
+    assert matcher.cache.hits == 1
+    matcher.add("stgb", "StGB", "Strafgesetzbuch")
+    assert len(matcher.cache) == 0
+
+def test_library_resolves_aliases(sample_law_markdown):
+    with patch('parser.settings') as mock_settings:
+        mock_settings.min_paragraphs = 1
+        lib = LawLibrary()
+        lib._load_law_from_markdown(sample_law_markdown.replace("TestG", "SGB 5"))
+
+        assert lib.get("SGB V", "1")["law"] == "SGB 5"
+        assert lib.get_available_laws("Test Law")[0]["code"] == "sgb 5"
+        with pytest.raises(KeyError, match="Similar laws: SGB 5"):
+            lib.get("SGB 6", "1")
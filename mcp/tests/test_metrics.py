@@ -0,0 +1,83 @@
+import asyncio
+from parser import LawLibrary
+from unittest.mock import patch
+
+import pytest
+
+from metrics import Histogram, Metrics
+
+def test_instrument_counts_calls_errors_and_sizes():
+    metrics = Metrics()
+
+    @metrics.instrument('lookup')
+    def lookup(fail=False):
+        if fail:
+            raise KeyError("missing")
+        return "ä" * 10
+
+    assert lookup.__name__ == 'lookup'
+    lookup()
+    with pytest.raises(KeyError):
+        lookup(fail=True)
+
+    tool = metrics.snapshot()["tools"]["lookup"]
+    assert tool["requests"] == 2
+    assert tool["errors"] == 1
+    assert tool["latency_seconds"]["count"] == 2
+    assert tool["response_bytes"] == {"count": 1, "sum": 20.0, "p50": 100, "p99": 100}
+
+    text = metrics.render()
+    assert '# TYPE deutsche_gesetze_tool_requests_total counter' in text
+    assert 'deutsche_gesetze_tool_requests_total{tool="lookup"} 2' in text
+    assert 'deutsche_gesetze_tool_errors_total{tool="lookup"} 1' in text
+    assert 'deutsche_gesetze_tool_latency_seconds_bucket{tool="lookup",le="+Inf"} 2' in text
+    assert 'deutsche_gesetze_tool_response_bytes_sum{tool="lookup"} 20.0' in text
+
+def test_histogram_quantiles():
+    histogram = Histogram((1, 5, 10))
+    assert histogram.quantile(0.5) is None
+    for value in (0.5, 2, 3, 4, 7, 20):
+        histogram.observe(value)
+    assert histogram.cumulative() == [(1, 1), (5, 4), (10, 5), (float('inf'), 6)]
+    assert histogram.quantile(0.5) == 5
+    assert histogram.quantile(0.8) == 10
+    assert histogram.quantile(0.99) is None
+
+def test_library_gauges(sample_law_markdown, tmp_path):
+    with patch('parser.settings') as mock_settings:
+        mock_settings.min_paragraphs = 1
+        law_dir = tmp_path / "gesetze" / "testg"
+        law_dir.mkdir(parents=True)
+        (law_dir / "index.md").write_text(sample_law_markdown)
+
+        lib = LawLibrary()
+        lib.load_laws_from_folder(tmp_path / "gesetze")
+        lib.search("Scope AND")
+
+        stats = lib.stats()
+        assert stats["laws"] == 1
+        assert stats["paragraphs"] == len(lib.laws["testg"].paragraphs)
+        assert stats["index_bytes"] > 0
+        assert stats["search_errors"] == 1
+        assert {"discover", "parse", "ingest", "commit"} <= set(stats["phase_seconds"])
+
+        metrics = Metrics()
+        metrics.set('startup_seconds', 1.5)
+        metrics.register_gauges('library', lib.stats)
+        gauges = metrics.snapshot()["gauges"]
+        assert gauges["startup_seconds"] == 1.5
+        assert gauges["library_laws"] == 1
+        assert gauges["library_caches_responses_hits"] == 0
+        assert 'deutsche_gesetze_library_search_errors 1' in metrics.render()
+
+def test_instrument_async_tool():
+    metrics = Metrics()
+
+    @metrics.instrument('search')
+    async def search(query):
+        return query * 2
+
+    assert asyncio.run(search("ab")) == "abab"
+    tool = metrics.snapshot()["tools"]["search"]
+    assert tool["requests"] == 1
+    assert tool["response_bytes"]["sum"] == 4.0
@@ -1,4 +1,9 @@
-from parser import LawParser
+import io
+import pickle
+
+import pytest
+
+from parser import LawParser, read_lines
 
 def test_parser_init(sample_law_markdown):
     parser = LawParser(sample_law_markdown)
@@ -8,6 +13,25 @@ def test_parser_init(sample_law_markdown):
     assert "1" in parser.paragraphs
     assert "2" in parser.paragraphs
 
+def test_streaming_parser(sample_law_markdown):
+    def dump(parser):
+        return parser.short_title, parser.full_title, [(p_id, node.name, node.text) for p_id, node in parser.paragraphs.items()]
+
+    texts = [
+        sample_law_markdown,
+        sample_law_markdown.replace("\n", "\r\n") + "\r\n\r\n",
+        sample_law_markdown.split("---\n", 2)[2],
+        "---\nTitle: Unclosed\n### § 1 A\nText\n",
+    ]
+    for text in texts:
+        expected = dump(LawParser(text))
+        assert dump(LawParser(read_lines(io.BytesIO(text.encode("utf-8"))))) == expected
+
+    # Front matter that is never closed is parsed as body
+    assert LawParser(texts[3]).paragraphs["1"].text == "Text"
+    # A final empty line is not part of the last paragraph
+    assert LawParser("### § 1 A\nText\n\n\n").paragraphs["1"].text == "Text\n"
+
 def test_get_paragraph_whole(sample_law_markdown):
     parser = LawParser(sample_law_markdown)
     result = parser.get_paragraph("1")
@@ -22,4 +46,99 @@ def test_get_paragraph_not_found(sample_law_markdown):
         parser.get_paragraph("999")
         assert False, "Should have raised KeyError"
     except KeyError:
-        pass
\ No newline at end of file
+        pass
+
+
+def test_get_absatz(sample_law_markdown):
+    parser = LawParser(sample_law_markdown)
+    assert parser.paragraphs["2"].absaetze == ["1", "2", "3"]
+    assert parser.get_paragraph("2", "1")["text"] == " First absatz."
+    assert parser.get_paragraph("2", "3")["text"] == " Third absatz with marker."
+    try:
+        parser.get_paragraph("2", "4")
+        assert False, "Should have raised KeyError"
+    except KeyError as e:
+        assert "Available: 1, 2, 3" in str(e)
+
+def test_get_satz_and_nummer():
+    parser = LawParser("""---
+Title: Test Law
+Jurabk: TestG
+---
+# § 1 Sätze
+Der Vertrag nach § 5 Abs. 1 S. 2 ist nichtig. Dies gilt z. B. für Verträge vom 1. Januar 2020. Satz 2 gilt nicht.
+
+# § 2 Nummern
+(1) Ordnungswidrig handelt, wer
+1.  entgegen § 3 handelt,
+2.  eine Meldung nicht erstattet.
+(2) Die Ordnungswidrigkeit kann geahndet werden. Näheres regelt Absatz 1.
+
+# § 3 Verweise
+Die Frist richtet sich nach Nr. 4. Das gilt auch für Anträge nach § 1.
+""")
+    assert parser.get_paragraph("1", satz_id=1)["text"] == "Der Vertrag nach § 5 Abs. 1 S. 2 ist nichtig."
+    assert parser.get_paragraph("1", satz_id="2")["text"] == "Dies gilt z. B. für Verträge vom 1. Januar 2020."
+    assert parser.get_paragraph("1", satz_id=3)["text"] == "Satz 2 gilt nicht."
+    assert parser.get_paragraph("2", "1", nummer_id="2")["text"] == "eine Meldung nicht erstattet."
+    assert parser.get_paragraph("2", "2", satz_id=2)["text"] == "Näheres regelt Absatz 1."
+    # A Satz may end in a one-digit number
+    assert parser.get_paragraph("3", satz_id=1)["text"] == "Die Frist richtet sich nach Nr. 4."
+    assert parser.get_paragraph("3", satz_id=2)["text"] == "Das gilt auch für Anträge nach § 1."
+    # The first Satz of an Absatz starts after the marker and its whitespace
+    assert parser.get_paragraph("2", "2", satz_id=1)["text"] == "Die Ordnungswidrigkeit kann geahndet werden."
+    for satz in (0, "0"):
+        try:
+            parser.get_paragraph("1", satz_id=satz)
+            assert False, "Should have raised KeyError"
+        except KeyError as e:
+            assert "Satz 0 not found in § 1. Available: 1-3" in str(e)
+    try:
+        parser.get_paragraph("2", satz_id=1)
+        assert False, "Should have raised KeyError"
+    except KeyError as e:
+        assert "Available: 1, 2" in str(e)
+
+def test_outline(outline_law_markdown):
+    parser = LawParser(outline_law_markdown)
+    assert [(s.depth, s.title, s.start, s.end) for s in parser.sections] == [
+        (0, "Buch 1 - Allgemeiner Teil", 1, 4),
+        (1, "Abschnitt 1 - Personen", 1, 3),
+        (1, "Abschnitt 2 - Sachen", 3, 4),
+        (0, "Buch 2 - Schuldrecht", 4, 6),
+        (1, "Abschnitt 1 - Inhalt", 4, 6),
+        (2, "Titel 1 - Kauf, Tausch", 4, 5),
+        (2, "Titel 2 - Schenkung", 5, 6),
+        (1, "Abschnitt 10 - Schlussvorschriften", 6, 6),
+    ]
+    assert parser.outline[0] == ["1", "1.1", "1.2", "2", "2.1", "2.1.1", "2.1.2", "2.2"]
+    assert parser.section_paragraphs(3) == ["5", "6"]
+
+    toc = parser.toc(depth=1)
+    assert toc[0] == {"id": "1", "title": "Buch 1 - Allgemeiner Teil", "paragraphs": "§ 2 - § 4", "count": 3,
+                      "subsections": 2}
+    assert parser.toc("2.1") == [
+        {"id": "2.1.1", "title": "Titel 1 - Kauf, Tausch", "paragraphs": "§ 5", "count": 1},
+        {"id": "2.1.2", "title": "Titel 2 - Schenkung", "paragraphs": "§ 6", "count": 1},
+    ]
+    assert parser.toc()[1]["sections"][1] == {"id": "2.2", "title": "Abschnitt 10 - Schlussvorschriften", "count": 0}
+
+    # The outline survives pickling, e.g. from worker processes
+    assert pickle.loads(pickle.dumps(parser)).sections == parser.sections
+
+def test_find_section(outline_law_markdown):
+    parser = LawParser(outline_law_markdown)
+    assert parser.find_section("2.1.2") == 6
+    assert parser.find_section("Schuldrecht") == 3
+    assert parser.find_section("buch 2 > abschnitt 1 > kauf") == 5
+    assert parser.find_section("Abschnitt 10") == 7
+    assert parser.find_section("Buch 1 > Abschnitt 1") == 1
+    with pytest.raises(KeyError, match="ambiguous.*1.1 Abschnitt 1 - Personen; 2.1 Abschnitt 1 - Inhalt"):
+        parser.find_section("Abschnitt 1")
+    with pytest.raises(KeyError, match="not found"):
+        parser.find_section("Buch 3")
+    with pytest.raises(KeyError, match="not found"):
+        parser.find_section("3.1")
+    for reference in ("", " > "):
+        with pytest.raises(KeyError, match="not found"):
+            parser.find_section(reference)
@@ -0,0 +1,72 @@
+import pstats
+from parser import LawLibrary
+from unittest.mock import patch
+
+import pytest
+
+from profiling import Profiler, report_load_timings, statement_timings
+
+def test_sampled_profiles(tmp_path):
+    profiler = Profiler(tmp_path / "profiles", sample_rate=1.0, trace_memory=True)
+
+    def work(n):
+        return sum(range(n))
+
+    assert profiler.call("work", work, 1000) == 499500
+    profiles = list((tmp_path / "profiles").glob("work-*.prof"))
+    assert len(profiles) == 1
+    assert any(name == "work" for _, _, name in pstats.Stats(str(profiles[0])).stats)
+    assert "Peak traced memory" in next((tmp_path / "profiles").glob("work-*.mem.txt")).read_text()
+
+    # Without an output folder nothing is profiled
+    assert Profiler(sample_rate=1.0).call("work", work, 10) == 45
+    assert profiler.profiles == 1
+
+def test_slow_call_log(sample_law_markdown, capsys):
+    with patch('parser.settings') as mock_settings:
+        mock_settings.min_paragraphs = 1
+        lib = LawLibrary()
+        lib._load_law_from_markdown(sample_law_markdown)
+
+        profiler = Profiler(slow_seconds=1e-9)
+        profiler.watch(lib.connections())
+        profiler.call("search_laws", lib.search, "Scope", limit=5)
+        out = capsys.readouterr().out
+        assert "Slow call search_laws('Scope', limit=5) took" in out
+        assert "SELECT law_code, paragraph_id" in out
+        assert profiler.slow_calls == 1
+
+        # Statements outside of timed calls are not recorded
+        lib.search("Scope")
+        assert profiler._local.statements is None
+
+        with pytest.raises(KeyError):
+            profiler.call("get_paragraph", lib.get, "unknown", "1")
+        assert profiler.slow_calls == 2
+
+def test_statement_timings():
+    assert statement_timings([(1.0, "a"), (1.5, "b")], 4.0) == [(0.5, "a"), (2.5, "b")]
+    assert statement_timings([], 1.0) == []
+
+def test_load_timing_report(sample_law_markdown, tmp_path, capsys):
+    with patch('parser.settings') as mock_settings:
+        mock_settings.min_paragraphs = 1
+        for code in ("AG", "BG"):
+            law_dir = tmp_path / "gesetze" / code.lower()
+            law_dir.mkdir(parents=True)
+            (law_dir / "index.md").write_text(sample_law_markdown.replace("TestG", code))
+
+        lib = LawLibrary(record_timings=True)
+        lib.load_laws_from_folder(tmp_path / "gesetze")
+        timings = lib.timing_report()
+        assert {t["law"] for t in timings} == {"AG", "BG"}
+        assert all(t["paragraphs"] == 2 and t["parse_seconds"] > 0 for t in timings)
+        assert timings[0]["parse_seconds"] + timings[0]["index_seconds"] >= timings[1]["parse_seconds"] + timings[1]["index_seconds"]
+        assert len(lib.timing_report(limit=1)) == 1
+
+        report_load_timings(lib, Profiler(tmp_path / "profiles"))
+        assert "Slowest of 2 parsed laws" in capsys.readouterr().out
+        assert (tmp_path / "profiles" / "load_timings.json").is_file()
+
+        # Off by default
+        assert LawLibrary().timing_report() == []
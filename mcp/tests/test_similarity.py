@@ -0,0 +1,88 @@
+from parser import LawLibrary
+from unittest.mock import patch
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from similarity import SimilarityIndex
+
+PARAGRAPHS = [
+    (1, "Wer vorsätzlich oder fahrlässig das Leben, den Körper oder das Eigentum eines anderen verletzt, ist zum Ersatz des Schadens verpflichtet."),
+    (2, "Der Mieter hat die Miete zu Beginn des Monats zu zahlen."),
+    (3, "Wer fahrlässig den Körper eines anderen verletzt, ist dem anderen zum Ersatz des daraus entstehenden Schadens verpflichtet."),
+    (5, "Der Vermieter kann die Miete erhöhen, wenn der Mieter zustimmt."),
+    (8, "Die Kündigung des Mietvertrags bedarf der Schriftform."),
+]
+
+HAFTUNG_LAW = """---
+Title: Haftungsgesetz
+jurabk: HaftG
+---
+
+# § 1 Haftung
+Wer fahrlässig den Körper eines anderen verletzt, ist dem anderen zum Ersatz des Schadens verpflichtet.
+
+# § 2 Miete
+Der Mieter hat die Miete zu Beginn des Monats zu zahlen.
+
+# § 3 Schadensersatz
+Wer vorsätzlich das Eigentum eines anderen verletzt, ist zum Ersatz des Schadens verpflichtet.
+"""
+
+def test_similarity_index_query():
+    similarity = SimilarityIndex.build(PARAGRAPHS, min_df=1, max_df=0.9)
+    assert len(similarity) == 5
+
+    columns, weights = similarity.vector(PARAGRAPHS[0][1])
+    assert np.isclose(np.dot(weights, weights), 1.0)
+
+    matches = similarity.query(PARAGRAPHS[0][1], limit=2)
+    assert [rowid for rowid, _ in matches] == [1, 3]
+    assert matches[0][1] == pytest.approx(1.0, abs=1e-4)
+
+    assert similarity.query(PARAGRAPHS[0][1], limit=1, exclude=[1])[0][0] == 3
+    assert [rowid for rowid, _ in similarity.query("Miete Mieter", ranges=[(4, 8)])] == [5]
+    assert similarity.query("Unbekanntes Wort") == []
+
+def test_similarity_index_drops_rare_and_common_words():
+    similarity = SimilarityIndex.build(PARAGRAPHS, min_df=2, max_df=0.5)
+    assert "miete" in similarity.vocabulary
+    assert "schriftform" not in similarity.vocabulary  # only in one paragraph
+    assert "der" not in similarity.vocabulary  # in more than half of them
+
+def test_library_similar_paragraphs(sample_law_markdown, tmp_path):
+    with patch('parser.settings') as mock_settings:
+        mock_settings.min_paragraphs = 1
+        index_path = tmp_path / "index.sqlite"
+        lib = LawLibrary(index_path=index_path)
+        lib._load_law_from_markdown(sample_law_markdown, source="testg")
+        lib._load_law_from_markdown(HAFTUNG_LAW, source="haftg")
+
+        with pytest.raises(RuntimeError):
+            lib.similar_paragraphs("HaftG", "1")
+
+        lib.build_similarity_index()
+        assert (tmp_path / "index.tfidf.npz").is_file()
+
+        results = lib.similar_paragraphs("HaftG", "1")
+        assert results[0]["law"] == "haftg"
+        assert results[0]["paragraph"] == "3"
+        assert 0 < results[0]["similarity"] <= 1
+        assert all(result["paragraph"] != "1" or result["law"] != "haftg" for result in results)
+
+        results = lib.similar_paragraphs(text="Wer verletzt wen?", law_codes=["HaftG"])
+        assert {result["paragraph"] for result in results} == {"1", "3"}
+        assert lib.similar_paragraphs(text="Wer verletzt wen?", law_codes=["TestG"]) == []
+
+        with pytest.raises(ValueError):
+            lib.similar_paragraphs()
+        with pytest.raises(KeyError):
+            lib.similar_paragraphs("HaftG", "99")
+
+        # Saved vectors are reused while the indexed laws are unchanged
+        with patch.object(SimilarityIndex, 'build', side_effect=AssertionError("built again")):
+            restored = LawLibrary(index_path=index_path)
+            restored.load_index()
+            restored.build_similarity_index()
+        assert restored.similar_paragraphs("HaftG", "1")[0]["paragraph"] == "3"
@@ -39,7 +39,19 @@ fi
 echo "Running lawde.py loadall..."
 python lawde.py loadall
 
+# Optionally keep the XML, the server reads it without converting it to Markdown (LOAD_FROM_XML)
+if [ "$1" == "--xml" ]; then
+    echo "Skipping the conversion, start the server with LOAD_FROM_XML=$(pwd)/laws"
+    exit 0
+fi
+
 echo "Running lawdown.py convert laws laws_md..."
 python lawdown.py convert laws laws_md
 
+# Optionally pack the converted laws, the server reads them without extracting (LOAD_FROM_ARCHIVE)
+if [ "$1" == "--archive" ]; then
+    echo "Packing laws_md into laws_md.tar.gz..."
+    tar -czf laws_md.tar.gz -C laws_md .
+fi
+
 echo "Script execution completed successfully."